@@ -4,15 +4,28 @@ from controller import logger as controller_logger
 from dex import logger as dex_logger
 from emulator import logger as emulator_logger
 from encounter import logger as encounter_logger
+from heartbeat import logger as heartbeat_logger
 from image import logger as image_logger
+from macro import logger as macro_logger
 from main import logger as main_logger
+from memory import logger as memory_logger
 from menu import logger as menu_logger
 from notifications import logger as notifications_logger
 from pack import logger as pack_logger
 from pokemon import logger as pokemon_logger
+from savestate import logger as savestate_logger
+from speed import logger as speed_logger
+from sprites import logger as sprites_logger
+from srm import logger as srm_logger
+from timing_profile import logger as timing_profile_logger
+from helpers.assets import logger as helpers_assets_logger
+from helpers.atlas import logger as helpers_atlas_logger
 from helpers.common import logger as helpers_common_logger
 from helpers.file_mgmt import logger as helpers_file_mgmt_logger
+from helpers.file_watch import logger as helpers_file_watch_logger
 from helpers.log import get_logger
+from helpers.network_cmd import logger as helpers_network_cmd_logger
+from helpers.timing import logger as helpers_timing_logger
 
 
 calibration_logger = get_logger(calibration_logger.name, config.LOG_LEVEL)
@@ -20,11 +33,24 @@ controller_logger = get_logger(controller_logger.name, config.LOG_LEVEL)
 dex_logger = get_logger(dex_logger.name, config.LOG_LEVEL)
 emulator_logger = get_logger(emulator_logger.name, config.LOG_LEVEL)
 encounter_logger = get_logger(encounter_logger.name, config.LOG_LEVEL)
+heartbeat_logger = get_logger(heartbeat_logger.name, config.LOG_LEVEL)
 image_logger = get_logger(image_logger.name, config.LOG_LEVEL)
+macro_logger = get_logger(macro_logger.name, config.LOG_LEVEL)
 main_logger = get_logger(main_logger.name, config.LOG_LEVEL)
+memory_logger = get_logger(memory_logger.name, config.LOG_LEVEL)
 menu_logger = get_logger(menu_logger.name, config.LOG_LEVEL)
 notificationss_logger = get_logger(notifications_logger.name, config.LOG_LEVEL)
 pack_logger = get_logger(pack_logger.name, config.LOG_LEVEL)
 pokemon_logger = get_logger(pokemon_logger.name, config.LOG_LEVEL)
+savestate_logger = get_logger(savestate_logger.name, config.LOG_LEVEL)
+speed_logger = get_logger(speed_logger.name, config.LOG_LEVEL)
+sprites_logger = get_logger(sprites_logger.name, config.LOG_LEVEL)
+srm_logger = get_logger(srm_logger.name, config.LOG_LEVEL)
+timing_profile_logger = get_logger(timing_profile_logger.name, config.LOG_LEVEL)
+helpers_assets_logger = get_logger(helpers_assets_logger.name, config.LOG_LEVEL)
+helpers_atlas_logger = get_logger(helpers_atlas_logger.name, config.LOG_LEVEL)
 helpers_common_logger = get_logger(helpers_common_logger.name, config.LOG_LEVEL)
-helpers_file_mgmt_logger = get_logger(helpers_file_mgmt_logger.name, config.LOG_LEVEL)
\ No newline at end of file
+helpers_file_mgmt_logger = get_logger(helpers_file_mgmt_logger.name, config.LOG_LEVEL)
+helpers_file_watch_logger = get_logger(helpers_file_watch_logger.name, config.LOG_LEVEL)
+helpers_network_cmd_logger = get_logger(helpers_network_cmd_logger.name, config.LOG_LEVEL)
+helpers_timing_logger = get_logger(helpers_timing_logger.name, config.LOG_LEVEL)
\ No newline at end of file
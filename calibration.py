@@ -1,34 +1,115 @@
-"""Module to calibrate emulator fps (frames per second)."""
+"""Module to calibrate the shortest safe timings of static encounters on this machine."""
 
 import logging
+import os
+import sys
+from typing import List
 
-from main import run as go_shiny_hunt
 from config import NATIVE_SAVES_DIR, RETROARCH_CFG, ROM_NAME
 from emulator import Emulator
-from encounter import StaticEncounter
-from pokemon import Pokemon
-from retroarch import cleanup_save_dir, copy_native_save
+from encounter import STATIC_ENCOUNTERS, get_default_timing, perform_btn_sequence
+from image import is_battle
+from macro import PRESS_DURATION
+from retroarch import cleanup_save_dir, copy_native_save, get_native_save_name
+from timing_profile import EncounterTiming, TimingProfile, find_shortest, get_timing_profile_fn, load_timing_profile
+from helpers.assets import ASSETS
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
 
 
+SAFETY_MARGIN = 1.2
+"""The calibrated timings are the shortest safe timings found, stretched by this factor."""
+
+CONTINUE_POKEMON = "SNORLAX"
+"""Calibrate continuing the game with Snorlax since this static encounter has most buttons in sequence."""
+
+
+def reaches_battle(emulator: Emulator, pokemon_name: str, continue_scale: float, timing: EncounterTiming) -> bool:
+    """Reset, continue the game and perform the static encounter with the
+    timing. Confirm the battle screen was reached with the battle menu open."""
+    emulator.reset()
+    emulator.continue_pokemon_game(continue_scale)
+    sequence: str = STATIC_ENCOUNTERS[pokemon_name]["sequence"]
+    perform_btn_sequence(emulator, sequence, settle=timing.delay, press_gap=timing.press_gap)
+    screenshot_fn = emulator.capture_screenshot()
+    reached = is_battle(screenshot_fn)
+    os.remove(screenshot_fn)
+    return reached
+
+
+def calibrate_continue(emulator: Emulator, pokemon_name: str) -> float:
+    """Find how much the delays between the presses that continue the game can
+    be scaled down, with the hand-tuned timing of the static encounter."""
+    timing = get_default_timing(pokemon_name)
+    scale = find_shortest(lambda s: reaches_battle(emulator, pokemon_name, s, timing), longest=1)
+    return min(scale*SAFETY_MARGIN, 1)
+
+
+def calibrate_encounter(emulator: Emulator, pokemon_name: str, continue_scale: float) -> EncounterTiming:
+    """Find the shortest gap between presses of the button sequence, then the
+    shortest delay for the battle to start, starting from the hand-tuned timing."""
+    default = get_default_timing(pokemon_name)
+    press_gap = find_shortest(
+        lambda g: reaches_battle(emulator, pokemon_name, continue_scale, EncounterTiming(g, default.delay)),
+        longest=default.press_gap,
+        shortest=PRESS_DURATION,
+    )
+    press_gap = min(press_gap*SAFETY_MARGIN, default.press_gap)
+    delay = find_shortest(
+        lambda d: reaches_battle(emulator, pokemon_name, continue_scale, EncounterTiming(press_gap, d)),
+        longest=default.delay,
+    )
+    delay = min(delay*SAFETY_MARGIN, default.delay)
+    logger.info(f"calibrated {pokemon_name}: press gap {press_gap:.3f} (was {default.press_gap}), "
+                f"delay {delay:.3f} (was {default.delay})")
+    return EncounterTiming(press_gap, delay)
+
+
+def has_native_save(pokemon_name: str) -> bool:
+    """Determine if there is a native save to calibrate the static encounter with."""
+    save_name = get_native_save_name(pokemon_name)
+    return len(ASSETS.glob(os.path.join(NATIVE_SAVES_DIR, save_name, "*.srm"))) > 0
+
+
+def calibrate(pokemon_names: List[str]) -> TimingProfile:
+    """Calibrate the static encounters on this machine, continuing the game
+    with the first one. Other encounters already calibrated are kept and the
+    profile is saved after each encounter so an interrupted calibration is kept."""
+    profile = load_timing_profile()
+    for pokemon_name in pokemon_names:
+        og_rename_rtc_file, og_rename_srm_file = copy_native_save(save_name=get_native_save_name(pokemon_name),
+                                                                  user_rom_name=ROM_NAME,
+                                                                  native_saves_dir=NATIVE_SAVES_DIR,
+                                                                  retroarch_saves_dir=RETROARCH_CFG.savefile_dir)
+        emulator = Emulator()
+        try:
+            emulator.launch_game()
+            if pokemon_name == pokemon_names[0]:
+                profile.continue_scale = calibrate_continue(emulator, pokemon_name)
+                logger.info(f"calibrated continuing the game: delays scaled by {profile.continue_scale:.3f}")
+            profile.set_encounter_timing(pokemon_name, calibrate_encounter(emulator, pokemon_name, profile.continue_scale))
+            profile.save()
+        finally:
+            emulator.kill_process()
+            cleanup_save_dir(user_rom_name=ROM_NAME,
+                             retroarch_saves_dir=RETROARCH_CFG.savefile_dir,
+                             renamed_rtc_file=og_rename_rtc_file,
+                             renamed_srm_file=og_rename_srm_file)
+    return profile
+
+
 if __name__ == "__main__":
+    import __init__  # noqa: F401
     logger.info("running calibration")
-    
-    # calibrate with Snorlax since this static encounter has most buttons in sequence
-    pokemon_name = "Snorlax"
-    og_rename_rtc_file, og_rename_srm_file = copy_native_save(pokemon_name=pokemon_name,
-                                                              user_rom_name=ROM_NAME,
-                                                              native_saves_dir=NATIVE_SAVES_DIR,
-                                                              retroarch_saves_dir=RETROARCH_CFG.savefile_dir)
-    
-    emulator = Emulator()
-    pokemon = Pokemon(pokemon_name)
-    encounter = StaticEncounter(emulator, pokemon)
-    try:
-        go_shiny_hunt(emulator, encounter, max_attempts=10, send_email=False)
-    finally:
-        cleanup_save_dir(user_rom_name=ROM_NAME,
-                         retroarch_saves_dir=RETROARCH_CFG.savefile_dir,
-                         renamed_rtc_file=og_rename_rtc_file,
-                         renamed_srm_file=og_rename_srm_file)
+
+    # calibrate the static encounters given as arguments, by default all of them with a battle and a native save
+    pokemon_names = [name.upper() for name in sys.argv[1:]]
+    if len(pokemon_names) == 0:
+        pokemon_names = [name for name, encounter in STATIC_ENCOUNTERS.items()
+                         if "delay" in encounter and has_native_save(name)]
+    # continuing the game is calibrated first
+    if CONTINUE_POKEMON in pokemon_names:
+        pokemon_names.remove(CONTINUE_POKEMON)
+        pokemon_names.insert(0, CONTINUE_POKEMON)
+    calibrate(pokemon_names)
+    logger.info(f"timing profile saved to {get_timing_profile_fn()}")
@@ -4,7 +4,7 @@ from configparser import ConfigParser, NoOptionError
 import os
 
 from retroarch import RetroArchConfig
-from helpers.file_mgmt import extract_zipfiles
+from helpers.assets import ASSETS
 from helpers.log import get_logger, mod_fname
 logger = get_logger(mod_fname(__file__))
 
@@ -17,7 +17,9 @@ NUM_DIR = os.path.join(IMAGES_DIR, "numbers")
 SPRITES_DIR = os.path.join(IMAGES_DIR, "sprites")
 SAVES_DIR = os.path.join(PROJ_ROOT_PATH, "assets", "saves")
 NATIVE_SAVES_DIR = os.path.join(SAVES_DIR, "native_saves_static_encounters")
-extract_zipfiles(zipfiles=[
+PROFILES_DIR = os.path.join(PROJ_ROOT_PATH, "assets", "profiles")
+# assets are read straight from their zip archives, paths above resolve through ASSETS
+ASSETS.index_zipfiles(zipfiles=[
     f"{LETTERS_DIR}.zip",
     f"{MENU_DIR}.zip",
     f"{NUM_DIR}.zip",
@@ -62,6 +64,46 @@ try:
     DISP_BRIGHTNESS = float(config.get(SECTION, "DISP_BRIGHTNESS"))
 except NoOptionError:
     DISP_BRIGHTNESS = None 
+try:
+    SPRITE_CLASSIFIER = config.get(SECTION, "SPRITE_CLASSIFIER")
+except NoOptionError:
+    SPRITE_CLASSIFIER = "color"  # default to average color comparison
+try:
+    SPRITE_SOURCE = config.get(SECTION, "SPRITE_SOURCE")
+except NoOptionError:
+    SPRITE_SOURCE = "image"  # default to classifying battle screenshots
+try:
+    HUNT_MODE = config.get(SECTION, "HUNT_MODE")
+except NoOptionError:
+    HUNT_MODE = "reset"  # default to resetting the game on every attempt
+try:
+    CONTROLLER_BACKEND = config.get(SECTION, "CONTROLLER_BACKEND")
+except NoOptionError:
+    CONTROLLER_BACKEND = "keyboard"  # default to synthesized keystrokes
+try:
+    DELAY_SPIN_BUDGET = float(config.get(SECTION, "DELAY_SPIN_BUDGET"))
+except NoOptionError:
+    DELAY_SPIN_BUDGET = 0.002  # default to spinning the last 2ms of every delay
+try:
+    DELAY_SCALING = config.get(SECTION, "DELAY_SCALING")
+except NoOptionError:
+    DELAY_SCALING = "static"  # default to scaling delays by EMULATOR_CORE_AVG_FPS
+try:
+    EMULATOR_CORE_MIN_FPS = float(config.get(SECTION, "EMULATOR_CORE_MIN_FPS"))
+except NoOptionError:
+    EMULATOR_CORE_MIN_FPS = 60  # default to the speed without fast forward
+try:
+    EMULATOR_CORE_MAX_FPS = float(config.get(SECTION, "EMULATOR_CORE_MAX_FPS"))
+except NoOptionError:
+    EMULATOR_CORE_MAX_FPS = 1.5*EMULATOR_CORE_AVG_FPS
+try:
+    ENCOUNTER_TYPE = config.get(SECTION, "ENCOUNTER_TYPE")
+except NoOptionError:
+    ENCOUNTER_TYPE = "static"  # default to hunting POKEMON_STATIC_ENCOUNTER
+try:
+    RANDOM_ENCOUNTER_SAVE = config.get(SECTION, "RANDOM_ENCOUNTER_SAVE")
+except NoOptionError:
+    RANDOM_ENCOUNTER_SAVE = None
 
 logger.info(f"RETROARCH_CFG_FP: {RETROARCH_CFG_FP}")
 logger.info(f"RETROARCH_APP_FP: {RETROARCH_APP_FP}")
@@ -75,6 +117,16 @@ logger.info(f"RECEIVER_EMAIL: {RECEIVER_EMAIL}")
 logger.info(f"SENDER_EMAIL: {SENDER_EMAIL}")
 logger.info("SENDER_EMAIL_PASS: *****")
 logger.info(f"DISP_BRIGHTNESS: {DISP_BRIGHTNESS}")
+logger.info(f"SPRITE_CLASSIFIER: {SPRITE_CLASSIFIER}")
+logger.info(f"SPRITE_SOURCE: {SPRITE_SOURCE}")
+logger.info(f"HUNT_MODE: {HUNT_MODE}")
+logger.info(f"CONTROLLER_BACKEND: {CONTROLLER_BACKEND}")
+logger.info(f"DELAY_SPIN_BUDGET: {DELAY_SPIN_BUDGET}")
+logger.info(f"DELAY_SCALING: {DELAY_SCALING}")
+logger.info(f"EMULATOR_CORE_MIN_FPS: {EMULATOR_CORE_MIN_FPS}")
+logger.info(f"EMULATOR_CORE_MAX_FPS: {EMULATOR_CORE_MAX_FPS}")
+logger.info(f"ENCOUNTER_TYPE: {ENCOUNTER_TYPE}")
+logger.info(f"RANDOM_ENCOUNTER_SAVE: {RANDOM_ENCOUNTER_SAVE}")
 
 # misc
 EMULATOR_NAME = "RetroArch"
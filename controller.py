@@ -1,12 +1,15 @@
 """Programmatically control I/O devices."""
 
+from enum import Enum
 import logging
+from typing import Union
 
 #pyautogui is for hotkeys and inputs at the system level, cannot register inputs inside the emulator core
 import pyautogui as gui
 
-from config import RETROARCH_CFG
+from config import CONTROLLER_BACKEND, RETROARCH_CFG
 from helpers.common import delay
+from helpers.network_cmd import NetworkCommandClient
 from helpers.platform import Platform
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
@@ -16,10 +19,92 @@ if Platform.is_windows():
     import pydirectinput as inp
 
 
+class ControllerBackend(str, Enum):
+    """Enumeration for the ways to send hotkeys to the emulator."""
+    KEYBOARD = "keyboard"
+    NETWORK = "network"
+
+
+class Button(str, Enum):
+    """Enumeration for the buttons of the emulated controller."""
+    A = "a"
+    B = "b"
+    START = "start"
+    SELECT = "select"
+    UP = "up"
+    DOWN = "down"
+    LEFT = "left"
+    RIGHT = "right"
+
+
+class Hotkey(str, Enum):
+    """Enumeration for emulator hotkeys, valued by their RetroArch network command."""
+    FAST_FWD = "FAST_FORWARD"
+    PAUSE = "PAUSE_TOGGLE"
+    RESET = "RESET"
+    SCREENSHOT = "SCREENSHOT"
+    FULLSCREEN = "FULLSCREEN_TOGGLE"
+    SAVE_STATE = "SAVE_STATE"
+    LOAD_STATE = "LOAD_STATE"
+    EXIT = "QUIT"
+
+
+class KeyboardBackend():
+    """Send hotkeys as keystrokes to the focused emulator window."""
+    def __init__(self):
+        self.keys = {
+            Hotkey.FAST_FWD: RETROARCH_CFG.fast_fwd_btn,
+            Hotkey.PAUSE: RETROARCH_CFG.pause_btn,
+            Hotkey.RESET: RETROARCH_CFG.reset_btn,
+            Hotkey.SCREENSHOT: RETROARCH_CFG.screenshot_btn,
+            Hotkey.FULLSCREEN: RETROARCH_CFG.fullscreen_btn,
+            Hotkey.SAVE_STATE: RETROARCH_CFG.save_state_btn,
+            Hotkey.LOAD_STATE: RETROARCH_CFG.load_state_btn,
+            Hotkey.EXIT: RETROARCH_CFG.exit_btn,
+        }
+
+    def press_hotkey(self, hotkey: Hotkey, presses: int = 1, delay_after_press: float = None):
+        press_key(self.keys[hotkey], presses, delay_after_press=delay_after_press)
+
+
+class NetworkBackend():
+    """Send hotkeys as RetroArch network commands over UDP to the
+    `network_cmd_port` in `retroarch.cfg`. Commands skip the per-call
+    pause of synthesized keystrokes and do not need window focus."""
+    def __init__(self, client: NetworkCommandClient = None):
+        if client is None:
+            if not RETROARCH_CFG.network_cmd_enable:
+                logger.warning("network commands are disabled in retroarch.cfg, set network_cmd_enable = \"true\"")
+            client = NetworkCommandClient(port=RETROARCH_CFG.network_cmd_port)
+        self.client = client
+
+    def press_hotkey(self, hotkey: Hotkey, presses: int = 1, delay_after_press: float = None):
+        for i in range(presses):
+            self.client.send(hotkey.value)
+            if delay_after_press is not None:
+                delay(delay_after_press)
+
+
+def get_controller_backend(backend: ControllerBackend) -> Union[KeyboardBackend, NetworkBackend]:
+    """Create the backend that sends hotkeys to the emulator."""
+    if backend == ControllerBackend.KEYBOARD:
+        return KeyboardBackend()
+    elif backend == ControllerBackend.NETWORK:
+        return NetworkBackend()
+    else:
+        raise ValueError(f"Unsupported controller backend: {backend}")
+
+
 class EmulatorController():
-    """Make controller actions inside an emulator."""
-    def __init__(self, player_num: int = 1):
+    """Make controller actions inside an emulator. Buttons are always pressed
+    with the keyboard, hotkeys are sent through the controller backend."""
+    def __init__(self,
+                 player_num: int = 1,
+                 backend: Union[KeyboardBackend, NetworkBackend] = None):
         self.player_num = player_num
+        if backend is None:
+            backend = get_controller_backend(ControllerBackend(CONTROLLER_BACKEND))
+        self.backend = backend
         
         if player_num == 1:
             self.input_player = RETROARCH_CFG.input_player_1
@@ -61,36 +146,49 @@ class EmulatorController():
         press_key(self.input_player.right_btn, presses, delay_after_press=delay_after_press)
         logger.debug(f"moved right {presses}x")
     
+    def hold(self, button: Union[Button, str]):
+        """Hold a button down until it is released. Timing is left to the
+        caller, e.g., a `MacroExecutor` running a timed input plan."""
+        key_down(self.get_key(button))
+    
+    def release(self, button: Union[Button, str]):
+        """Release a held button."""
+        key_up(self.get_key(button))
+    
+    def get_key(self, button: Union[Button, str]) -> str:
+        """The keyboard key mapped to a button in `retroarch.cfg`."""
+        return getattr(self.input_player, f"{Button(button).value}_btn")
+    
     def toggle_fast_fwd(self, delay_after_press: float = None):
-        press_key(RETROARCH_CFG.fast_fwd_btn, delay_after_press=delay_after_press)
+        self.backend.press_hotkey(Hotkey.FAST_FWD, delay_after_press=delay_after_press)
         logger.debug("toggled fast forward")
     
     def toggle_pause(self, delay_after_press: float = None):
-        press_key(RETROARCH_CFG.pause_btn, delay_after_press=delay_after_press)
+        self.backend.press_hotkey(Hotkey.PAUSE, delay_after_press=delay_after_press)
         logger.debug("toggled pause")
 
     def press_reset_btn(self, delay_after_press: float = None):
-        press_key(RETROARCH_CFG.reset_btn, delay_after_press=delay_after_press)
+        self.backend.press_hotkey(Hotkey.RESET, delay_after_press=delay_after_press)
         logger.debug("pressed reset button")
     
     def press_screenshot_btn(self, delay_after_press: float = None):
-        press_key(RETROARCH_CFG.screenshot_btn, delay_after_press=delay_after_press)
+        self.backend.press_hotkey(Hotkey.SCREENSHOT, delay_after_press=delay_after_press)
         logger.debug("pressed screenshot button")
     
     def press_fullscreen_btn(self, presses: int = 1, delay_after_press: float = None):
-        press_key(RETROARCH_CFG.fullscreen_btn, presses, delay_after_press=delay_after_press)
+        self.backend.press_hotkey(Hotkey.FULLSCREEN, presses, delay_after_press=delay_after_press)
         logger.debug(f"pressed fullscreen button {presses}x")
     
     def press_save_state_btn(self, delay_after_press: float = None):
-        press_key(RETROARCH_CFG.save_state_btn, delay_after_press=delay_after_press)
+        self.backend.press_hotkey(Hotkey.SAVE_STATE, delay_after_press=delay_after_press)
         logger.debug("pressed save state button")
     
     def press_load_state_btn(self, delay_after_press: float = None):
-        press_key(RETROARCH_CFG.load_state_btn, delay_after_press=delay_after_press)
+        self.backend.press_hotkey(Hotkey.LOAD_STATE, delay_after_press=delay_after_press)
         logger.debug("pressed load state button")
     
     def press_exit_btn(self, presses: int = 1, delay_after_press: float = None):
-        press_key(RETROARCH_CFG.exit_btn, presses, delay_after_press=delay_after_press)
+        self.backend.press_hotkey(Hotkey.EXIT, presses, delay_after_press=delay_after_press)
         logger.debug(f"pressed exit button {presses}x")
 
 
@@ -108,3 +206,21 @@ def press_key(key: str,
         logger.debug(f"pressed key: {key}")
         if delay_after_press is not None:
             delay(delay_after_press, delay_universal)
+
+
+def key_down(key: str):
+    """Virtually hold the specified key down. Skips the pause
+    pyautogui and pydirectinput make after every call."""
+    if Platform.is_mac():
+        gui.keyDown(key, _pause=False)
+    elif Platform.is_windows():
+        inp.keyDown(key, _pause=False)
+
+
+def key_up(key: str):
+    """Virtually release the specified key. Skips the pause
+    pyautogui and pydirectinput make after every call."""
+    if Platform.is_mac():
+        gui.keyUp(key, _pause=False)
+    elif Platform.is_windows():
+        inp.keyUp(key, _pause=False)
@@ -1,19 +1,38 @@
 """High-level emulator functionality and tracking emulator state."""
 
+from contextlib import contextmanager
+import ctypes
 from enum import Enum
 from inspect import signature
 import logging
 import os
+import subprocess
+import time
+from typing import Callable, Iterator, List
 
-from config import EMULATOR_NAME, POKEMON_GAME, RETROARCH_APP_FP, DISP_BRIGHTNESS
+#pyautogui is only used to find the emulator window
+import pyautogui as gui
+
+from config import EMULATOR_NAME, POKEMON_GAME, RETROARCH_APP_FP, RETROARCH_CFG, DISP_BRIGHTNESS
 from controller import EmulatorController, press_key
 from helpers.common import delay, set_disp_brightness
-from helpers.file_mgmt import cd
+from helpers.file_watch import POLL_INTERVAL, WAIT_TIMEOUT, get_file_watcher
+from helpers.network_cmd import NetworkCommandClient
 from helpers.platform import Platform
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
 
 
+LAUNCH_TIMEOUT = 30
+"""The number of seconds to wait for the emulator to be ready after launching it."""
+
+QUIT_TIMEOUT = 5
+"""The number of seconds to wait for the emulator to exit before escalating."""
+
+READY_LOG_MARKER = "Found menu display driver"
+"""Logged by RetroArch once its menu is up (requires `log_to_file` and `log_verbosity`)."""
+
+
 class ToggleState(str, Enum):
     """Enumeration for toggling on/off."""
     ON = 'on'
@@ -22,19 +41,23 @@ class ToggleState(str, Enum):
 
 class Emulator():
     """Take actions inside an emulator."""
-    def __init__(self):
+    def __init__(self, app_fp: str = RETROARCH_APP_FP):
+        self.app_fp = app_fp
         self.cont = EmulatorController()
         self.state = EmulatorState()
+        self.process: subprocess.Popen = None
+        self.precise_session: PreciseInputSession = None
     
-    def continue_pokemon_game(self):
-        """Continue the Pokémon game from last save."""
+    def continue_pokemon_game(self, press_gap_scale: float = 1):
+        """Continue the Pokémon game from last save. The relative delays
+        between presses are scaled by `press_gap_scale`, as calibrated."""
         logger.debug("continue game")
         delay(1, universal=True)
         self.fast_fwd_on()
-        delay(1, universal=False)
-        self.press_b(presses=1, delay_after_press=0.5)
-        self.press_a(presses=1, delay_after_press=0.25)
-        self.press_a(presses=2, delay_after_press=0.5)
+        delay(1*press_gap_scale, universal=False)
+        self.press_b(presses=1, delay_after_press=0.5*press_gap_scale)
+        self.press_a(presses=1, delay_after_press=0.25*press_gap_scale)
+        self.press_a(presses=2, delay_after_press=0.5*press_gap_scale)
 
     def launch_game(self):
         """Launch the game inside the emulator."""
@@ -52,35 +75,136 @@ class Emulator():
         logger.info(f"run game: Pokémon {POKEMON_GAME}")
         press_key("Enter")
     
-    def launch(self):
-        """Launch the emulator application."""
+    def launch(self, timeout: float = LAUNCH_TIMEOUT):
+        """Launch the emulator application as a child process and
+        return as soon as it is ready to take input."""
         logger.info(f"launching {EMULATOR_NAME} emulator")
-        logger.debug(f"opening {RETROARCH_APP_FP}")
+        exe = get_executable(self.app_fp)
+        launched_at = time.time()
+        args = [exe]
+        log_fn = None
+        if RETROARCH_CFG.log_verbosity:
+            # log to a file of this launch only, so the log of another instance is not mistaken for this one's
+            log_fn = get_launch_log_fn(launched_at)
+            os.makedirs(os.path.dirname(log_fn), exist_ok=True)
+            args += ["--log-file", log_fn]
+        probes = self._get_ready_probes(log_fn)
+        logger.debug(f"running {' '.join(args)}")
+        self.process = subprocess.Popen(args,
+                                        cwd=os.path.dirname(exe),
+                                        stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+        self.state = EmulatorState()
+        self.wait_until_ready(probes, launched_at, timeout)
         if Platform.is_mac():
-            os.system(f"open {RETROARCH_APP_FP}")
-        elif Platform.is_windows():
-            with cd(os.path.dirname(RETROARCH_APP_FP)):
-                exe = os.path.basename(RETROARCH_APP_FP)
-                os.system(f"start {exe}")
-        delay(3, universal=True)  # ensure sys is fully open & ready to perform next action
-    
-    def quit(self):
-        """Quit the emulator."""
+            # bring the app to the front like `open` would, so it receives key presses
+            subprocess.run(["open", self.app_fp])
+    
+    def wait_until_ready(self,
+                         probes: List[Callable[[], bool]],
+                         launched_at: float,
+                         timeout: float = LAUNCH_TIMEOUT):
+        """Block until a ready probe of the launched process succeeds
+        (see `_get_ready_probes`). Raises `RuntimeError` if the process
+        exits first and `TimeoutError` if it is not ready within
+        `timeout` seconds of `launched_at`."""
+        if len(probes) == 0:
+            logger.debug("no ready probe available, waiting a fixed delay")
+            delay(3, universal=True)  # ensure sys is fully open & ready to perform next action
+            return
+
+        deadline = launched_at + timeout
+        while time.time() < deadline:
+            if not self.is_running():
+                raise RuntimeError(f"{EMULATOR_NAME} exited with code {self.process.returncode} while launching")
+            for probe in probes:
+                if probe():
+                    logger.debug(f"{EMULATOR_NAME} ready after {time.time() - launched_at:.2f}s ({probe.__name__})")
+                    return
+            time.sleep(POLL_INTERVAL)
+        raise TimeoutError(f"{EMULATOR_NAME} was not ready within {timeout}s")
+    
+    def is_running(self) -> bool:
+        """Determine if the emulator process launched by this instance is running."""
+        return self.process is not None and self.process.poll() is None
+    
+    def quit(self, timeout: float = QUIT_TIMEOUT):
+        """Quit the emulator. Asks the emulator to exit, then
+        escalates to terminating and killing its process."""
         logger.info(f"quitting {EMULATOR_NAME} emulator")
         self.cont.press_exit_btn(presses=2, delay_after_press=0.25)
+        if self.process is not None:
+            self._stop_process(timeout, wait_for_exit=True)
         set_disp_brightness(DISP_BRIGHTNESS)
     
-    def kill_process(self):
-        """Kill the emulator process."""
+    def kill_process(self, timeout: float = QUIT_TIMEOUT):
+        """Kill the emulator process. The process launched by this instance
+        is terminated, then killed if it does not exit within `timeout` seconds.
+        An emulator launched some other way is killed by name."""
         logger.info(f"killing {EMULATOR_NAME} process")
-        if Platform.is_mac():
-            app_name, _ = os.path.basename(RETROARCH_APP_FP).split(".")
-            os.system(f"killall {app_name}")
-        elif Platform.is_windows():
-            exe = os.path.basename(RETROARCH_APP_FP)
-            os.system(f"taskkill /IM {exe}")
-        delay(1, universal=True)
+        if self.process is not None:
+            self._stop_process(timeout, wait_for_exit=False)
+        else:
+            if Platform.is_mac():
+                app_name, _ = os.path.basename(self.app_fp).split(".")
+                os.system(f"killall {app_name}")
+            elif Platform.is_windows():
+                exe = os.path.basename(self.app_fp)
+                os.system(f"taskkill /IM {exe}")
+            delay(1, universal=True)
         set_disp_brightness(DISP_BRIGHTNESS)
+    
+    def _stop_process(self, timeout: float, wait_for_exit: bool):
+        """Stop the emulator process, escalating from waiting for it to exit
+        on its own (when asked to exit) to terminating and then killing it,
+        giving each step `timeout` seconds."""
+        stops = [None] if wait_for_exit else []
+        stops += [self.process.terminate, self.process.kill]
+        for stop in stops:
+            if stop is not None and self.process.poll() is None:
+                logger.debug(f"{stop.__name__} {EMULATOR_NAME} process {self.process.pid}")
+                stop()
+            try:
+                returncode = self.process.wait(timeout)
+                break
+            except subprocess.TimeoutExpired:
+                logger.warning(f"{EMULATOR_NAME} process {self.process.pid} did not exit within {timeout}s")
+        else:
+            raise RuntimeError(f"Unable to stop {EMULATOR_NAME} process {self.process.pid}")
+        logger.debug(f"{EMULATOR_NAME} exited with code {returncode}")
+        self.process = None
+    
+    def _get_ready_probes(self, log_fn: str = None) -> List[Callable[[], bool]]:
+        """Create the probes that tell when the launched process is ready,
+        depending on what the RetroArch config and the platform allow: the
+        reply to a network command, the menu logged to the log file of this
+        launch and the window of the process. Create before launching, since
+        network commands only tell this instance apart from another instance
+        if no other instance replies on the port already."""
+        probes = []
+        if RETROARCH_CFG.network_cmd_enable:
+            client = NetworkCommandClient(port=RETROARCH_CFG.network_cmd_port, timeout=POLL_INTERVAL)
+            def network_cmd_reply() -> bool:
+                try:
+                    client.request("VERSION")
+                except (ConnectionError, TimeoutError):
+                    return False
+                return True
+            if network_cmd_reply():
+                logger.warning(f"another {EMULATOR_NAME} instance replies to network commands on port "
+                               f"{RETROARCH_CFG.network_cmd_port}, not using them to tell when the emulator is ready")
+            else:
+                probes.append(network_cmd_reply)
+        if log_fn is not None:
+            def log_marker() -> bool:
+                return is_logged(log_fn, READY_LOG_MARKER)
+            probes.append(log_marker)
+        if Platform.is_windows():
+            def window_present() -> bool:
+                return any(get_window_pid(window) == self.process.pid
+                           for window in gui.getWindowsWithTitle(EMULATOR_NAME))
+            probes.append(window_present)
+        return probes
 
     def interact(func):
         """Interact with controls inside the emulator.
@@ -88,9 +212,12 @@ class Emulator():
         to action. Resumes original fast fwd state after action."""
         n_params = len(signature(func).parameters)
         def wrapper_func(self, presses: int = 1, delay_after_press: float = None):
-            fast_fwd_orig_state = self.state.fast_fwd
-            self.fast_fwd_off()
-            delay(0.5, universal=True)
+            # fast fwd is already off for every action of a precise input session
+            in_session = self.precise_session is not None
+            if not in_session:
+                fast_fwd_orig_state = self.state.fast_fwd
+                self.fast_fwd_off()
+                delay(0.5, universal=True)
             
             # call Emulator method based on the method's number of parameters
             if n_params == 3:
@@ -98,10 +225,38 @@ class Emulator():
             else:
                 func(self, delay_after_press)
             
-            if fast_fwd_orig_state == ToggleState.ON:
+            if not in_session and fast_fwd_orig_state == ToggleState.ON:
                 self.fast_fwd_on()
         return wrapper_func
     
+    @contextmanager
+    def precise_input(self) -> Iterator["PreciseInputSession"]:
+        """Make precise inputs in a session: fast fwd and pause are turned off
+        once for the whole session instead of around every precise action.
+        Actions queued in the session run when it is flushed and when the
+        session ends, which restores the original emulator state.
+        Sessions do not nest, an inner session joins the outer one."""
+        if self.precise_session is not None:
+            yield self.precise_session
+            self.precise_session.flush()
+            return
+        
+        fast_fwd_orig_state = self.state.fast_fwd
+        pause_orig_state = self.state.pause
+        self.pause_off()
+        self.fast_fwd_off()
+        delay(0.5, universal=True)
+        self.precise_session = PreciseInputSession(self)
+        try:
+            yield self.precise_session
+            self.precise_session.flush()
+        finally:
+            self.precise_session = None
+            if fast_fwd_orig_state == ToggleState.ON:
+                self.fast_fwd_on()
+            if pause_orig_state == ToggleState.ON:
+                self.pause_on()
+    
     @interact
     def press_a_precise(self, presses: int = 1, delay_after_press: float = None):
         """Press the A button with precision (guarantees exact number of presses)."""
@@ -174,11 +329,31 @@ class Emulator():
         self.cont.press_screenshot_btn(delay_after_press)
         logger.debug("screenshot taken")
     
+    def capture_screenshot(self, timeout: float = WAIT_TIMEOUT) -> str:
+        """Take a screenshot in the emulator and wait until it is written
+        to the screenshot directory. Result is the screenshot filename."""
+        screenshot_watcher = get_file_watcher(RETROARCH_CFG.screenshot_dir, ".png")
+        screenshot_watcher.start()
+        taken_after = time.time()
+        self.take_screenshot()
+        return screenshot_watcher.wait_for_file(after=taken_after, timeout=timeout)
+    
     def save_state(self, delay_after_press: float = None):
         """Save the emulator state."""
         self.cont.press_save_state_btn(delay_after_press)
         logger.info("saved emulator state")
     
+    def capture_state(self, timeout: float = WAIT_TIMEOUT) -> str:
+        """Save the emulator state and wait until it is written
+        to the savestate directory. Result is the savestate filename.
+        Assumes the default state slot, i.e., `.state` files, so every
+        save overwrites the same file."""
+        state_watcher = get_file_watcher(RETROARCH_CFG.savestate_dir, ".state")
+        state_watcher.start()
+        saved_after = time.time()
+        self.save_state()
+        return state_watcher.wait_for_file(after=saved_after, timeout=timeout)
+    
     def load_state(self, delay_after_press: float = None):
         """Load the emulator state."""
         self.cont.press_load_state_btn(delay_after_press)
@@ -213,6 +388,57 @@ class Emulator():
         logger.debug("pause is OFF")
 
 
+def get_executable(app_fp: str) -> str:
+    """Resolve the emulator executable, which is inside the bundle of a macOS app."""
+    if app_fp.endswith(".app"):
+        app_name, _ = os.path.splitext(os.path.basename(app_fp))
+        return os.path.join(app_fp, "Contents", "MacOS", app_name)
+    return app_fp
+
+
+def get_launch_log_fn(launched_at: float) -> str:
+    """Generate the filename of the log file of a launch, unique to this
+    process and the launch time, in the log directory of `retroarch.cfg`."""
+    log_dir = os.path.expanduser(RETROARCH_CFG.log_dir)
+    return os.path.join(log_dir, f"{EMULATOR_NAME.lower()}_{os.getpid()}_{int(launched_at*1000)}.log")
+
+
+def is_logged(log_fn: str, marker: str) -> bool:
+    """Determine if the log file contains the marker."""
+    if not os.path.isfile(log_fn):
+        return False
+    with open(log_fn, "r", errors="replace") as infile:
+        return marker in infile.read()
+
+
+def get_window_pid(window) -> int:
+    """Determine the ID of the process that owns a window (Windows only)."""
+    pid = ctypes.c_ulong()
+    ctypes.windll.user32.GetWindowThreadProcessId(window._hWnd, ctypes.byref(pid))
+    return pid.value
+
+
+class PreciseInputSession():
+    """Queue precise actions to run back to back with fast fwd off.
+    Create with `Emulator.precise_input`."""
+    def __init__(self, emulator: Emulator):
+        self.emulator = emulator
+        self.actions: List[tuple] = []
+    
+    def queue(self, action: Callable, *args, **kwargs) -> "PreciseInputSession":
+        """Queue an action, e.g., `emulator.move_down_precise`, with its arguments."""
+        self.actions.append((action, args, kwargs))
+        return self
+    
+    def flush(self):
+        """Run the queued actions in order, e.g., before taking a screenshot."""
+        actions, self.actions = self.actions, []
+        for action, args, kwargs in actions:
+            action(*args, **kwargs)
+        if len(actions) > 0:
+            logger.debug(f"ran {len(actions)} precise actions")
+
+
 class EmulatorState():
     """Track state inside an emulator."""
     def __init__(self):
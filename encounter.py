@@ -1,16 +1,27 @@
-"""Facilitate a static encounter with a Pokémon."""
+"""Facilitate static and random encounters with Pokémon."""
 
+from enum import Enum
 import logging
 import os
+import random
+from typing import Union
 
-from config import RETROARCH_CFG
+from config import HUNT_MODE, SPRITE_CLASSIFIER, SPRITE_SOURCE
+from controller import Button
 from emulator import Emulator
 from image import (
+    SpriteClassifier,
     crop_pokemon_in_battle,
+    determine_pokemon,
     determine_sprite_type,
-    get_latest_png_fn,
+    is_battle,
 )
+from macro import PRESS_GAP, MacroExecutor, MacroReport, compile_sequence
+from memory import MemorySpriteReader
 from pokemon import Pokemon, SpriteType
+from retroarch import get_native_save_name
+from savestate import SavestateSpriteReader
+from timing_profile import EncounterTiming, TimingProfile, load_timing_profile
 from helpers.common import delay
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
@@ -29,18 +40,78 @@ STATIC_ENCOUNTERS = {
     "ODD EGG":   { "sequence": "aaaaa"}
 }
 
+RANDOM_ENCOUNTER_MAX_WALKS = 50
+"""The number of walks back and forth looking for a wild Pokémon before giving up."""
+
+WALK_STEPS = 4
+"""The number of steps walked in one direction before turning around."""
+
+STEP_FRAMES = 16
+"""The number of frames the player takes to walk one step."""
+
+
+CHECKPOINT_MIN_FRAMES = 15
+"""The fewest frames to let pass after loading the checkpoint, so the state is fully loaded."""
+
+CHECKPOINT_MAX_FRAMES = 120
+"""The most frames to let pass after loading the checkpoint."""
+
+
+class EncounterType(str, Enum):
+    """Enumeration for the kinds of encounters to hunt."""
+    STATIC = "static"
+    RANDOM = "random"
+
+
+class HuntMode(str, Enum):
+    """Enumeration for the ways to start every attempt at an encounter."""
+    RESET = "reset"
+    CHECKPOINT = "checkpoint"
+
+
+class SpriteSource(str, Enum):
+    """Enumeration for where the sprite type of a wild Pokémon is read from."""
+    IMAGE = "image"
+    MEMORY = "memory"
+    SAVESTATE = "savestate"
+
 
 class StaticEncounter():
     """Maintain state for a static encounter."""
-    def __init__(self, emulator: Emulator, pokemon: Pokemon):
+    def __init__(self,
+                 emulator: Emulator,
+                 pokemon: Pokemon,
+                 classifier: SpriteClassifier = SpriteClassifier(SPRITE_CLASSIFIER),
+                 source: SpriteSource = SpriteSource(SPRITE_SOURCE),
+                 mode: HuntMode = HuntMode(HUNT_MODE),
+                 profile: TimingProfile = None):
+        if mode == HuntMode.CHECKPOINT and source == SpriteSource.SAVESTATE:
+            raise ValueError("The savestate sprite source overwrites the checkpoint. Use the image or memory sprite source.")
         self.emulator = emulator
         self.pokemon = pokemon
+        self.save_name = get_native_save_name(pokemon.name)
+        self.classifier = classifier
+        self.source = source
+        self.sprite_reader = get_sprite_reader(source, emulator)
+        self.mode = mode
+        self.profile = profile if profile is not None else load_timing_profile()
+        self._checkpoint_saved = False
+    
+    def restart(self):
+        """Start over after the emulator was relaunched: continue the game
+        again before using a checkpoint and retry reading sprite types
+        from a source that stopped responding."""
+        self._checkpoint_saved = False
+        self.sprite_reader = get_sprite_reader(self.source, self.emulator)
     
     def find_shiny(self) -> bool:
         """Find a shiny Pokémon.
         Assumes Pokémon game has been launched in the emulator."""
-        self.emulator.reset()
-        self.emulator.continue_pokemon_game()
+        if self.mode == HuntMode.CHECKPOINT:
+            self._start_from_checkpoint()
+        else:
+            self.emulator.reset()
+            self.emulator.continue_pokemon_game(self.profile.continue_scale)
         sprite = self._encounter_static()
 
         if sprite == SpriteType.SHINY:
@@ -49,47 +120,159 @@ class StaticEncounter():
             shiny_found = False
         return shiny_found
 
+    def _start_from_checkpoint(self):
+        """Start an attempt from a savestate just before the encounter is
+        triggered instead of resetting and continuing the game. The first
+        attempt continues the game to get there and saves the checkpoint,
+        once per hunt. Every attempt then lets a random number of frames
+        pass so the encounter is triggered with a different RNG state."""
+        if self._checkpoint_saved:
+            self.emulator.load_state()
+        else:
+            self.emulator.reset()
+            self.emulator.continue_pokemon_game(self.profile.continue_scale)
+            self.emulator.capture_state()
+            self._checkpoint_saved = True
+            logger.debug("saved checkpoint")
+        frames = random.randint(CHECKPOINT_MIN_FRAMES, CHECKPOINT_MAX_FRAMES)
+        # relative delays are written for a core running at 300 fps
+        delay(frames/300)
+        logger.debug(f"let {frames} frames pass after the checkpoint")
+
+    def get_timing(self) -> EncounterTiming:
+        """The timing of the encounter calibrated on this machine,
+        falling back to the hand-tuned timing of `STATIC_ENCOUNTERS`."""
+        timing = self.profile.get_encounter_timing(self.pokemon.name)
+        if timing is None:
+            timing = get_default_timing(self.pokemon.name)
+        return timing
+
     def _encounter_static(self) -> SpriteType:
         """Encounter a static Pokémon with the objective of entering a battle."""
         pokemon = self.pokemon
         logger.debug(f"encountering static {pokemon.name}")
-        static_encounter = STATIC_ENCOUNTERS[pokemon.name]
-        sequence: str = static_encounter["sequence"]
-        seconds: int = static_encounter["delay"]
-        perform_btn_sequence(self.emulator, sequence)
-        delay(seconds)
+        sequence: str = STATIC_ENCOUNTERS[pokemon.name]["sequence"]
+        timing = self.get_timing()
+        # the wait for the battle is planned with the sequence, on the same clock
+        perform_btn_sequence(self.emulator, sequence, settle=timing.delay, press_gap=timing.press_gap)
         logger.debug(f"wild {pokemon.name} appeared")
-        self.emulator.take_screenshot(delay_after_press=0.25)
-        screenshot_fn = get_latest_png_fn(RETROARCH_CFG.screenshot_dir)
+        if self.sprite_reader is not None:
+            sprite = self.sprite_reader.determine_sprite_type(pokemon)
+            if sprite == SpriteType.SHINY:
+                # keep a screenshot of the shiny for the notification
+                self.emulator.capture_screenshot()
+            if sprite is not None:
+                return sprite
+        screenshot_fn = self.emulator.capture_screenshot()
         crop = crop_pokemon_in_battle(screenshot_fn, del_png=False)
-        sprite = determine_sprite_type(pokemon, crop)
+        sprite = determine_sprite_type(pokemon, crop, self.classifier)
         if sprite == SpriteType.NORMAL:
             os.remove(screenshot_fn)
             logger.debug(f"removed screenshot {screenshot_fn}")
         return sprite
 
 
-def perform_btn_sequence(emulator: Emulator, sequence: str):
-    """Perform a button sequence in the emulator using a
-    shorthand representation of the series of buttons."""
-    for char in sequence:
-        if char == "a":
-            emulator.press_a()
-        elif char == "b":
-            emulator.press_b()
-        elif char == "u":
-            emulator.move_up()
-        elif char == "d":
-            emulator.move_down()
-        elif char == "r":
-            emulator.move_right()
-        elif char == "l":
-            emulator.move_left()
-        elif char == "s":
-            emulator.press_start()
+class RandomEncounter():
+    """Maintain state for random encounters, e.g., walking in
+    grass or surfing. Assumes the native save `save_name` was saved
+    where wild Pokémon appear with room to walk left and right. The
+    species varies from encounter to encounter so it is determined
+    from the battle sprite."""
+    def __init__(self,
+                 emulator: Emulator,
+                 save_name: str,
+                 max_walks: int = RANDOM_ENCOUNTER_MAX_WALKS,
+                 walk_steps: int = WALK_STEPS):
+        self.emulator = emulator
+        self.save_name = save_name
+        self.max_walks = max_walks
+        self.walk_steps = walk_steps
+        self.pokemon: Pokemon = None  # most recently encountered
+        # the species is not known in advance, sprite types come from screenshots
+        self.sprite_reader = None
+    
+    def restart(self):
+        """Start over after the emulator was relaunched. Every
+        attempt resets and continues the game, nothing to start over."""
+        logger.debug(f"restarting random encounters in {self.save_name}")
+    
+    def find_shiny(self) -> bool:
+        """Find a shiny Pokémon.
+        Assumes Pokémon game has been launched in the emulator."""
+        self.emulator.reset()
+        self.emulator.continue_pokemon_game()
+        sprite = self._encounter_random()
+
+        if sprite == SpriteType.SHINY:
+            shiny_found = True
         else:
-            raise RuntimeError(f"Unknown character in sequence: {char}. No button selected.")
-        delay(0.5)
+            shiny_found = False
+        return shiny_found
+
+    def _encounter_random(self) -> Union[SpriteType, None]:
+        """Walk left and right until a wild Pokémon appears.
+        `None` if no wild Pokémon appeared within the maximum number of walks."""
+        logger.debug(f"looking for a wild Pokémon in {self.save_name}")
+        for n_walks in range(self.max_walks):
+            direction = Button.LEFT if n_walks % 2 == 0 else Button.RIGHT
+            walk(self.emulator, direction, self.walk_steps)
+            delay(0.5)
+            screenshot_fn = self.emulator.capture_screenshot()
+            if is_battle(screenshot_fn):
+                break
+            os.remove(screenshot_fn)
+        else:
+            logger.warning(f"no wild Pokémon appeared after {self.max_walks} walks")
+            return None
+
+        crop = crop_pokemon_in_battle(screenshot_fn, del_png=False)
+        name, sprite = determine_pokemon(crop)
+        self.pokemon = Pokemon(name)
+        logger.debug(f"wild {self.pokemon.name} appeared after {n_walks + 1} walks")
+        if sprite == SpriteType.NORMAL:
+            os.remove(screenshot_fn)
+            logger.debug(f"removed screenshot {screenshot_fn}")
+        return sprite
+
+
+def get_sprite_reader(source: SpriteSource,
+                      emulator: Emulator) -> Union[MemorySpriteReader, SavestateSpriteReader, None]:
+    """Create the reader for sprite types that do not come from screenshots.
+    `None` if sprite types come from screenshots."""
+    if source == SpriteSource.IMAGE:
+        return None
+    elif source == SpriteSource.MEMORY:
+        return MemorySpriteReader()
+    elif source == SpriteSource.SAVESTATE:
+        return SavestateSpriteReader(emulator.capture_state)
+    else:
+        raise ValueError(f"Unsupported sprite source: {source}")
+
+
+def get_default_timing(pokemon_name: str) -> EncounterTiming:
+    """The hand-tuned timing of a static encounter."""
+    return EncounterTiming(press_gap=PRESS_GAP, delay=STATIC_ENCOUNTERS[pokemon_name.upper()]["delay"])
+
+
+def perform_btn_sequence(emulator: Emulator,
+                         sequence: str,
+                         settle: float = 0,
+                         press_gap: float = PRESS_GAP) -> MacroReport:
+    """Perform a button sequence in the emulator using a
+    shorthand representation of the series of buttons, pressed
+    `press_gap` relative seconds apart. Returns once `settle`
+    relative seconds have passed after the sequence."""
+    macro = compile_sequence(sequence, settle=settle, press_gap=press_gap)
+    return MacroExecutor(emulator.cont).run(macro)
+
+
+def walk(emulator: Emulator, direction: Button, steps: int):
+    """Walk a number of steps in a direction by holding it down. A tap
+    only turns the player around when facing another direction."""
+    emulator.cont.hold(direction)
+    # relative delays are written for a core running at 300 fps
+    delay(steps*STEP_FRAMES/300)
+    emulator.cont.release(direction)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+"""Watch the heartbeats of a hunt to detect when the emulator stops making progress."""
+
+import logging
+import threading
+import time
+from typing import Callable, Union
+
+from helpers.file_watch import get_file_watcher
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+ATTEMPT_DEADLINE = 120
+"""The number of seconds a single attempt may take."""
+
+SCREENSHOT_TIMEOUT = 30
+"""The number of seconds an attempt may go without a new screenshot."""
+
+CHECK_INTERVAL = 1
+"""The number of seconds between heartbeat checks."""
+
+
+class Watchdog():
+    """Check the heartbeats of a hunt in a background thread: the emulator
+    process is alive, the current attempt finishes within its deadline and,
+    when attempts take screenshots, new screenshots keep arriving. The first
+    failed check is recorded in `failure` and reported to `on_failure` once,
+    e.g., to kill a hung emulator so the attempt fails fast. Recovering is
+    left to the hunt, which calls `reset` afterwards."""
+    def __init__(self,
+                 is_alive: Callable[[], bool],
+                 on_failure: Callable[[str], None] = None,
+                 attempt_deadline: float = ATTEMPT_DEADLINE,
+                 screenshot_dir: str = None,
+                 screenshot_timeout: float = SCREENSHOT_TIMEOUT,
+                 check_interval: float = CHECK_INTERVAL):
+        self.is_alive = is_alive
+        self.on_failure = on_failure
+        self.attempt_deadline = attempt_deadline
+        self.screenshot_timeout = screenshot_timeout
+        self.check_interval = check_interval
+        self.failure: str = None
+        self._screenshot_watcher = get_file_watcher(screenshot_dir, ".png") if screenshot_dir is not None else None
+        self._attempt_started: float = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def start(self):
+        """Start checking heartbeats in a background thread."""
+        if self._screenshot_watcher is not None:
+            self._screenshot_watcher.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True, name="Watchdog")
+        self._thread.start()
+
+    def stop(self):
+        """Stop checking heartbeats."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def attempt_started(self):
+        """Heartbeat: an attempt started."""
+        with self._lock:
+            self._attempt_started = time.time()
+
+    def attempt_finished(self):
+        """Heartbeat: the attempt finished."""
+        with self._lock:
+            self._attempt_started = None
+
+    def reset(self):
+        """Forget the failure, after the hunt recovered from it."""
+        with self._lock:
+            self.failure = None
+            self._attempt_started = None
+
+    def check(self) -> Union[str, None]:
+        """Check the heartbeats. Result is the reason the
+        hunt is failing, `None` if it is healthy."""
+        if not self.is_alive():
+            return "emulator process is not running"
+        with self._lock:
+            attempt_started = self._attempt_started
+        if attempt_started is None:
+            return None
+        now = time.time()
+        if now - attempt_started > self.attempt_deadline:
+            return f"attempt did not finish within {self.attempt_deadline}s"
+        if self._screenshot_watcher is not None:
+            _, screenshot_seen = self._screenshot_watcher.latest()
+            last_heartbeat = max(attempt_started, screenshot_seen or 0)
+            if now - last_heartbeat > self.screenshot_timeout:
+                return f"no new screenshot within {self.screenshot_timeout}s"
+        return None
+
+    def _watch(self):
+        """Check the heartbeats until stopped, reporting the first failure."""
+        while not self._stop.wait(self.check_interval):
+            if self.failure is not None:
+                continue
+            failure = self.check()
+            if failure is None:
+                continue
+            with self._lock:
+                self.failure = failure
+            logger.error(f"watchdog: {failure}")
+            if self.on_failure is not None:
+                self.on_failure(failure)
@@ -0,0 +1,102 @@
+"""Read asset files straight from their zip archives."""
+
+import fnmatch
+from functools import lru_cache
+import glob
+import logging
+import os
+import threading
+from typing import Dict, List, Tuple
+from zipfile import ZipFile, ZipInfo
+
+import cv2
+import numpy as np
+
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+ASSET_CACHE_SIZE = 1024
+"""The maximum number of decoded images kept in memory."""
+
+JUNK_NAMES = ("__MACOSX", ".DS_Store")
+"""Archive members created by the OS, not by the project."""
+
+
+class AssetProvider():
+    """Resolve asset paths to members of zip archives. The central directory
+    of each archive is indexed once and members are read into memory on demand,
+    so nothing is ever extracted to disk. A zip archive `<dir>.zip` serves the
+    paths under `<dir>`; paths not found in any archive are read from disk."""
+    def __init__(self, cache_size: int = ASSET_CACHE_SIZE):
+        self._index: Dict[str, Tuple[str, ZipInfo]] = dict()
+        self._zipfiles: Dict[str, Tuple[int, ZipFile]] = dict()
+        self._lock = threading.Lock()
+        self.imread = lru_cache(maxsize=cache_size)(self._imread)
+
+    def index_zipfiles(self, zipfiles: List[str]):
+        """Index the members of each zip archive by the path they would be
+        extracted to, skipping directories and OS junk."""
+        for zip_fn in zipfiles:
+            zip = self._open(zip_fn)
+            extract_dir = os.path.dirname(zip_fn)
+            n_members = 0
+            for info in zip.infolist():
+                parts = info.filename.split("/")
+                if info.is_dir() or any(part in JUNK_NAMES for part in parts):
+                    continue
+                self._index[os.path.normpath(os.path.join(extract_dir, *parts))] = (zip_fn, info)
+                n_members += 1
+            logger.debug(f"indexed {n_members} members of {zip_fn}")
+
+    def exists(self, path: str) -> bool:
+        """Determine if an asset exists."""
+        return os.path.normpath(path) in self._index or os.path.isfile(path)
+
+    def glob(self, pattern: str) -> List[str]:
+        """Find the assets matching a `glob` pattern in a single directory."""
+        pattern_dir, pattern_fn = os.path.split(os.path.normpath(pattern))
+        paths = set(glob.glob(pattern))
+        paths.update(path for path in self._index
+                     if os.path.dirname(path) == pattern_dir
+                     and fnmatch.fnmatch(os.path.basename(path), pattern_fn))
+        return sorted(paths)
+
+    def read(self, path: str) -> bytes:
+        """Read the contents of an asset into memory."""
+        member = self._index.get(os.path.normpath(path))
+        if member is None:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"No asset at {path}")
+            with open(path, "rb") as infile:
+                return infile.read()
+
+        zip_fn, info = member
+        with self._lock:
+            return self._open(zip_fn).read(info)
+
+    def _imread(self, path: str) -> cv2.Mat:
+        """Decode an image asset in the same way as `cv2.imread`.
+        `None` if the asset does not exist or cannot be decoded.
+        Decoded images are cached, so they are read-only."""
+        try:
+            data = self.read(path)
+        except FileNotFoundError:
+            return None
+        img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is not None:
+            img.flags.writeable = False
+        return img
+
+    def _open(self, zip_fn: str) -> ZipFile:
+        """Open a zip archive once per process. A forked process
+        must not share the file position of its parent's handle."""
+        pid, zip = self._zipfiles.get(zip_fn, (None, None))
+        if pid != os.getpid():
+            zip = ZipFile(zip_fn, "r")
+            self._zipfiles[zip_fn] = (os.getpid(), zip)
+        return zip
+
+
+ASSETS = AssetProvider()
+"""The asset provider shared by the whole process (see `config`)."""
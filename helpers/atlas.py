@@ -0,0 +1,93 @@
+"""Pack equally sized images into a single memory-mapped file."""
+
+import logging
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+ATLAS_MAGIC = b"IMGATLS1"
+"""Identifies an image atlas file and the version of its layout."""
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("n_keys", "<u4"),
+    ("n_variants", "<u4"),
+    ("height", "<u4"),
+    ("width", "<u4"),
+    ("channels", "<u4"),
+])
+"""The layout of the atlas header, followed by the offset table then the pixel data."""
+
+TABLE_DTYPE = np.dtype([
+    ("key", "<i8"),
+    ("offset", "<u8"),
+])
+"""The layout of an offset table entry, the position of a key's images in the file."""
+
+
+class ImageAtlas():
+    """Read-only access to the images packed by `write_atlas`. The file is
+    memory-mapped once and images are handed out as views into it, so nothing
+    is decoded or copied and processes reading the same atlas share its pages."""
+    def __init__(self, atlas_fn: str):
+        self.atlas_fn = atlas_fn
+        self._mmap = np.memmap(atlas_fn, dtype=np.uint8, mode="r")
+        header = np.frombuffer(self._mmap, dtype=HEADER_DTYPE, count=1)[0]
+        if header["magic"] != ATLAS_MAGIC:
+            raise RuntimeError(f"{atlas_fn} is not an image atlas")
+        self.n_variants = int(header["n_variants"])
+        self.img_shape = (int(header["height"]), int(header["width"]), int(header["channels"]))
+        table = np.frombuffer(self._mmap, dtype=TABLE_DTYPE,
+                              count=int(header["n_keys"]), offset=HEADER_DTYPE.itemsize)
+        self._offsets = {int(key): int(offset) for key, offset in table}
+        logger.debug(f"mapped image atlas {atlas_fn} with {len(self)} keys")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, key: int) -> bool:
+        return int(key) in self._offsets
+
+    def get(self, key: int, variant: int = 0) -> np.ndarray:
+        """Retrieve a read-only view of an image by its key and variant."""
+        if not 0 <= variant < self.n_variants:
+            raise IndexError(f"Variant {variant} out of range. Atlas has {self.n_variants} variants.")
+        offset = self._offsets[int(key)] + variant*int(np.prod(self.img_shape))
+        return np.ndarray(self.img_shape, dtype=np.uint8, buffer=self._mmap, offset=offset)
+
+
+def write_atlas(atlas_fn: str, imgs: Dict[int, List[np.ndarray]]):
+    """Pack images into an atlas file. Every key maps to the same number of
+    variants and every image must have the same shape. The file is written
+    next to its destination first so readers never map a partial atlas."""
+    if len(imgs) == 0:
+        raise RuntimeError("Expected at least one image to pack.")
+    variants = list(imgs.values())
+    n_variants = len(variants[0])
+    img_shape = variants[0][0].shape
+    for key, key_imgs in imgs.items():
+        if len(key_imgs) != n_variants or any(img.shape != img_shape for img in key_imgs):
+            raise RuntimeError(f"Expected {n_variants} images of shape {img_shape} for key {key}.")
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (ATLAS_MAGIC, len(imgs), n_variants, *img_shape)
+    table = np.zeros(len(imgs), dtype=TABLE_DTYPE)
+    data_offset = HEADER_DTYPE.itemsize + TABLE_DTYPE.itemsize*len(imgs)
+    stride = n_variants*int(np.prod(img_shape))
+    for i, key in enumerate(imgs):
+        table[i] = (key, data_offset + i*stride)
+
+    tmp_fn = f"{atlas_fn}.tmp{os.getpid()}"
+    with open(tmp_fn, "wb") as outfile:
+        outfile.write(header.tobytes())
+        outfile.write(table.tobytes())
+        for key_imgs in imgs.values():
+            for img in key_imgs:
+                outfile.write(np.ascontiguousarray(img, dtype=np.uint8).tobytes())
+    os.replace(tmp_fn, atlas_fn)
+    logger.debug(f"packed {len(imgs)} keys into image atlas {atlas_fn}")
@@ -3,24 +3,40 @@
 import logging
 import os
 import shutil
-import time
 from typing import Union
 
 from config import EMULATOR_CORE_AVG_FPS
 from helpers.platform import Platform
+from helpers.timing import precise_sleep
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
 
 
+_core_fps: float = None
+"""The measured frame rate of the emulator core, `None` to use `EMULATOR_CORE_AVG_FPS`."""
+
+
+def get_delay_factor() -> float:
+    """The factor relative delays are scaled by.
+    300 fps is the basis for all delays so generate factor from there."""
+    fps = _core_fps if _core_fps is not None else EMULATOR_CORE_AVG_FPS
+    return 300/fps
+
+
+def set_core_fps(fps: Union[float, None]):
+    """Scale relative delays by the measured frame rate of the emulator
+    core from now on. `None` goes back to `EMULATOR_CORE_AVG_FPS`."""
+    global _core_fps
+    _core_fps = fps
+
+
 def delay(sec: float, universal: bool = False):
     """Delay program execution by some number of seconds."""
     if not universal:
         # this delay is relative so scale it by some factor
-        # 300 fps is the basis for all delays so generate factor from there
-        factor = 300/EMULATOR_CORE_AVG_FPS
-        sec *= factor
+        sec *= get_delay_factor()
     logger.debug(f"delay {sec}s")
-    time.sleep(sec)
+    precise_sleep(sec)
 
 
 def set_disp_brightness(val: float = None):
@@ -102,5 +102,8 @@ def get_file_creation_time(file_path):
         # macOS
         return stat.st_birthtime
     except AttributeError:
-        # Windows
-        return stat.st_ctime
\ No newline at end of file
+        if Platform.is_windows():
+            return stat.st_ctime
+        # Linux has no creation time and st_ctime is the last metadata
+        # change, so the last modification is the closest substitute
+        return stat.st_mtime
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""Keep track of the newest file written to a directory."""
+
+import ctypes
+import ctypes.util
+from functools import lru_cache
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import Dict, Tuple, Union
+
+from helpers.platform import Platform
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+POLL_INTERVAL = 0.05
+"""The number of seconds between directory scans when inotify is unavailable."""
+
+WAIT_TIMEOUT = 5
+"""The default number of seconds to wait for a new file."""
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+"""The fixed size part of `struct inotify_event`: wd, mask, cookie, len."""
+
+
+class FileWatcher():
+    """Record the newest file with an extension in a directory as it is
+    written. Uses inotify on Linux and falls back to polling the directory
+    elsewhere. Files are timestamped with the wall clock time they were seen
+    complete, so the newest file is known without listing the directory."""
+    def __init__(self,
+                 dir: str,
+                 ext: str = ".png",
+                 poll_interval: float = POLL_INTERVAL,
+                 use_inotify: bool = True):
+        if not os.path.isdir(dir):
+            raise NotADirectoryError(f"Must provide a valid directory. Invalid dir: {dir}")
+        self.dir = dir
+        self.ext = ext
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self._cond = threading.Condition()
+        self._latest: Tuple[str, float] = (None, None)
+        self._pid: int = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def start(self):
+        """Start watching the directory in a background thread. Threads do not
+        survive a fork, so a forked process starts its own on first use."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._stop.clear()
+        self._cond = threading.Condition()
+
+        # watch before seeding so no file written in between is missed
+        inotify_fd = None
+        if self.use_inotify and Platform.is_linux():
+            inotify_fd = _inotify_watch(self.dir)
+
+        # seed with the newest file already in the directory
+        files = self._scan()
+        with self._cond:
+            if len(files) > 0:
+                fn = max(files, key=lambda f: files[f][0])
+                self._latest = (fn, files[fn][0])
+            else:
+                self._latest = (None, None)
+
+        if inotify_fd is not None:
+            target, args, mode = self._watch_inotify, (inotify_fd,), "inotify"
+        else:
+            target, args, mode = self._watch_polling, (files,), "polling"
+        self._thread = threading.Thread(target=target, args=args, daemon=True,
+                                        name=f"FileWatcher({self.dir})")
+        self._thread.start()
+        logger.debug(f"watching {self.dir} for *{self.ext} files ({mode})")
+
+    def stop(self):
+        """Stop watching the directory."""
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+        self._pid = None
+
+    def latest(self) -> Tuple[Union[str, None], Union[float, None]]:
+        """The newest file and the time it was seen. `(None, None)` if there is none."""
+        self.start()
+        with self._cond:
+            return self._latest
+
+    def wait_for_file(self, after: float, timeout: float = WAIT_TIMEOUT) -> str:
+        """Block until a file newer than `after`, a `time.time()` timestamp,
+        has been written and return its filename.
+        Raises `TimeoutError` if no such file appears within `timeout` seconds."""
+        self.start()
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self._latest[1] is not None and self._latest[1] > after,
+                                     timeout=timeout)
+            if not ok:
+                raise TimeoutError(f"No *{self.ext} file written to {self.dir} within {timeout}s")
+            return self._latest[0]
+
+    def _publish(self, fn: str, seen: float):
+        """Record a newly written file and wake up the waiters."""
+        with self._cond:
+            self._latest = (fn, seen)
+            self._cond.notify_all()
+        logger.debug(f"new file {fn}")
+
+    def _forget(self, fn: str):
+        """Forget the newest file when it is removed."""
+        with self._cond:
+            if self._latest[0] == fn:
+                self._latest = (None, None)
+
+    def _watch_inotify(self, inotify_fd: int):
+        """Publish files as inotify reports them closed after writing
+        or moved into the directory."""
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([inotify_fd], [], [], 0.5)
+                if not ready:
+                    continue
+                buf = os.read(inotify_fd, 64*1024)
+                seen = time.time()
+                offset = 0
+                while offset < len(buf):
+                    _, mask, _, name_len = INOTIFY_EVENT.unpack_from(buf, offset)
+                    offset += INOTIFY_EVENT.size
+                    name = buf[offset:offset + name_len].rstrip(b"\0").decode()
+                    offset += name_len
+                    if not name.endswith(self.ext):
+                        continue
+                    fn = os.path.join(self.dir, name)
+                    if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                        self._publish(fn, seen)
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        self._forget(fn)
+        finally:
+            os.close(inotify_fd)
+
+    def _watch_polling(self, files: Dict[str, Tuple[float, int]]):
+        """Publish files found by scanning the directory once their
+        modification time and size stop changing between scans, i.e., they
+        are completely written. A file that is written again, e.g., a
+        savestate overwriting the same slot, is published again."""
+        pending: Dict[str, Tuple[float, int]] = dict()
+        known = dict(files)
+        while not self._stop.wait(self.poll_interval):
+            files = self._scan()
+            seen = time.time()
+            for fn in set(known) - set(files):
+                self._forget(fn)
+                del known[fn]
+            for fn in set(pending) - set(files):
+                del pending[fn]
+            for fn, stat in files.items():
+                if known.get(fn) == stat:
+                    pending.pop(fn, None)
+                    continue
+                if pending.get(fn) == stat:
+                    del pending[fn]
+                    known[fn] = stat
+                    self._publish(fn, seen)
+                else:
+                    pending[fn] = stat
+
+    def _scan(self) -> Dict[str, Tuple[float, int]]:
+        """List the files with the extension along with their
+        modification time and size."""
+        files = dict()
+        with os.scandir(self.dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.ext) and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime, stat.st_size)
+        return files
+
+
+@lru_cache(maxsize=None)
+def get_file_watcher(dir: str, ext: str = ".png") -> FileWatcher:
+    """Retrieve the watcher of a directory, one per directory and
+    extension so the directory is only watched once per process."""
+    return FileWatcher(dir, ext)
+
+
+def _inotify_watch(dir: str) -> Union[int, None]:
+    """Watch a directory with inotify.
+    `None` if inotify is unavailable."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        inotify_fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if inotify_fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE | IN_MOVED_FROM
+        if libc.inotify_add_watch(inotify_fd, os.fsencode(dir), mask) < 0:
+            os.close(inotify_fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {dir}")
+    except (AttributeError, OSError) as e:
+        logger.warning(f"inotify unavailable, falling back to polling: {e}")
+        return None
+    return inotify_fd
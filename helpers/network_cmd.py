@@ -0,0 +1,80 @@
+"""Send network commands to RetroArch over UDP."""
+
+import logging
+import os
+import socket
+from typing import Tuple, Union
+
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+NETWORK_CMD_HOST = "127.0.0.1"
+"""RetroArch only listens for network commands on the local machine by default."""
+
+NETWORK_CMD_PORT = 55355
+"""The default `network_cmd_port` in `retroarch.cfg`."""
+
+NETWORK_CMD_TIMEOUT = 1
+"""The default number of seconds to wait for a reply."""
+
+MAX_REPLY_SIZE = 64*1024
+"""The largest datagram accepted as a reply."""
+
+
+class NetworkCommandClient():
+    """Send commands such as `RESET`, `SCREENSHOT` or `FAST_FORWARD` to
+    RetroArch's network command interface (`network_cmd_enable` in
+    `retroarch.cfg`). Commands are plain text datagrams, so they reach the
+    emulator without window focus or synthesized keystrokes."""
+    def __init__(self,
+                 port: int = NETWORK_CMD_PORT,
+                 host: str = NETWORK_CMD_HOST,
+                 timeout: float = NETWORK_CMD_TIMEOUT):
+        self.address = (host, port)
+        self.timeout = timeout
+        self._sock: Tuple[int, socket.socket] = (None, None)
+
+    def send(self, command: str, *args: Union[str, int]):
+        """Send a command without waiting for a reply."""
+        msg = " ".join([command, *map(str, args)])
+        self._socket().sendto(msg.encode(), self.address)
+        logger.debug(f"sent network command: {msg}")
+
+    def request(self, command: str, *args: Union[str, int]) -> str:
+        """Send a command and wait for its reply.
+        Raises `TimeoutError` if no reply arrives within the timeout."""
+        sock = self._socket()
+        # drop replies to earlier requests that arrived after their timeout
+        sock.setblocking(False)
+        try:
+            while True:
+                sock.recv(MAX_REPLY_SIZE)
+        except (BlockingIOError, ConnectionError):
+            pass
+        finally:
+            sock.settimeout(self.timeout)
+
+        self.send(command, *args)
+        try:
+            reply, _ = sock.recvfrom(MAX_REPLY_SIZE)
+        except socket.timeout:
+            raise TimeoutError(f"No reply to {command} from {self.address[0]}:{self.address[1]} within {self.timeout}s")
+        return reply.decode().strip()
+
+    def close(self):
+        """Close the socket."""
+        pid, sock = self._sock
+        if sock is not None and pid == os.getpid():
+            sock.close()
+        self._sock = (None, None)
+
+    def _socket(self) -> socket.socket:
+        """Open the socket once per process, so a forked
+        process does not read its parent's replies."""
+        pid, sock = self._sock
+        if pid != os.getpid():
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.settimeout(self.timeout)
+            self._sock = (os.getpid(), sock)
+        return sock
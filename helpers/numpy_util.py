@@ -0,0 +1,61 @@
+"""Facilitates vectorized operations on NumPy pixel arrays."""
+
+from typing import Tuple
+
+import numpy as np
+
+WHITE_MIN = 245
+"""The minimum value of every color component for a pixel to be considered white."""
+
+
+def get_white_mask(pixels: np.ndarray) -> np.ndarray:
+    """Build a boolean mask that is `True` where a pixel is white
+    (allows for slightly off-white). The channel axis is dropped."""
+    return np.all(pixels >= WHITE_MIN, axis=-1)
+
+
+def get_mean_color(pixels: np.ndarray, ignore_white: bool = True) -> np.ndarray:
+    """Obtain the color of an array of pixels as a single value per channel.
+    Result is the color averaged over all pixels, in the same channel order
+    as the pixel array.
+
+    Optionally, ignore white pixels. If every pixel is white, the
+    average is taken over all pixels instead.
+    """
+    n_channels = pixels.shape[-1]
+    pixels = pixels.reshape(-1, n_channels)
+    if ignore_white:
+        not_white = ~get_white_mask(pixels)
+        if np.any(not_white):
+            pixels = pixels[not_white]
+    return pixels.mean(axis=0, dtype=np.float64)
+
+
+COLOR_BITS = 5
+"""The number of bits per color component of a Game Boy Color palette."""
+
+
+def get_color_histogram(pixels: np.ndarray, ignore_white: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Count the pixels of each color after quantizing every color component
+    to `COLOR_BITS` bits, in a single pass over the pixel array.
+    Result is the distinct colors, at the center of their quantization step and
+    in the same channel order as the pixel array, and their pixel counts.
+
+    Optionally, ignore white pixels.
+    """
+    pixels = pixels.reshape(-1, pixels.shape[-1])
+    if ignore_white:
+        pixels = pixels[~get_white_mask(pixels)]
+
+    # pack the quantized components of each pixel into a single integer code
+    shift = 8 - COLOR_BITS
+    quantized = pixels.astype(np.int32) >> shift
+    codes = (quantized[:, 0] << 2*COLOR_BITS) | (quantized[:, 1] << COLOR_BITS) | quantized[:, 2]
+    counts = np.bincount(codes, minlength=1 << 3*COLOR_BITS)
+
+    # unpack the codes of the colors present
+    codes = np.nonzero(counts)[0]
+    mask = (1 << COLOR_BITS) - 1
+    colors = np.stack([codes >> 2*COLOR_BITS, (codes >> COLOR_BITS) & mask, codes & mask], axis=-1)
+    colors = (colors << shift) + (1 << (shift - 1))
+    return colors, counts[codes]
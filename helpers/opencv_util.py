@@ -2,9 +2,9 @@
 
 import cv2
 import numpy as np
-from typing import Union
+from typing import Any, List, Union
 
-from helpers.common import opposite_signs
+from helpers.numpy_util import WHITE_MIN, get_mean_color
 
 IMG_SIZE_VERY_SMALL = 8
 IMG_SIZE_SMALL = 24
@@ -27,7 +27,7 @@ class RGB():
     def is_white(self) -> bool:
         """Determine if an RGB value is white
         (allows for slightly off-white)."""
-        return self.r >= 245 and self.g >= 245 and self.b >= 245
+        return self.r >= WHITE_MIN and self.g >= WHITE_MIN and self.b >= WHITE_MIN
 
     def is_black(self) -> bool:
         """Determine if an RGB value is black
@@ -55,6 +55,51 @@ class RGB():
     def br_diff(self) -> Union[int, float]:
         """The difference between blue-red component values."""
         return self.b - self.r
+    
+    def diff_signs(self) -> np.ndarray:
+        """The signs of the red-green, green-blue and blue-red differences."""
+        return np.sign([self.rg_diff(), self.gb_diff(), self.br_diff()])
+    
+    def copy(self) -> "RGB":
+        """Create a copy of the RGB value."""
+        rgb = RGB()
+        rgb.r, rgb.g, rgb.b = self.r, self.g, self.b
+        return rgb
+
+
+class TemplateBank():
+    """Stacks template images, resized once to a common size, into a single
+    array so that many images are compared with every template in one pass."""
+    def __init__(self,
+                 imgs: List[cv2.Mat],
+                 labels: List[Any],
+                 resize_width: int,
+                 resize_height: int):
+        if len(imgs) != len(labels):
+            raise RuntimeError(f"Expected one label per template. Got {len(labels)} labels for {len(imgs)} templates.")
+        self.labels = labels
+        self.resize_width = resize_width
+        self.resize_height = resize_height
+        self.templates = np.stack([
+            cv2.resize(img, (resize_width, resize_height)) for img in imgs
+        ]).astype(np.int32)
+    
+    def compare(self, imgs: List[cv2.Mat]) -> np.ndarray:
+        """Compares each image with each template for pixel equality
+        (see `compare_img_pixels`). Result has shape (n_imgs, n_templates)."""
+        imgs = np.stack([
+            cv2.resize(img, (self.resize_width, self.resize_height)) for img in imgs
+        ])
+        # broadcast (n_imgs, 1, h, w, 3) against (1, n_templates, h, w, 3)
+        diffs = _get_pixel_color_diffs(imgs[:, np.newaxis], self.templates[np.newaxis])
+        return np.sum(diffs, axis=(2, 3))
+
+    def classify(self, imgs: List[cv2.Mat]) -> List[Any]:
+        """Label each image with its most similar template."""
+        if len(imgs) == 0:
+            return []
+        indices = np.argmin(self.compare(imgs), axis=1)
+        return [self.labels[i] for i in indices]
 
 
 def compare_img_color(img1: cv2.Mat,
@@ -64,19 +109,34 @@ def compare_img_color(img1: cv2.Mat,
     """Compares the color of two images.
     Result is a number between [min=0,max=255*sqrt(3)] where min -> same color and
     max -> opposite color (white vs black)."""
-    rgb1 = _get_img_color(img1, ignore_white)
-    rgb2 = _get_img_color(img2, ignore_white)
+    rgb1 = get_img_color(img1, ignore_white)
+    rgb2 = get_img_color(img2, ignore_white)
+    return compare_rgb_color(rgb1, rgb2, offset_shading)
+
+
+def compare_rgb_color(rgb1: RGB,
+                      rgb2: RGB,
+                      offset_shading: bool = True,
+                      rgb2_signs: np.ndarray = None) -> float:
+    """Compares two colors, each obtained from `get_img_color`.
+    Result is a number between [min=0,max=255*sqrt(3)] where min -> same color and
+    max -> opposite color (white vs black).
     
+    Optionally, supply the precomputed `RGB.diff_signs` of `rgb2`.
+    """
+    if rgb2_signs is None:
+        rgb2_signs = rgb2.diff_signs()
+
     if offset_shading:
         # offset the values of rgb2 by difference in max from rgb1
+        # (on a copy so precomputed reference colors stay intact)
         amt_offset = rgb1.max() - rgb2.max()
+        rgb2 = rgb2.copy()
         rgb2.offset(amt_offset)
     
     color_diff = _get_color_diff(rgb1, rgb2)
 
-    if opposite_signs(rgb1.rg_diff(), rgb2.rg_diff()) or \
-            opposite_signs(rgb1.gb_diff(), rgb2.gb_diff()) or \
-            opposite_signs(rgb1.br_diff(), rgb2.br_diff()):
+    if np.any(rgb1.diff_signs()*rgb2_signs < 0):
         # compare interactions between the RGB component values
         # if relative interactions have opposing signs, make
         # significant change to the resulting color difference
@@ -96,27 +156,39 @@ def compare_img_pixels(img1: cv2.Mat,
     img1 = cv2.resize(img1, (resize_width, resize_height))
     img2 = cv2.resize(img2, (resize_width, resize_height))
 
-    diff = 0
-    for row1, row2 in zip(img1, img2):
-        for pixel1, pixel2 in zip(row1, row2):
-            # unpack into rgb values for each image
-            rgb1 = RGB(pixel1)
-            rgb2 = RGB(pixel2)
-            diff += _get_color_diff(rgb1, rgb2)
-    return diff
+    # sum the color difference of every pixel pair in one pass
+    return float(np.sum(_get_pixel_color_diffs(img1, img2)))
+
+
+def crop_img(img: cv2.Mat,
+             left: float,
+             top: float,
+             right: float,
+             bottom: float) -> cv2.Mat:
+    """Crop an image to the provided box without copying pixel data.
+    Box coordinates are rounded the same way PIL rounds them and any
+    area of the box outside the image is filled with black."""
+    left, top, right, bottom = map(int, map(round, (left, top, right, bottom)))
+    height, width = get_img_height(img), get_img_width(img)
+    if left >= 0 and top >= 0 and right <= width and bottom <= height:
+        return img[top:bottom, left:right]
+    
+    # box exceeds the image borders so pad with black like PIL
+    crop = np.zeros((bottom - top, right - left, *img.shape[2:]), dtype=img.dtype)
+    src_top, src_bot = max(top, 0), min(bottom, height)
+    src_left, src_right = max(left, 0), min(right, width)
+    if src_top < src_bot and src_left < src_right:
+        crop[src_top - top:src_bot - top, src_left - left:src_right - left] = \
+            img[src_top:src_bot, src_left:src_right]
+    return crop
 
 
 def is_img_white(img: cv2.Mat) -> bool:
     """Determine if an image is all white."""
-    img_color = _get_img_color(img, ignore_white=False)
+    img_color = get_img_color(img, ignore_white=False)
     return img_color.is_white()
 
 
-def _get_n_pixels(img: cv2.Mat) -> int:
-    """Obtain the total number of pixels in an image."""
-    return int(img.size/RGB.LENGTH)
-
-
 def get_img_height(img: cv2.Mat) -> int:
     """Obtain the height of an image, in pixels."""
     return img.shape[0]
@@ -136,25 +208,21 @@ def _get_color_diff(rgb1: RGB, rgb2: RGB) -> float:
     return np.sqrt(pow(r_dist, 2) + pow(g_dist, 2) + pow(b_dist, 2))
 
 
-def _get_img_color(img: cv2.Mat, ignore_white: bool = True) -> RGB:
+def _get_pixel_color_diffs(img1: np.ndarray, img2: np.ndarray) -> np.ndarray:
+    """Use euclidean distance formula to calculate difference
+    between each pair of pixels in two equally sized images.
+    Result has the shape of the images minus the channel axis."""
+    # cast once so the subtraction cannot wrap around uint8
+    dist = img2.astype(np.int32) - img1.astype(np.int32)
+    return np.sqrt(np.sum(dist*dist, axis=-1))
+
+
+def get_img_color(img: cv2.Mat, ignore_white: bool = True) -> RGB:
     """Obtain the color of an image as a single RGB value.
     Result is the color averaged over all pixels.
     
     Optionally, ignore white pixels.
     """
-    tot_color = RGB()
-    n_pixels = _get_n_pixels(img)
-    for row in img:
-        for pixel in row:
-            rgb = RGB(pixel)
-            if ignore_white and rgb.is_white():
-                n_pixels -= 1
-                continue
-            tot_color.r += rgb.r
-            tot_color.g += rgb.g
-            tot_color.b += rgb.b
-    rgb_norm = RGB()
-    rgb_norm.r = tot_color.r/n_pixels
-    rgb_norm.g = tot_color.g/n_pixels
-    rgb_norm.b = tot_color.b/n_pixels
-    return rgb_norm
+    # OpenCV decoded images have the channels stored in **B G R** order
+    # which is the same order the RGB constructor unpacks
+    return RGB(get_mean_color(img, ignore_white))
@@ -6,6 +6,7 @@ import numpy as np
 from PIL.Image import Image
 
 from helpers.common import opposite_signs
+from helpers.numpy_util import WHITE_MIN, get_mean_color
 
 
 class RGB():
@@ -28,7 +29,7 @@ class RGB():
     def is_white(self) -> bool:
         """Determine if an RGB value is white
         (allows for slightly off-white)."""
-        return self.r >= 245 and self.g >= 245 and self.b >= 245
+        return self.r >= WHITE_MIN and self.g >= WHITE_MIN and self.b >= WHITE_MIN
 
     def is_black(self) -> bool:
         """Determine if an RGB value is black
@@ -86,17 +87,21 @@ def compare_img_color(img1: Image,
     return color_diff
 
 
+def to_cv2_img(img: Image) -> np.ndarray:
+    """Bridge a PIL Image to an OpenCV-style ndarray.
+    Result is a view with the channels in **B G R** order
+    (no pixel data is copied for 'RGB' mode images)."""
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    return np.asarray(img)[:, :, ::-1]
+
+
 def is_img_white(img: Image) -> bool:
     """Determine if an image is all white."""
     img_color = _get_img_color(img, ignore_white=False)
     return img_color.is_white()
 
 
-def _get_n_pixels(img: Image) -> int:
-    """Obtain the total number of pixels in an image."""
-    return int(img.width * img.height)
-
-
 def _get_color_diff(rgb1: RGB, rgb2: RGB) -> float:
     """Use euclidean distance formula to calculate difference
     between two RGB values."""
@@ -112,35 +117,6 @@ def _get_img_color(img: Image, ignore_white: bool = True) -> RGB:
     
     Optionally, ignore white pixels.
     """
-    tot_color = RGB()
-    n_pixels = _get_n_pixels(img)
-    colors = _get_pixel_colors(img)
-
-    for count, pixel in colors:
-        rgb = RGB(pixel)
-        if ignore_white and rgb.is_white():
-            n_pixels -= count
-            continue
-        tot_color.r += rgb.r*count
-        tot_color.g += rgb.g*count
-        tot_color.b += rgb.b*count
-    rgb_norm = RGB()
-    rgb_norm.r = tot_color.r/n_pixels
-    rgb_norm.g = tot_color.g/n_pixels
-    rgb_norm.b = tot_color.b/n_pixels
-    return rgb_norm
-
-
-def _get_pixel_colors(img: Image):
-    if img.palette is None:
-        # desired functionality
-        return img.getcolors()
-    else:
-        # if Image is being read in 'P' mode instead of 'RGB' mode,
-        # the RGB color counts show up in the Image palette property
-        palette_colors = img.palette.colors
-        colors = list()
-        for (count,color_indx), palette in zip(img.getcolors(), palette_colors):
-            color = (count, palette)
-            colors.append(color)
-        return colors
\ No newline at end of file
+    # converting resolves 'P' mode palettes and drops any alpha channel
+    pixels = np.asarray(img.convert("RGB"))
+    return RGB(tuple(get_mean_color(pixels, ignore_white)))
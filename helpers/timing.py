@@ -0,0 +1,77 @@
+"""Wait precisely, sleeping coarsely then spinning for the last stretch."""
+
+import bisect
+import logging
+import time
+from typing import List
+
+from config import DELAY_SPIN_BUDGET
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+OVERSHOOT_BINS = (0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02)
+"""The upper edges, in seconds, of the histogram bins of how much waits overshoot."""
+
+
+class WaitHistogram():
+    """Record requested versus actual waits, binning how much each wait
+    overshot so the margins of the delays can be judged after a hunt."""
+    def __init__(self, bins: tuple = OVERSHOOT_BINS):
+        self.bins = bins
+        self.reset()
+
+    def reset(self):
+        """Forget the recorded waits."""
+        self.counts: List[int] = [0]*(len(self.bins) + 1)
+        self.n_waits = 0
+        self.requested = 0
+        self.actual = 0
+        self.max_overshoot = 0
+
+    def record(self, requested: float, actual: float):
+        """Record a wait of `actual` seconds that was requested to take `requested`."""
+        overshoot = max(actual - requested, 0)
+        self.counts[bisect.bisect_left(self.bins, overshoot)] += 1
+        self.n_waits += 1
+        self.requested += requested
+        self.actual += actual
+        self.max_overshoot = max(self.max_overshoot, overshoot)
+
+    def summary(self) -> str:
+        """Summarize the recorded waits, one histogram bin per line."""
+        lines = [f"{self.n_waits} waits: {self.requested:.3f}s requested, {self.actual:.3f}s actual, "
+                 f"max overshoot {self.max_overshoot*1000:.3f}ms"]
+        lower = 0
+        for upper, count in zip(self.bins + (float("inf"),), self.counts):
+            percent = 100*count/self.n_waits if self.n_waits > 0 else 0
+            lines.append(f"  overshoot {lower*1000:>6.2f}-{upper*1000:<6.2f}ms: {count:>7} ({percent:5.1f}%)")
+            lower = upper
+        return "\n".join(lines)
+
+    def log_summary(self, level: int = logging.INFO):
+        """Log the summary, e.g., at the end of a hunt."""
+        logger.log(level, f"wait histogram\n{self.summary()}")
+
+
+WAIT_HISTOGRAM = WaitHistogram()
+"""The histogram every precise wait of the process is recorded in."""
+
+
+def wait_until(deadline: float, spin_budget: float = DELAY_SPIN_BUDGET):
+    """Wait until `deadline`, a `time.perf_counter()` timestamp. Sleeps until
+    `spin_budget` seconds before the deadline, since sleeps overshoot by up to
+    a few milliseconds, then spins on the clock. A larger budget is more precise
+    and burns more CPU, a budget of 0 only sleeps."""
+    started = time.perf_counter()
+    remaining = deadline - started
+    if remaining > spin_budget:
+        time.sleep(remaining - spin_budget)
+    while time.perf_counter() < deadline:
+        pass
+    WAIT_HISTOGRAM.record(max(remaining, 0), time.perf_counter() - started)
+
+
+def precise_sleep(sec: float, spin_budget: float = DELAY_SPIN_BUDGET):
+    """Sleep for `sec` seconds with the precision of `wait_until`."""
+    wait_until(time.perf_counter() + sec, spin_budget)
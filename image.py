@@ -1,35 +1,116 @@
 """Perform image transformation and image detection."""
 
+from enum import Enum
+from functools import lru_cache
 import glob
 import logging
 import os
-from typing import List
+from typing import Dict, List, Tuple, Union
 
 import cv2
 from PIL import Image
 
-from config import LETTERS_DIR, NUM_DIR
+from config import ASSETS, LETTERS_DIR, NUM_DIR
 from menu import MenuType, get_menu_fn
 from pokemon import Pokemon, SpriteType
+from sprites import BATTLE_SPRITE_SIZE, get_sprite_palette, get_sprite_pixels, load_sprite_index
 from helpers.file_mgmt import get_file_creation_time
 from helpers.opencv_util import (
     IMG_SIZE_VERY_SMALL,
-    compare_img_color, compare_img_pixels,
-    get_img_height, get_img_width, is_img_white
+    TemplateBank,
+    compare_rgb_color, crop_img,
+    get_img_color, get_img_height, get_img_width, is_img_white
 )
+from helpers.opencv_util import compare_img_pixels  # noqa: F401 - tests import it from here
+from helpers.pil_util import to_cv2_img
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
 
 
-def determine_sprite_type(pokemon: Pokemon, img: cv2.Mat) -> SpriteType:
-    """Determine the sprite type based on image color comparison."""
-    normal_img = cv2.imread(pokemon.get_normal_img_fn())
-    shiny_img = cv2.imread(pokemon.get_shiny_img_fn())
-    img = cv2.resize(img, (get_img_width(normal_img), get_img_height(normal_img)))
+class SpriteClassifier(str, Enum):
+    """Enumeration for the ways to determine a sprite type."""
+    COLOR = "color"
+    PIXELS = "pixels"
+    PALETTE = "palette"
 
-    # use color differences to determine sprite type
-    diff_normal = compare_img_color(img, normal_img, offset_shading=False)
-    diff_shiny = compare_img_color(img, shiny_img, offset_shading=False)
+
+MENU_CROPS = {
+    # crop locations were determined empirically
+    # valid only for generation II games
+    MenuType.START:    {"top": 0,    "bottom": 0.45, "left": 0,   "right": 0.85},
+    MenuType.CONTINUE: {"top": 0.45, "bottom": 1,    "left": 0.2, "right": 1},
+    MenuType.PAUSE:    {"top": 0,    "bottom": 1,    "left": 0.5, "right": 1},
+    MenuType.ITEMS:    {"top": 0.05, "bottom": 0.6,  "left": 0,   "right": 0.25},
+    MenuType.BATTLE:   {"top": 0.7,  "bottom": 1,    "left": 0.4, "right": 1},
+}
+"""The region of a screenshot, as fractions of its size, where each menu appears."""
+
+BATTLE_MENU_MAX_DIFF = 42000
+"""The maximum difference with the battle menu for a screenshot to be considered
+a battle. Determined empirically; other screens with a menu in the same region,
+e.g., the Pokégear, differ by more."""
+
+
+class MenuClassifier():
+    """Determine which menu is open in a screenshot.
+    Known menus are decoded and resized once; each menu region
+    of a screenshot is compared as a view into the screenshot."""
+    def __init__(self):
+        self.menu_banks: Dict[MenuType, TemplateBank] = dict()
+        for menu_type in MENU_CROPS:
+            known_menu = ASSETS.imread(get_menu_fn(menu_type))
+            self.menu_banks[menu_type] = TemplateBank(
+                [known_menu],
+                [menu_type],
+                resize_width=int(.05*get_img_width(known_menu)),
+                resize_height=int(.05*get_img_height(known_menu))
+            )
+    
+    def crop_menus(self, img: cv2.Mat) -> Dict[MenuType, cv2.Mat]:
+        """Crop the region of each menu type from the screenshot."""
+        img_width, img_height = get_img_width(img), get_img_height(img)
+        img_menus = dict()
+        for menu_type, crop in MENU_CROPS.items():
+            img_menus[menu_type] = crop_img(img,
+                                            left=img_width * crop["left"],
+                                            top=img_height * crop["top"],
+                                            right=img_width * crop["right"],
+                                            bottom=img_height * crop["bottom"])
+        return img_menus
+
+    def classify(self, img: cv2.Mat) -> Tuple[MenuType, Dict[MenuType, float]]:
+        """Determine the menu type open in the screenshot along with the
+        pixel difference score of every menu type (lower is more similar)."""
+        diffs = dict()
+        for menu_type, img_menu in self.crop_menus(img).items():
+            diffs[menu_type] = float(self.menu_banks[menu_type].compare([img_menu])[0, 0])
+        menu_type = min(diffs, key=diffs.get)
+        return menu_type, diffs
+
+
+def determine_sprite_type(pokemon: Pokemon,
+                          img: cv2.Mat,
+                          classifier: SpriteClassifier = SpriteClassifier.COLOR) -> SpriteType:
+    """Determine the sprite type based on image comparison with
+    the Pokémon's normal and shiny sprites.
+
+    `SpriteClassifier.COLOR` compares the average color of the whole image.
+    `SpriteClassifier.PIXELS` only samples the few pixels where the normal
+    and shiny sprites differ the most, falling back to color comparison
+    for a Pokémon whose sprites do not differ.
+    `SpriteClassifier.PALETTE` matches the colors of the image with the
+    normal and shiny palettes, falling back to color comparison when the
+    image is not drawn with either palette.
+    """
+    diffs = None
+    if classifier == SpriteClassifier.PIXELS:
+        diffs = _compare_sprite_pixels(pokemon, img)
+    elif classifier == SpriteClassifier.PALETTE:
+        diffs = _compare_sprite_palette(pokemon, img)
+    if diffs is None:
+        diffs = _compare_sprite_color(pokemon, img)
+    
+    diff_normal, diff_shiny = diffs
     if diff_normal < diff_shiny:
         sprite_type = SpriteType.NORMAL
     else:
@@ -38,99 +119,157 @@ def determine_sprite_type(pokemon: Pokemon, img: cv2.Mat) -> SpriteType:
     return sprite_type
 
 
-def determine_pack_items(pack_img_fn: str, get_qty: bool = True, del_png: bool = True) -> List[tuple[str,int]]:
+def _compare_sprite_color(pokemon: Pokemon, img: cv2.Mat) -> Tuple[float, float]:
+    """Compare the color of the image with the normal and shiny sprites."""
+    # reference sprites and their colors are precomputed once per Pokémon
+    sprite_bank = pokemon.sprite_bank
+    img = cv2.resize(img, (sprite_bank.width, sprite_bank.height))
+    img_color = get_img_color(img)
+
+    # use color differences to determine sprite type
+    diff_normal = compare_rgb_color(img_color,
+                                    sprite_bank.normal_color,
+                                    offset_shading=False,
+                                    rgb2_signs=sprite_bank.normal_diff_signs)
+    diff_shiny = compare_rgb_color(img_color,
+                                   sprite_bank.shiny_color,
+                                   offset_shading=False,
+                                   rgb2_signs=sprite_bank.shiny_diff_signs)
+    return diff_normal, diff_shiny
+
+
+def _compare_sprite_pixels(pokemon: Pokemon, img: cv2.Mat) -> Union[Tuple[float, float], None]:
+    """Compare the discriminative pixels of the image with the normal
+    and shiny sprites. `None` if the sprites have no differing pixels."""
+    sprite_pixels = get_sprite_pixels(pokemon.number)
+    if len(sprite_pixels) == 0:
+        logger.debug(f"{pokemon.name} has no discriminative pixels")
+        return None
+    img = cv2.resize(img, (BATTLE_SPRITE_SIZE, BATTLE_SPRITE_SIZE))
+    return sprite_pixels.compare(img)
+
+
+def _compare_sprite_palette(pokemon: Pokemon, img: cv2.Mat) -> Union[Tuple[float, float], None]:
+    """Compare the colors of the image with the normal and shiny
+    palettes. `None` if neither palette matches the image."""
+    # nearest neighbor resizing keeps the sprite's colors intact
+    img = cv2.resize(img, (BATTLE_SPRITE_SIZE, BATTLE_SPRITE_SIZE), interpolation=cv2.INTER_NEAREST)
+    diffs = get_sprite_palette(pokemon.number).compare(img)
+    if diffs is None:
+        logger.debug(f"{pokemon.name} palettes do not match the image")
+    return diffs
+
+
+def determine_pokemon(img: cv2.Mat) -> Tuple[str, SpriteType]:
+    """Determine the name and sprite type of a Pokémon in battle by finding
+    the nearest of all generation II sprites. Unlike `determine_sprite_type`,
+    the Pokémon does not need to be known in advance."""
+    name, sprite_type = load_sprite_index().lookup(img)
+    logger.debug(f"image is most similar to {sprite_type} {name}")
+    return name, sprite_type
+
+
+def determine_pack_items(pack_img_fn: str,
+                         get_qty: bool = True,
+                         del_png: bool = True,
+                         debug_png: bool = False) -> List[tuple[str,int]]:
     """Determine the items and their associated quantities in the pack."""
     # TODO - update after creating pack module with PackType and
     # other custom classes
-    im = Image.open(pack_img_fn)
+    img = cv2.imread(pack_img_fn)
+    img_width, img_height = get_img_width(img), get_img_height(img)
 
     max_items = 5  # the max number of items shown in one pack screenshot
 
     # crop to only the item portion of the screen
     # percentages used in calcs were determined empirically
     # valid only for generation II games
-    item_height = im.height * 1/9
-    left = im.width * 0.4
-    right = im.width
+    item_height = img_height * 1/9
+    left = img_width * 0.4
+    right = img_width
     top = item_height
     bot = top + max_items*item_height
-    im = im.crop((left, top, right, bot))
-    cropped_items_fn = "cropped_items.png"
-    im.save(cropped_items_fn)
+    img = crop_img(img, left, top, right, bot)
+    save_debug_png(img, "cropped_items.png", debug_png, del_png)
 
-    items = []
+    item_names = []
+    item_num_imgs = []
     for i in range(max_items):
         # create a box for each item separated by its name and quantity
         item_top = item_height * i
         item_bot = item_top + item_height
-        im_item = im.crop((0, item_top, im.width, item_bot))
-        item_fn = "item.png"
-        im_item.save(item_fn)
+        img_item = crop_img(img, 0, item_top, get_img_width(img), item_bot)
+        save_debug_png(img_item, "item.png", debug_png, del_png)
 
-        item_name = determine_pack_item_name(im_item, del_png=del_png)
+        item_name = determine_pack_item_name(img_item, del_png=del_png, debug_png=debug_png)
         if item_name == "" or item_name == "cancel":
             break
+        item_names.append(item_name)
         if get_qty:
-            item_qty = determine_pack_item_qty(im_item, del_png=del_png)
-        else:
-            item_qty = None
-        item = (item_name, item_qty)
-        logger.debug(f"item: {item}")
-        items.append(item)
-        
-    if del_png:
-        os.remove(cropped_items_fn)
-        os.remove(item_fn)
+            item_num_imgs.append(crop_pack_item_qty(img_item, del_png=del_png, debug_png=debug_png))
+    
+    # read the quantities of every item on the page at once
+    if get_qty:
+        item_qtys = determine_quantities(item_num_imgs)
+    else:
+        item_qtys = [None] * len(item_names)
+    items = list(zip(item_names, item_qtys))
+    logger.debug(f"items: {items}")
     
     return items
 
 
-def determine_pack_item_name(im: Image.Image, del_png: bool = True) -> str:
+def determine_pack_item_name(img: Union[cv2.Mat, Image.Image],
+                             del_png: bool = True,
+                             debug_png: bool = False) -> str:
     """Determine the item name from a boxed image representing an item."""
-    char_width = im.width*(0.0725)
+    img = _as_cv2_img(img)
+    img_width = get_img_width(img)
+    char_width = img_width*(0.0725)
     item_name_height = char_width
     top = 0
     bot = top + item_name_height
-    im_item_name = im.crop((0, top, im.width, bot))
-    item_name_fn = "item_name.png"
-    im_item_name.save(item_name_fn)
+    img_item_name = crop_img(img, 0, top, img_width, bot)
+    save_debug_png(img_item_name, "item_name.png", debug_png, del_png)
 
-    letter_imgs = crop_item_name(im_item_name, del_png=del_png)
+    letter_imgs = crop_item_name(img_item_name, del_png=del_png, debug_png=debug_png)
     item_name = determine_name(letter_imgs)
-        
-    if del_png:
-        os.remove(item_name_fn)
     
     return item_name
 
 
-def determine_pack_item_qty(im: Image.Image, del_png: bool = True) -> int:
+def determine_pack_item_qty(img: Union[cv2.Mat, Image.Image],
+                            del_png: bool = True,
+                            debug_png: bool = False) -> int:
     """Determine the item quantity from a boxed image representing an item."""
-    char_width = im.width*(0.0625)
-    item_qty_height = char_width
-    top = im.height * 0.5575
-    bot = top + item_qty_height
-    left = im.width * 0.8325
-    right = im.width * 0.9975
-    im_item_qty = im.crop((left, top, right, bot))
-    item_qty_fn = "item_qty.png"
-    im_item_qty.save(item_qty_fn)
-
-    num_imgs = crop_item_qty(im_item_qty, del_png=del_png)
+    num_imgs = crop_pack_item_qty(img, del_png=del_png, debug_png=debug_png)
     item_qty = determine_quantity(num_imgs)
 
-    if del_png:
-        os.remove(item_qty_fn)
-
     return item_qty
 
 
+def crop_pack_item_qty(img: Union[cv2.Mat, Image.Image],
+                       del_png: bool = True,
+                       debug_png: bool = False) -> List[cv2.Mat]:
+    """Crop each number of the item quantity from a boxed image representing an item."""
+    img = _as_cv2_img(img)
+    img_width, img_height = get_img_width(img), get_img_height(img)
+    char_width = img_width*(0.0625)
+    item_qty_height = char_width
+    top = img_height * 0.5575
+    bot = top + item_qty_height
+    left = img_width * 0.8325
+    right = img_width * 0.9975
+    img_item_qty = crop_img(img, left, top, right, bot)
+    save_debug_png(img_item_qty, "item_qty.png", debug_png, del_png)
+
+    return crop_item_qty(img_item_qty, del_png=del_png, debug_png=debug_png)
+
+
 def determine_name(letter_imgs: List[cv2.Mat]) -> str:
     """Determine the Pokémon name based on images of each letter."""
-    name = str()
-    for letter_img in letter_imgs:
-        letter = determine_letter(letter_img)
-        name += letter
+    # every letter is classified in a single pass over the letter bank
+    name = "".join(get_letter_bank().classify(letter_imgs))
     logger.debug(f"determined name: {name}")
     return name
 
@@ -138,174 +277,169 @@ def determine_name(letter_imgs: List[cv2.Mat]) -> str:
 def determine_letter(letter_img: cv2.Mat) -> str:
     """Determine the letter described in the image based on
     pixel comparison using an image database of the alphabet."""
+    letter, = get_letter_bank().classify([letter_img])
+    return letter
+
+
+@lru_cache(maxsize=None)
+def get_letter_bank() -> TemplateBank:
+    """Load the alphabet image db into a template bank.
+    Built once per process."""
     # grab PNG files from alphabet image db
     glob_pattern = os.path.join(LETTERS_DIR, "*.png")
-    files = list(filter(os.path.isfile, glob.glob(glob_pattern)))
-    
-    # compare image to each letter in the alphabet
-    min_diff = None
-    letter = str()
-    for file in files:
-        alpha_img = cv2.imread(file)
-        diff = compare_img_pixels(letter_img,
-                                  alpha_img,
-                                  resize_width=IMG_SIZE_VERY_SMALL,
-                                  resize_height=IMG_SIZE_VERY_SMALL)
-        if min_diff is None or diff < min_diff:
-            min_diff = diff
-            letter = os.path.basename(file).replace(".png", "")
-            if "_" in letter:
-                if "." in letter:
-                    # period symbol
-                    letter = letter.replace("_._", ". ")
-                elif "-" in letter:
-                    # dash symbol
-                    letter = letter.replace("_", "")
-                elif "\'" in letter:
-                    # apostraphe symbol
-                    letter = letter.replace("_", "")
-                elif "e" in letter:
-                    # é in Pokémon and Pokéball
-                    letter = letter.replace("_", "")
-                else:
-                    # male/female symbol
-                    letter = letter.replace("_", " ")
+    files = ASSETS.glob(glob_pattern)
+    letters = [get_letter_from_fn(file) for file in files]
+    logger.debug(f"loaded {len(files)} letters into letter bank")
+    return TemplateBank([ASSETS.imread(file) for file in files],
+                        letters,
+                        resize_width=IMG_SIZE_VERY_SMALL,
+                        resize_height=IMG_SIZE_VERY_SMALL)
+
+
+def get_letter_from_fn(letter_fn: str) -> str:
+    """Retrieve the letter described by a file in the alphabet image db."""
+    letter = os.path.basename(letter_fn).replace(".png", "")
+    if "_" in letter:
+        if "." in letter:
+            # period symbol
+            letter = letter.replace("_._", ". ")
+        elif "-" in letter:
+            # dash symbol
+            letter = letter.replace("_", "")
+        elif "\'" in letter:
+            # apostraphe symbol
+            letter = letter.replace("_", "")
+        elif "e" in letter:
+            # é in Pokémon and Pokéball
+            letter = letter.replace("_", "")
+        else:
+            # male/female symbol
+            letter = letter.replace("_", " ")
     return letter
 
 
 def determine_quantity(num_imgs: List[cv2.Mat]) -> int:
     """Determine the quantity based on images of each number."""
-    if len(num_imgs) == 0:
-        logger.warning("Should supply non-empty list of number images.")
-        return None
-    
-    qty = int()
-    for i,num_img in enumerate(num_imgs):
-        num = determine_number(num_img)
-        tens = pow(base=10, exp=len(num_imgs) - 1 - i)
-        qty += num * tens
-    logger.debug(f"determined qty: {qty}")
+    qty, = determine_quantities([num_imgs])
     return qty
 
 
+def determine_quantities(num_imgs_list: List[List[cv2.Mat]]) -> List[int]:
+    """Determine several quantities, each based on images of its numbers.
+    All numbers are classified in a single pass over the digit bank."""
+    all_num_imgs = [num_img for num_imgs in num_imgs_list for num_img in num_imgs]
+    nums = iter(get_digit_bank().classify(all_num_imgs))
+
+    qtys = []
+    for num_imgs in num_imgs_list:
+        if len(num_imgs) == 0:
+            logger.warning("Should supply non-empty list of number images.")
+            qtys.append(None)
+            continue
+        
+        qty = int()
+        for i in range(len(num_imgs)):
+            num = next(nums)
+            tens = pow(base=10, exp=len(num_imgs) - 1 - i)
+            qty += num * tens
+        logger.debug(f"determined qty: {qty}")
+        qtys.append(qty)
+    return qtys
+
+
 def determine_number(num_img: cv2.Mat) -> int:
     """Determine the number described in the image based on
     pixel comparison using an image database between 0-9."""
+    number, = get_digit_bank().classify([num_img])
+    return number
+
+
+@lru_cache(maxsize=None)
+def get_digit_bank() -> TemplateBank:
+    """Load the numbers image db into a template bank.
+    Built once per process."""
     # grab PNG files from numbers image db
     glob_pattern = os.path.join(NUM_DIR, "*.png")
-    files = list(filter(os.path.isfile, glob.glob(glob_pattern)))
-    
-    # compare image to each number
-    min_diff = None
-    number = str()
-    for file in files:
-        digit_img = cv2.imread(file)
-        img_width = get_img_width(digit_img)
-        img_height = get_img_height(digit_img)
-        diff = compare_img_pixels(num_img,
-                                  digit_img,
-                                  resize_width=int(img_width/4),
-                                  resize_height=int(img_height/4))
-        if min_diff is None or diff < min_diff:
-            min_diff = diff
-            number = os.path.basename(file).replace(".png", "")
-    return int(number)
-
-
-def determine_menu(img_fn: str, del_png: bool = True) -> MenuType:
+    files = ASSETS.glob(glob_pattern)
+    numbers = [int(os.path.basename(file).replace(".png", "")) for file in files]
+
+    # all digits share the same size so compare at a quarter of it
+    digit_imgs = [ASSETS.imread(file) for file in files]
+    logger.debug(f"loaded {len(files)} numbers into digit bank")
+    return TemplateBank(digit_imgs,
+                        numbers,
+                        resize_width=int(get_img_width(digit_imgs[0])/4),
+                        resize_height=int(get_img_height(digit_imgs[0])/4))
+
+
+def determine_menu(img_fn: str, del_png: bool = True, debug_png: bool = False) -> MenuType:
     """Determine the menu type from the provided image.
     Assumes a menu is open in the image."""
-    # crop locations in dict were determined empirically
-    # valid only for generation II games
-    menus = [
-        {"type":    MenuType.START, "top": 0,    "bottom": 0.45, "left": 0,   "right": 0.85},
-        {"type": MenuType.CONTINUE, "top": 0.45, "bottom": 1,    "left": 0.2, "right": 1},
-        {"type":    MenuType.PAUSE, "top": 0,    "bottom": 1,    "left": 0.5, "right": 1},
-        {"type":    MenuType.ITEMS, "top": 0.05, "bottom": 0.6,  "left": 0,   "right": 0.25},
-        {"type":   MenuType.BATTLE, "top": 0.7,  "bottom": 1,    "left": 0.4, "right": 1},
-    ]
-
-    im = Image.open(img_fn)
-    min_diff = None
-    for menu in menus:
-        # open the known menu item for comparison
-        menu_fp = get_menu_fn(menu["type"])
-        known_menu = cv2.imread(menu_fp)
-
-        # defines the borders for each menu type
-        top = im.height * menu["top"]
-        bot = im.height * menu["bottom"]
-        left = im.width * menu["left"]
-        right = im.width * menu["right"]
-
-        # crop image and save to disk
-        im_cropped = im.crop((left, top, right, bot))
-        cropped_fn = "menu.png"
-        im_cropped.save(cropped_fn)
-
-        # convert to OpenCV object
-        im_cropped = cv2.imread(cropped_fn)
-        
-        resize_width = int(.05*get_img_width(known_menu))
-        resize_height = int(.05*get_img_height(known_menu))
-        diff = compare_img_pixels(im_cropped, known_menu, resize_width, resize_height)
-        if min_diff is None or diff < min_diff:
-            min_diff = diff
-            menu_type: MenuType = menu["type"]
+    menu_classifier = get_menu_classifier()
+    img = cv2.imread(img_fn)
+    if debug_png:
+        for menu_type, img_menu in menu_classifier.crop_menus(img).items():
+            save_debug_png(img_menu, f"menu_{menu_type.value}.png", debug_png, del_png)
+
+    menu_type, diffs = menu_classifier.classify(img)
+    logger.debug(f"menu diffs: {diffs}")
+    return menu_type
 
-        if del_png:
-            os.remove(cropped_fn)
 
-    return menu_type
+def is_battle(img_fn: str) -> bool:
+    """Determine if the provided image is a battle with the battle menu open.
+    Unlike `determine_menu`, a menu does not need to be open in the image."""
+    menu_type, diffs = get_menu_classifier().classify(cv2.imread(img_fn))
+    logger.debug(f"battle menu diff: {diffs[MenuType.BATTLE]}")
+    return menu_type == MenuType.BATTLE and diffs[MenuType.BATTLE] <= BATTLE_MENU_MAX_DIFF
+
+
+@lru_cache(maxsize=None)
+def get_menu_classifier() -> MenuClassifier:
+    """Load the known menus into a menu classifier.
+    Built once per process."""
+    return MenuClassifier()
 
 
 def get_latest_png_fn(dir: str) -> str:
     """Retrieve the most recent PNG (by creation timestamp)
-    from the specified directory."""
+    from the specified directory. Lists the whole directory, prefer
+    `Emulator.capture_screenshot` to wait for a new screenshot."""
     # only grab PNG files
     glob_pattern = os.path.join(dir, "*.png")
     files = list(filter(os.path.isfile, glob.glob(glob_pattern)))
-    
-    # sort by file creation time
-    files.sort(key=lambda f: get_file_creation_time(f))
-    latest_file = files[-1]  # last element in list is most recent
-
     if len(files) == 0:
         logger.warning(f"No PNGs exist in the specified directory: {dir}")
         return None
-    return latest_file
+
+    # most recent by file creation time
+    return max(files, key=lambda f: get_file_creation_time(f))
 
 
-def crop_pokemon_in_battle(battle_img_fn: str, del_png: bool = True) -> cv2.Mat:
+def crop_pokemon_in_battle(battle_img_fn: str, del_png: bool = True, debug_png: bool = False) -> cv2.Mat:
     """Crop square image of a Pokémon in battle."""
-    im = Image.open(battle_img_fn)
+    img = cv2.imread(battle_img_fn)
+    img_width = get_img_width(img)
 
     # percentages used in calcs were determined empirically
     # valid only for generation II games
-    pokemon_width = im.width*(0.35)
+    pokemon_width = img_width*(0.35)
     pokemon_height = pokemon_width
-    left = im.width*(0.6)
+    left = img_width*(0.6)
     right = left + pokemon_width
     top = 0
     bottom = pokemon_height
 
-    # crop image and save to disk
-    im = im.crop((left, top, right, bottom))
-    cropped_fn = "crop.png"
-    im.save(cropped_fn)
-
-    # load into OpenCV obj
-    img = cv2.imread(cropped_fn)
-    
-    if del_png:
-        os.remove(cropped_fn)
+    img = crop_img(img, left, top, right, bottom)
+    save_debug_png(img, "crop.png", debug_png, del_png)
 
     return img
 
 
-def crop_name_in_battle(battle_img_fn: str, del_png: bool = True) -> List[cv2.Mat]:
+def crop_name_in_battle(battle_img_fn: str, del_png: bool = True, debug_png: bool = False) -> List[cv2.Mat]:
     """Crop name of a Pokémon in battle."""
-    im = Image.open(battle_img_fn)
+    img = cv2.imread(battle_img_fn)
+    img_width = get_img_width(img)
 
     # generation II games have maximum 10 chars for names
     max_chars = 10
@@ -313,45 +447,42 @@ def crop_name_in_battle(battle_img_fn: str, del_png: bool = True) -> List[cv2.Ma
     for i in range(max_chars):
         # percentages used in calcs were determined empirically
         # valid only for generation II games
-        char_width = im.width*(0.04375)
+        char_width = img_width*(0.04375)
         char_height = char_width
         char_space = char_width/7
         
-        left = i*(char_width + char_space) + im.width*(0.05)
+        left = i*(char_width + char_space) + img_width*(0.05)
         right = left + char_width
         top = 0
         bottom = char_height
 
-        # crop image and save to disk
-        im_char = im.crop((left, top, right, bottom))
-        cropped_fn = f"char_{str(i)}.png"
-        im_char.save(cropped_fn)
-
-        # load into OpenCV obj
-        img = cv2.imread(cropped_fn)
+        img_char = crop_img(img, left, top, right, bottom)
+        save_debug_png(img_char, f"char_{str(i)}.png", debug_png, del_png)
 
         # determine if img contains a letter based on how white it is
-        if not is_img_white(img):
-            letter_imgs.append(img)
-
-        if del_png:
-            os.remove(cropped_fn)
+        if not is_img_white(img_char):
+            letter_imgs.append(img_char)
     
     logger.debug(f"pokemon name contains {len(letter_imgs)} letters")
 
     return letter_imgs
 
 
-def crop_item_name(im_item_name: Image.Image, del_png: bool = True) -> List[cv2.Mat]:
+def crop_item_name(img_item_name: Union[cv2.Mat, Image.Image],
+                   del_png: bool = True,
+                   debug_png: bool = False) -> List[cv2.Mat]:
     """Crop name of an item."""
+    img_item_name = _as_cv2_img(img_item_name)
+    img_width, img_height = get_img_width(img_item_name), get_img_height(img_item_name)
+
     # generation II games have maximum 12 chars for items
     max_chars = 12
     letter_imgs = list()
     for i in range(max_chars):
         # percentages used in calcs were determined empirically
         # valid only for generation II games
-        char_width = im_item_name.width*(0.0725)
-        char_height = im_item_name.height
+        char_width = img_width*(0.0725)
+        char_height = img_height
         char_space = char_width*(0.15)
         
         left = i*(char_width + char_space)
@@ -359,58 +490,66 @@ def crop_item_name(im_item_name: Image.Image, del_png: bool = True) -> List[cv2.
         top = 0
         bottom = char_height
 
-        # crop image and save to disk
-        im_char = im_item_name.crop((left, top, right, bottom))
-        cropped_fn = f"item_char_{str(i)}.png"
-        im_char.save(cropped_fn)
-
-        # load into OpenCV obj
-        img = cv2.imread(cropped_fn)
+        img_char = crop_img(img_item_name, left, top, right, bottom)
+        save_debug_png(img_char, f"item_char_{str(i)}.png", debug_png, del_png)
 
         # determine if img contains a letter based on how white it is
-        if not is_img_white(img):
-            letter_imgs.append(img)
-
-        if del_png:
-            os.remove(cropped_fn)
+        if not is_img_white(img_char):
+            letter_imgs.append(img_char)
     
     logger.debug(f"item name contains {len(letter_imgs)} letters")
 
     return letter_imgs
 
 
-def crop_item_qty(im_item_qty: Image.Image, del_png: bool = True) -> List[cv2.Mat]:
+def crop_item_qty(img_item_qty: Union[cv2.Mat, Image.Image],
+                  del_png: bool = True,
+                  debug_png: bool = False) -> List[cv2.Mat]:
     """Crop quantity of an item."""
+    img_item_qty = _as_cv2_img(img_item_qty)
+    img_width, img_height = get_img_width(img_item_qty), get_img_height(img_item_qty)
+
     # generation II games have maximum 2 chars for item quantity
     max_chars = 2
     num_imgs = list()
     for i in range(max_chars):
         # percentages used in calcs were determined empirically
         # valid only for generation II games
-        char_width = im_item_qty.width*(0.475)
-        char_height = im_item_qty.height
-        char_space = im_item_qty.width*(0.05)
+        char_width = img_width*(0.475)
+        char_height = img_height
+        char_space = img_width*(0.05)
         
         left = i*(char_width + char_space)
         right = left + char_width - char_space
         top = 0
         bottom = char_height
 
-        # crop image and save to disk
-        im_char = im_item_qty.crop((left, top, right, bottom))
-        cropped_fn = f"item_qty_{str(i)}.png"
-        im_char.save(cropped_fn)
-
-        # load into OpenCV obj
-        img = cv2.imread(cropped_fn)
+        img_char = crop_img(img_item_qty, left, top, right, bottom)
+        save_debug_png(img_char, f"item_qty_{str(i)}.png", debug_png, del_png)
 
         # determine if img contains a letter based on how white it is
-        if not is_img_white(img):
-            num_imgs.append(img)
-
-        if del_png:
-            os.remove(cropped_fn)
+        if not is_img_white(img_char):
+            num_imgs.append(img_char)
     
     logger.debug(f"item quantity contains {len(num_imgs)} letters")
 
     return num_imgs
+
+
+def save_debug_png(img: cv2.Mat, png_fn: str, debug_png: bool = False, del_png: bool = True):
+    """Dump an intermediate image to disk for debugging.
+    Nothing is written unless `debug_png` is set; `del_png` removes
+    the dumped file again right away (the behavior prior to in-memory crops)."""
+    if not debug_png:
+        return
+    cv2.imwrite(png_fn, img)
+    logger.debug(f"saved debug png: {png_fn}")
+    if del_png:
+        os.remove(png_fn)
+
+
+def _as_cv2_img(img: Union[cv2.Mat, Image.Image]) -> cv2.Mat:
+    """Accept either an OpenCV image or a PIL Image (legacy callers)."""
+    if isinstance(img, Image.Image):
+        return to_cv2_img(img)
+    return img
@@ -0,0 +1,150 @@
+"""Compile button sequences into timed input plans and run them on schedule."""
+
+from functools import lru_cache
+import logging
+import time
+from typing import Callable, List, Tuple
+
+from helpers.common import get_delay_factor
+from helpers.timing import precise_sleep
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+PRESS_GAP = 0.5
+"""The relative number of seconds from one press of a sequence to the next."""
+
+PRESS_DURATION = 0.05
+"""The relative number of seconds a button is held down for each press."""
+
+SEQUENCE_BUTTONS = {
+    "a": "a",
+    "b": "b",
+    "u": "up",
+    "d": "down",
+    "l": "left",
+    "r": "right",
+    "s": "start",
+}
+"""The button pressed for each character of the shorthand sequences."""
+
+InputEvent = Tuple[float, bool, str]
+"""An input at an offset in relative seconds from the start of a macro:
+offset, whether the button is pressed (or released), button."""
+
+
+class TimedPress():
+    """A button press, held down from `press_at` until `release_at`.
+    Both are offsets in relative seconds from the start of the macro."""
+    def __init__(self, button: str, press_at: float, release_at: float):
+        self.button = button
+        self.press_at = press_at
+        self.release_at = release_at
+
+    def __repr__(self) -> str:
+        return f"TimedPress({self.button!r}, {self.press_at}, {self.release_at})"
+
+
+class Macro():
+    """A button sequence compiled into a timed plan of presses, followed
+    by a time to settle, e.g., for the battle to start. Offsets are relative
+    seconds, scaled by the delay factor when the macro is run."""
+    def __init__(self, sequence: str, presses: Tuple[TimedPress, ...], duration: float):
+        self.sequence = sequence
+        self.presses = presses
+        self.duration = duration
+        self.events: Tuple[InputEvent, ...] = tuple(sorted(
+            [(p.press_at, True, p.button) for p in presses] + [(p.release_at, False, p.button) for p in presses],
+            # release before pressing at the same offset
+            key=lambda event: (event[0], event[1]),
+        ))
+
+
+class MacroReport():
+    """The timing observed running a macro. `lateness` holds how late each
+    event fired after its deadline, in seconds. `idle` is the time spent
+    waiting for deadlines, i.e., slack in the plan that could be reclaimed."""
+    def __init__(self, sequence: str, lateness: List[float], idle: float, planned: float, elapsed: float):
+        self.sequence = sequence
+        self.lateness = lateness
+        self.idle = idle
+        self.planned = planned
+        self.elapsed = elapsed
+
+    @property
+    def max_jitter(self) -> float:
+        """The latest an event fired after its deadline."""
+        return max(self.lateness, default=0)
+
+    @property
+    def mean_jitter(self) -> float:
+        """How late events fired after their deadlines on average."""
+        return sum(self.lateness)/len(self.lateness) if len(self.lateness) > 0 else 0
+
+    def __str__(self) -> str:
+        return (f"{self.sequence}: {self.elapsed:.3f}s of {self.planned:.3f}s planned, "
+                f"jitter mean {self.mean_jitter*1000:.2f}ms max {self.max_jitter*1000:.2f}ms, "
+                f"idle {self.idle:.3f}s")
+
+
+class MacroExecutor():
+    """Fire the events of a macro against a controller at absolute deadlines
+    on a monotonic clock. The time taken to press a button or log is absorbed
+    by the wait for the next deadline instead of adding up over the sequence."""
+    def __init__(self,
+                 controller,
+                 factor: Callable[[], float] = get_delay_factor,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = precise_sleep):
+        self.controller = controller
+        self.factor = factor
+        self.clock = clock
+        self.sleep = sleep
+
+    def run(self, macro: Macro) -> MacroReport:
+        """Run the macro, returning once it has settled."""
+        factor = self.factor()
+        idle = 0
+        lateness = []
+        start = self.clock()
+        for offset, is_press, button in macro.events:
+            deadline = start + offset*factor
+            idle += self._wait_until(deadline)
+            fired = self.clock()
+            if is_press:
+                self.controller.hold(button)
+            else:
+                self.controller.release(button)
+            lateness.append(fired - deadline)
+        idle += self._wait_until(start + macro.duration*factor)
+        report = MacroReport(macro.sequence, lateness, idle, macro.duration*factor, self.clock() - start)
+        logger.debug(f"ran macro {report}")
+        return report
+
+    def _wait_until(self, deadline: float) -> float:
+        """Wait until the deadline, returning the time waited."""
+        remaining = deadline - self.clock()
+        if remaining <= 0:
+            return 0
+        self.sleep(remaining)
+        return remaining
+
+
+@lru_cache(maxsize=None)
+def compile_sequence(sequence: str,
+                     settle: float = 0,
+                     press_gap: float = PRESS_GAP,
+                     press_duration: float = PRESS_DURATION) -> Macro:
+    """Compile a shorthand button sequence, e.g., `sdddarrrbbaaaa`, into
+    a macro. Each button is pressed `press_gap` after the previous one
+    and the macro ends `settle` after the gap following the last press.
+    Compiled once per sequence and timing."""
+    if not 0 < press_duration < press_gap:
+        raise ValueError(f"Press duration must be positive and shorter than the press gap {press_gap}. Got {press_duration}")
+    presses = []
+    for i, char in enumerate(sequence):
+        if char not in SEQUENCE_BUTTONS:
+            raise RuntimeError(f"Unknown character in sequence: {char}. No button selected.")
+        press_at = i*press_gap
+        presses.append(TimedPress(SEQUENCE_BUTTONS[char], press_at, press_at + press_duration))
+    return Macro(sequence, tuple(presses), len(sequence)*press_gap + settle)
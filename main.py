@@ -4,26 +4,35 @@ import logging
 from multiprocessing import Queue
 import signal
 import sys
+from typing import Union
 
-from config import NATIVE_SAVES_DIR, ROM_NAME, RETROARCH_CFG
+from config import DELAY_SCALING, NATIVE_SAVES_DIR, ROM_NAME, RETROARCH_CFG
 from emulator import Emulator
-from encounter import StaticEncounter
+from encounter import EncounterType, RandomEncounter, StaticEncounter
+from heartbeat import Watchdog
 from image import get_latest_png_fn
 from notifications import send_notification
 from pokemon import Pokemon
 from retroarch import cleanup_save_dir, copy_native_save
+from speed import DelayScaling, get_speed_estimator
 from helpers.file_mgmt import cdtmp
+from helpers.timing import WAIT_HISTOGRAM
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
 
 
+MAX_RECOVERIES = 5
+"""The number of times in a row the hunt recovers from a stuck or crashed emulator before giving up."""
+
+
 def run(emulator: Emulator,
-        encounter: StaticEncounter,
+        encounter: Union[StaticEncounter, RandomEncounter],
         max_attempts: int = 8000,
         send_email: bool = True,
-        queue: Queue = None):
-    """Try to find a shiny from a static encounter."""
-    og_rename_files = copy_native_save(pokemon_name=encounter.pokemon.name,
+        queue: Queue = None,
+        max_recoveries: int = MAX_RECOVERIES):
+    """Try to find a shiny from a static or random encounter."""
+    og_rename_files = copy_native_save(save_name=encounter.save_name,
                                        user_rom_name=ROM_NAME,
                                        native_saves_dir=NATIVE_SAVES_DIR,
                                        retroarch_saves_dir=RETROARCH_CFG.savefile_dir)
@@ -50,15 +59,80 @@ def run(emulator: Emulator,
     # register the signal handler
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+
+    def is_emulator_alive() -> bool:
+        """An emulator not launched as a child process is assumed alive."""
+        return emulator.process is None or emulator.is_running()
+
+    def kill_stuck_emulator(failure: str):
+        """Kill the emulator so the stuck attempt fails fast."""
+        if emulator.is_running():
+            emulator.kill_process()
+
+    def recover(failure: str):
+        """Relaunch the emulator with freshly copied saves."""
+        nonlocal og_rename_files
+        logger.warning(f"recovering from: {failure}")
+        if speed_estimator is not None:
+            speed_estimator.stop()
+        if emulator.is_running():
+            emulator.kill_process()
+        og_rename_rtc_file, og_rename_srm_file = og_rename_files
+        cleanup_save_dir(user_rom_name=ROM_NAME,
+                         retroarch_saves_dir=RETROARCH_CFG.savefile_dir,
+                         renamed_rtc_file=og_rename_rtc_file,
+                         renamed_srm_file=og_rename_srm_file)
+        og_rename_files = copy_native_save(save_name=encounter.save_name,
+                                           user_rom_name=ROM_NAME,
+                                           native_saves_dir=NATIVE_SAVES_DIR,
+                                           retroarch_saves_dir=RETROARCH_CFG.savefile_dir)
+        emulator.launch_game()
+        encounter.restart()
+        if speed_estimator is not None:
+            speed_estimator.start()
+
+    # screenshots are only a heartbeat when every attempt takes one
+    watchdog = Watchdog(is_alive=is_emulator_alive,
+                        on_failure=kill_stuck_emulator,
+                        screenshot_dir=RETROARCH_CFG.screenshot_dir if encounter.sprite_reader is None else None)
+    # scales delays to the measured speed of the core
+    speed_estimator = get_speed_estimator(DelayScaling(DELAY_SCALING))
     
     emulator.launch_game()
     try:
         shiny_found = False
         n_attempts = 0
+        n_recoveries = 0
+        watchdog.start()
+        if speed_estimator is not None:
+            speed_estimator.start()
         with cdtmp(sub_dirname="pokemon_shiny_hunting"):
-            logger.info(f"looking for shiny {encounter.pokemon.name}")
+            logger.info(f"looking for shiny {encounter.save_name}")
             while not shiny_found and n_attempts < max_attempts:
-                shiny_found = encounter.find_shiny()
+                watchdog.attempt_started()
+                error = None
+                try:
+                    shiny_found = encounter.find_shiny()
+                except (ConnectionError, TimeoutError) as e:
+                    # the emulator stopped responding, e.g., a screenshot never arrived
+                    error = f"emulator stopped responding: {e}"
+                except Exception as e:
+                    # only failures of the emulator are recovered from
+                    if watchdog.failure is None and watchdog.check() is None:
+                        raise e
+                    logger.debug(f"attempt failed: {e}")
+                watchdog.attempt_finished()
+                failure = watchdog.failure or watchdog.check() or error
+                if failure is not None:
+                    # the attempt does not count, its result cannot be trusted
+                    shiny_found = False
+                    n_recoveries += 1
+                    if n_recoveries > max_recoveries:
+                        raise RuntimeError(f"Gave up after recovering {max_recoveries} times in a row: {failure}")
+                    recover(failure)
+                    watchdog.reset()
+                    continue
+                n_recoveries = 0
                 n_attempts += 1
                 logger.debug(f"attempt number {n_attempts}")
 
@@ -73,7 +147,14 @@ def run(emulator: Emulator,
                     logger.info(f"attempt number {n_attempts}/{max_attempts}")
 
             logger.info(f"total number attempts: {n_attempts}")
+            WAIT_HISTOGRAM.log_summary()
+        watchdog.stop()
+        if speed_estimator is not None:
+            speed_estimator.stop()
     except Exception as e:
+        watchdog.stop()
+        if speed_estimator is not None:
+            speed_estimator.stop()
         kill_proc_and_cleanup()
         logger.error("Exception occurred while shiny hunting")
         raise e
@@ -86,20 +167,29 @@ def run(emulator: Emulator,
     else:
         kill_proc_and_cleanup()
         attachments = []
-    send_notification(encounter.pokemon,
-                      n_attempts,
-                      shiny_found,
-                      attachments=attachments,
-                      send=send_email)
+    if encounter.pokemon is not None:
+        send_notification(encounter.pokemon,
+                          n_attempts,
+                          shiny_found,
+                          attachments=attachments,
+                          send=send_email)
+    else:
+        # no wild Pokémon appeared in any attempt of a random encounter
+        logger.warning("no Pokémon encountered, not sending a notification")
     sys.exit(0)
 
 
 if __name__ == "__main__":
     import __init__  # noqa: F401
-    from config import POKEMON_STATIC_ENCOUNTER
+    from config import ENCOUNTER_TYPE, POKEMON_STATIC_ENCOUNTER, RANDOM_ENCOUNTER_SAVE
 
     logger.info("running main")
     emulator = Emulator()
-    pokemon = Pokemon(POKEMON_STATIC_ENCOUNTER)
-    encounter = StaticEncounter(emulator, pokemon)
+    if EncounterType(ENCOUNTER_TYPE) == EncounterType.RANDOM:
+        if RANDOM_ENCOUNTER_SAVE is None:
+            raise ValueError("Random encounters require RANDOM_ENCOUNTER_SAVE in config.ini")
+        encounter = RandomEncounter(emulator, RANDOM_ENCOUNTER_SAVE)
+    else:
+        pokemon = Pokemon(POKEMON_STATIC_ENCOUNTER)
+        encounter = StaticEncounter(emulator, pokemon)
     run(emulator, encounter)
\ No newline at end of file
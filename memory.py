@@ -0,0 +1,101 @@
+"""Read Pokémon data straight from emulator memory."""
+
+import logging
+from typing import Tuple, Union
+
+from config import POKEMON_GAME, RETROARCH_CFG
+from pokemon import Pokemon, SpriteType
+from helpers.network_cmd import NetworkCommandClient
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+ENEMY_MON_ADDRESSES = {
+    # wEnemyMon battle struct in WRAM, see pokecrystal's wram.asm
+    "Crystal": 0xD206,
+}
+"""The address of the enemy Pokémon's battle struct for each game."""
+
+ENEMY_MON_SIZE = 8
+"""Bytes read from the battle struct: species, item, 4 moves, 2 DV bytes."""
+
+ENEMY_MON_DVS_OFFSET = 6
+"""The offset of the DVs in the battle struct."""
+
+SHINY_DV = 10
+"""The defense, speed and special DV of every shiny Pokémon."""
+
+SHINY_ATK_DVS = (2, 3, 6, 7, 10, 11, 14, 15)
+"""The attack DVs of a shiny Pokémon, i.e., those with bit 1 set."""
+
+
+class CoreMemory():
+    """Read the emulator core's memory with RetroArch's `READ_CORE_MEMORY`
+    network command. Requires network commands to be enabled in RetroArch
+    and a core that exposes a memory map, e.g., gambatte."""
+    def __init__(self, client: NetworkCommandClient = None):
+        if client is None:
+            client = NetworkCommandClient(port=RETROARCH_CFG.network_cmd_port)
+        self.client = client
+
+    def read(self, address: int, size: int) -> bytes:
+        """Read `size` bytes starting at `address`.
+        Raises `RuntimeError` if the core cannot read the memory
+        and `TimeoutError` if RetroArch does not reply."""
+        reply = self.client.request("READ_CORE_MEMORY", f"{address:x}", size)
+        parts = reply.split(" ")
+        if len(parts) < 3 or parts[0] != "READ_CORE_MEMORY" or int(parts[1], 16) != address:
+            raise RuntimeError(f"Unexpected reply to READ_CORE_MEMORY {address:x}: {reply}")
+        if parts[2] == "-1":
+            raise RuntimeError(f"Unable to read core memory at {address:x}: {' '.join(parts[3:])}")
+        data = bytes.fromhex("".join(parts[2:]))
+        if len(data) != size:
+            raise RuntimeError(f"Expected {size} bytes at {address:x}, got {len(data)}")
+        return data
+
+
+class MemorySpriteReader():
+    """Determine the sprite type of a wild Pokémon from its DVs in emulator
+    memory instead of from a screenshot. Once memory turns out to be
+    unreachable it stops trying, so callers fall back to the image path."""
+    def __init__(self, memory: CoreMemory = None, game: str = POKEMON_GAME):
+        self.memory = memory if memory is not None else CoreMemory()
+        self.address = ENEMY_MON_ADDRESSES.get(game)
+        self.available = self.address is not None
+        if not self.available:
+            logger.warning(f"reading sprite types from memory is not supported for Pokémon {game}")
+
+    def determine_sprite_type(self, pokemon: Pokemon) -> Union[SpriteType, None]:
+        """Determine the sprite type of the enemy Pokémon in battle.
+        `None` if memory is unavailable or `pokemon` is not in battle."""
+        if not self.available:
+            return None
+        try:
+            data = self.memory.read(self.address, ENEMY_MON_SIZE)
+        except (ConnectionError, RuntimeError, TimeoutError) as e:
+            logger.warning(f"core memory unavailable, falling back to screenshots: {e}")
+            self.available = False
+            return None
+
+        species, dvs = parse_enemy_mon(data)
+        if species != pokemon.number:
+            logger.debug(f"enemy species {species} in memory is not {pokemon.name}")
+            return None
+        logger.debug(f"{pokemon.name} DVs: {dvs.hex()}")
+        return SpriteType.SHINY if is_shiny(dvs) else SpriteType.NORMAL
+
+
+def parse_enemy_mon(data: bytes) -> Tuple[int, bytes]:
+    """Extract the species and the 2 DV bytes from the battle struct."""
+    return data[0], data[ENEMY_MON_DVS_OFFSET:ENEMY_MON_DVS_OFFSET + 2]
+
+
+def unpack_dvs(dvs: bytes) -> Tuple[int, int, int, int]:
+    """Unpack the attack, defense, speed and special DVs, a nibble each."""
+    return dvs[0] >> 4, dvs[0] & 0xF, dvs[1] >> 4, dvs[1] & 0xF
+
+
+def is_shiny(dvs: bytes) -> bool:
+    """Apply the generation II shiny formula to the DVs."""
+    atk, defense, spd, spc = unpack_dvs(dvs)
+    return atk in SHINY_ATK_DVS and defense == SHINY_DV and spd == SHINY_DV and spc == SHINY_DV
@@ -0,0 +1,151 @@
+"""Microbenchmarks for the image detection hot paths.
+This module is intended to be run from the pokemon/ directory."""
+
+# add workspace and tests dir to system path, otherwise cannot import project modules
+import os
+import sys
+import timeit
+proj_root_path = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), os.pardir
+)
+sys.path.append(proj_root_path)
+sys.path.append(os.path.join(proj_root_path, "tests"))
+
+import cv2  # noqa: E402
+
+from __setup__ import TEST_IMG_DIR  # noqa: E402
+from helpers.opencv_util import (  # noqa: E402
+    IMG_SIZE_MED, IMG_SIZE_VERY_SMALL,
+    RGB, _get_color_diff, compare_img_color, compare_img_pixels,
+    get_img_color, get_img_height, get_img_width
+)
+from config import ASSETS, LETTERS_DIR  # noqa: E402
+from image import (  # noqa: E402
+    SpriteClassifier,
+    crop_name_in_battle, crop_pokemon_in_battle,
+    determine_name, determine_sprite_type, get_letter_from_fn
+)
+from pokemon import Pokemon, SpriteType  # noqa: E402
+from helpers.log import get_logger, mod_fname  # noqa: E402
+logger = get_logger(mod_fname(__file__))
+
+N_RUNS = 20
+
+
+def compare_img_pixels_loop(img1: cv2.Mat,
+                            img2: cv2.Mat,
+                            resize_width: int = IMG_SIZE_MED,
+                            resize_height: int = IMG_SIZE_MED) -> float:
+    """Reference per-pixel implementation of `compare_img_pixels`."""
+    img1 = cv2.resize(img1, (resize_width, resize_height))
+    img2 = cv2.resize(img2, (resize_width, resize_height))
+
+    diff = 0
+    for row1, row2 in zip(img1, img2):
+        for pixel1, pixel2 in zip(row1, row2):
+            diff += _get_color_diff(RGB(pixel1), RGB(pixel2))
+    return diff
+
+
+def get_img_color_loop(img: cv2.Mat, ignore_white: bool = True) -> RGB:
+    """Reference per-pixel implementation of `get_img_color`."""
+    tot_color = RGB()
+    n_pixels = int(img.size/RGB.LENGTH)
+    for row in img:
+        for pixel in row:
+            rgb = RGB(pixel)
+            if ignore_white and rgb.is_white():
+                n_pixels -= 1
+                continue
+            tot_color.r += rgb.r
+            tot_color.g += rgb.g
+            tot_color.b += rgb.b
+    rgb_norm = RGB()
+    rgb_norm.r = tot_color.r/n_pixels
+    rgb_norm.g = tot_color.g/n_pixels
+    rgb_norm.b = tot_color.b/n_pixels
+    return rgb_norm
+
+
+def determine_sprite_type_reload(pokemon: Pokemon, img: cv2.Mat) -> SpriteType:
+    """Reference implementation of `determine_sprite_type`
+    that decodes the reference sprites on every call."""
+    normal_img = ASSETS.imread(pokemon.get_normal_img_fn())
+    shiny_img = ASSETS.imread(pokemon.get_shiny_img_fn())
+    img = cv2.resize(img, (get_img_width(normal_img), get_img_height(normal_img)))
+    diff_normal = compare_img_color(img, normal_img, offset_shading=False)
+    diff_shiny = compare_img_color(img, shiny_img, offset_shading=False)
+    return SpriteType.NORMAL if diff_normal < diff_shiny else SpriteType.SHINY
+
+
+def determine_name_reload(letter_imgs) -> str:
+    """Reference implementation of `determine_name` that decodes
+    and compares every letter template for every letter."""
+    name = str()
+    for letter_img in letter_imgs:
+        min_diff = None
+        for file in ASSETS.glob(os.path.join(LETTERS_DIR, "*.png")):
+            diff = compare_img_pixels(letter_img, ASSETS.imread(file),
+                                      IMG_SIZE_VERY_SMALL, IMG_SIZE_VERY_SMALL)
+            if min_diff is None or diff < min_diff:
+                min_diff = diff
+                letter = get_letter_from_fn(file)
+        name += letter
+    return name
+
+
+def bench(name: str, func, reference, *args):
+    """Time a function against its reference implementation
+    and log the speedup."""
+    result, expected = func(*args), reference(*args)
+    t_func = timeit.timeit(lambda: func(*args), number=N_RUNS)/N_RUNS
+    t_ref = timeit.timeit(lambda: reference(*args), number=N_RUNS)/N_RUNS
+    logger.info(f"{name}: {t_ref*1e3:.3f}ms -> {t_func*1e3:.3f}ms "
+                f"({t_ref/t_func:.1f}x) | result {result} vs {expected}")
+
+
+def bench_compare_img_pixels():
+    """Benchmark pixel comparison at the sizes used by image detection."""
+    img1 = cv2.imread(os.path.join(TEST_IMG_DIR, "cropped_poke_battle_img_1.png"))
+    img2 = cv2.imread(os.path.join(TEST_IMG_DIR, "cropped_poke_battle_img_2.png"))
+    char1 = cv2.imread(os.path.join(TEST_IMG_DIR, "char_0.png"))
+    char2 = cv2.imread(os.path.join(TEST_IMG_DIR, "char_1.png"))
+    bench("compare_img_pixels (72x72)", compare_img_pixels, compare_img_pixels_loop,
+          img1, img2)
+    bench("compare_img_pixels (8x8)", compare_img_pixels, compare_img_pixels_loop,
+          char1, char2, IMG_SIZE_VERY_SMALL, IMG_SIZE_VERY_SMALL)
+
+
+def bench_get_img_color():
+    """Benchmark the white-masked mean color of a battle crop."""
+    img = cv2.imread(os.path.join(TEST_IMG_DIR, "cropped_poke_battle_img_1.png"))
+    bench("get_img_color", lambda i: vars(get_img_color(i)),
+          lambda i: vars(get_img_color_loop(i)), img)
+
+
+def bench_determine_sprite_type():
+    """Benchmark sprite type detection on a battle crop."""
+    pokemon = Pokemon("Gyarados")
+    crop = crop_pokemon_in_battle(os.path.join(TEST_IMG_DIR, "battle_img_1.png"))
+    bench("determine_sprite_type", determine_sprite_type, determine_sprite_type_reload,
+          pokemon, crop)
+    bench("determine_sprite_type (pixels)",
+          lambda p, c: determine_sprite_type(p, c, SpriteClassifier.PIXELS),
+          determine_sprite_type_reload, pokemon, crop)
+    bench("determine_sprite_type (palette)",
+          lambda p, c: determine_sprite_type(p, c, SpriteClassifier.PALETTE),
+          determine_sprite_type_reload, pokemon, crop)
+
+
+def bench_determine_name():
+    """Benchmark reading a Pokémon name from a battle screenshot."""
+    letter_imgs = crop_name_in_battle(os.path.join(TEST_IMG_DIR, "battle_img_7.png"))
+    determine_name(letter_imgs)  # build the letter bank outside the timing
+    bench("determine_name", determine_name, determine_name_reload, letter_imgs)
+
+
+if __name__ == "__main__":
+    bench_compare_img_pixels()
+    bench_get_img_color()
+    bench_determine_sprite_type()
+    bench_determine_name()
@@ -13,6 +13,7 @@ from email import encoders
 
 from config import USERNAME, RECEIVER_EMAIL, SENDER_EMAIL, SENDER_EMAIL_PASS
 from pokemon import Pokemon
+from helpers.assets import ASSETS
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
 
@@ -74,9 +75,9 @@ def send_notification(pokemon: Pokemon,
     attachments.append(pokemon.get_shiny_img_fn())
     attachments = list(set(attachments))  # only unique files
     for file in attachments:
-        with open(file, "rb") as attached_file:
-            attachment = MIMEBase("application", "octet-stream")
-            attachment.set_payload(attached_file.read())
+        # sprite images are read straight from their zip archive
+        attachment = MIMEBase("application", "octet-stream")
+        attachment.set_payload(ASSETS.read(file))
 
         fn = os.path.basename(file).strip().replace(" ", "_")  # remove whitespace for proper attachment
         encoders.encode_base64(attachment)
@@ -5,12 +5,12 @@ import logging
 import os
 from typing import List, Tuple
 
-from config import RETROARCH_CFG
-from emulator import Emulator
+from config import RETROARCH_CFG, ROM_NAME
+from emulator import Emulator, PreciseInputSession
 from image import (
     determine_pack_items,
-    get_latest_png_fn,
 )
+from srm import read_pack_pockets
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
 
@@ -20,9 +20,15 @@ MAX_PACK_ITEMS = 5
 
 
 class Pack():
-    """Describes all the items in a pack."""
-    def __init__(self, emulator: Emulator):
-        all_inventory = collect_pack_inventory(emulator)
+    """Describes all the items in a pack. Read from the save file when
+    given one, otherwise collected from the pack screens in the emulator."""
+    def __init__(self, emulator: Emulator = None, srm_fn: str = None):
+        if srm_fn is not None:
+            all_inventory = read_pack_inventory(srm_fn)
+        elif emulator is not None:
+            all_inventory = collect_pack_inventory(emulator)
+        else:
+            raise RuntimeError("Must provide an emulator or a save file to determine the pack inventory.")
         self.items,self.machines,self.keyitems,self.balls = all_inventory
 
 
@@ -87,26 +93,46 @@ class BallType(str, Enum):
     SPORT = "sportball"
 
 
+def get_srm_fn(rom_name: str = ROM_NAME) -> str:
+    """Retrieve the filename of the ROM's save file in the RetroArch saves dir."""
+    return os.path.join(RETROARCH_CFG.savefile_dir, f"{rom_name}.srm")
+
+
+def read_pack_inventory(srm_fn: str) -> Tuple[Items, Machines, KeyItems, Balls]:
+    """Read inventory of all items in the pack from a save file.
+    The save file holds the pack as of the last in-game save,
+    written to disk by RetroArch when the SRAM is flushed."""
+    items_list, machines_list, keyitems_list, balls_list = read_pack_pockets(srm_fn)
+    return (
+        Items(items_list),
+        Machines(machines_list),
+        KeyItems(keyitems_list),
+        Balls(balls_list)
+    )
+
+
 def collect_pack_inventory(emulator: Emulator) -> Tuple[Items, Machines, KeyItems, Balls]:
-    """Collect inventory of all items in the pack."""
+    """Collect inventory of all items in the pack. The pack is navigated in a
+    single precise input session, so fast forward is only turned off once."""
     # assume user is in the Pokémon world
     # assume pause menu has not yet been interacted
-    emulator.press_start(delay_after_press=0.25)
-    emulator.move_down_precise(presses=2)
-    emulator.press_a(delay_after_press=0.25)
-    
-    # get inventory of each section in the pack
-    items_list = collect_inventory(emulator, get_qty=True)
-    emulator.move_left_precise(presses=1)
-    machines_list = collect_inventory(emulator, get_qty=True)
-    emulator.move_left_precise(presses=1)
-    keyitems_list = collect_inventory(emulator, get_qty=False)
-    emulator.move_left_precise(presses=1)
-    balls_list = collect_inventory(emulator, get_qty=True)
-
-    # back out of the pause menu
-    emulator.press_b(presses=1, delay_after_press=0.5)
-    emulator.press_b(presses=1, delay_after_press=0.25)
+    with emulator.precise_input() as session:
+        session.queue(emulator.press_start, delay_after_press=0.25)
+        session.queue(emulator.move_down_precise, presses=2)
+        session.queue(emulator.press_a, delay_after_press=0.25)
+        
+        # get inventory of each section in the pack
+        items_list = collect_inventory(emulator, session, get_qty=True)
+        session.queue(emulator.move_left_precise, presses=1)
+        machines_list = collect_inventory(emulator, session, get_qty=True)
+        session.queue(emulator.move_left_precise, presses=1)
+        keyitems_list = collect_inventory(emulator, session, get_qty=False)
+        session.queue(emulator.move_left_precise, presses=1)
+        balls_list = collect_inventory(emulator, session, get_qty=True)
+
+        # back out of the pause menu
+        session.queue(emulator.press_b, presses=1, delay_after_press=0.5)
+        session.queue(emulator.press_b, presses=1, delay_after_press=0.25)
     
     return (
         Items(items_list), 
@@ -115,33 +141,30 @@ def collect_pack_inventory(emulator: Emulator) -> Tuple[Items, Machines, KeyItem
         Balls(balls_list)
     )
 
-def collect_inventory(emulator: Emulator, get_qty: bool) -> List[Tuple[str, int]]:
-    """Generic function to collect inventory for any section in the pack."""
+def collect_inventory(emulator: Emulator, session: PreciseInputSession, get_qty: bool) -> List[Tuple[str, int]]:
+    """Generic function to collect inventory for any section in the pack.
+    Runs the actions queued in the session before each screenshot."""
     inventory = []
     unique_pack_items = [None]  # initialize with None element to kick off while loop
-    emulator.move_down_precise(presses=MAX_PACK_ITEMS - 1, delay_after_press=0.1)  # assume cursor starts on unique item
+    session.queue(emulator.move_down_precise, presses=MAX_PACK_ITEMS - 1, delay_after_press=0.1)  # assume cursor starts on unique item
     while len(inventory) % MAX_PACK_ITEMS == 0 and len(unique_pack_items) > 0:
-        emulator.take_screenshot(delay_after_press=0.25)
-        pack_img_fn = get_latest_png_fn(RETROARCH_CFG.screenshot_dir)
+        session.flush()
+        pack_img_fn = emulator.capture_screenshot()
         pack_items = determine_pack_items(pack_img_fn, get_qty=get_qty)
         os.remove(pack_img_fn)
         
         # add only unique items to inventory
         unique_pack_items = [e for e in pack_items if e not in inventory]
         inventory += unique_pack_items
-        emulator.move_down_precise(presses=MAX_PACK_ITEMS, delay_after_press=0.1)
+        session.queue(emulator.move_down_precise, presses=MAX_PACK_ITEMS, delay_after_press=0.1)
     return inventory
 
 
 if __name__ == "__main__":
     import __init__  # noqa: F401
-    em = Emulator()
-    em.launch_game()
-    em.continue_pokemon_game()
-    pack = Pack(em)
+    pack = Pack(srm_fn=get_srm_fn())
     logger.info(f"balls: {pack.balls.inventory}")
     logger.info(f"items: {pack.items.inventory}")
     logger.info(f"tm: {pack.machines.tm}")
     logger.info(f"hm: {pack.machines.hm}")
     logger.info(f"key items: {pack.keyitems.inventory}")
-    em.kill_process()
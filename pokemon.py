@@ -1,36 +1,88 @@
 """Model a Pokémon."""
 
 from enum import Enum
+from functools import lru_cache
 import logging
 import os
+from typing import Union
 
-from config import SPRITES_DIR, POKEMON_GAME
-from dex import get_pokemon_number
+import cv2
+
+from config import ASSETS, IMAGES_DIR, SPRITES_DIR, POKEMON_GAME
+from dex import gen_2_dex, get_pokemon_number
+from helpers.atlas import ImageAtlas, write_atlas
+from helpers.opencv_util import get_img_color, get_img_height, get_img_width
 from helpers.log import mod_fname
 logger = logging.getLogger(mod_fname(__file__))
 
+SPRITE_SIZE = 56
+"""The width and height sprites are packed into the sprite atlas at, in pixels."""
+
 
 class Pokemon():
     """Defines attributes of a Pokémon."""
     def __init__(self, name: str):
         self.name = name.upper()
         self.number = get_pokemon_number(name)
+        self._normal_img_fn: str = None
+        self._shiny_img_fn: str = None
+        self._sprite_bank: SpriteBank = None
     
     def get_normal_img_fn(self) -> str:
         """Obtain the filename for the Pokémon's
         normal image."""
-        return create_pokemon_sprite_fn(game=POKEMON_GAME,
-                                        name=self.name,
-                                        number=self.number,
-                                        _type=SpriteType.NORMAL)
+        if self._normal_img_fn is None:
+            self._normal_img_fn = create_pokemon_sprite_fn(game=POKEMON_GAME,
+                                                           name=self.name,
+                                                           number=self.number,
+                                                           _type=SpriteType.NORMAL)
+        return self._normal_img_fn
 
     def get_shiny_img_fn(self) -> str:
         """Obtain the filename for the Pokémon's
         shiny image."""
-        return create_pokemon_sprite_fn(game=POKEMON_GAME,
-                                        name=self.name,
-                                        number=self.number,
-                                        _type=SpriteType.SHINY)
+        if self._shiny_img_fn is None:
+            self._shiny_img_fn = create_pokemon_sprite_fn(game=POKEMON_GAME,
+                                                          name=self.name,
+                                                          number=self.number,
+                                                          _type=SpriteType.SHINY)
+        return self._shiny_img_fn
+    
+    @property
+    def sprite_bank(self) -> "SpriteBank":
+        """The Pokémon's reference sprites, loaded on first use."""
+        if self._sprite_bank is None:
+            self._sprite_bank = load_sprite_bank(POKEMON_GAME, self.name, self.number)
+        return self._sprite_bank
+
+
+class SpriteBank():
+    """Holds a Pokémon's normal and shiny sprites along with their
+    precomputed color signatures. Sprites never change during a hunt
+    so they are decoded once (see `load_sprite_bank`)."""
+    def __init__(self, normal_img: cv2.Mat, shiny_img: cv2.Mat):
+        self.normal_img = normal_img
+        self.shiny_img = shiny_img
+        
+        # crops are resized to the normal sprite before comparison
+        self.width = get_img_width(self.normal_img)
+        self.height = get_img_height(self.normal_img)
+
+        # white-masked mean colors and the signs of their component differences
+        self.normal_color = get_img_color(self.normal_img)
+        self.shiny_color = get_img_color(self.shiny_img)
+        self.normal_diff_signs = self.normal_color.diff_signs()
+        self.shiny_diff_signs = self.shiny_color.diff_signs()
+
+    @staticmethod
+    def from_files(normal_img_fn: str, shiny_img_fn: str) -> "SpriteBank":
+        """Decode a Pokémon's sprites from their image files."""
+        normal_img = ASSETS.imread(normal_img_fn)
+        shiny_img = ASSETS.imread(shiny_img_fn)
+        if normal_img is None or shiny_img is None:
+            raise FileNotFoundError(f"Unable to read sprites {normal_img_fn} and {shiny_img_fn}")
+        logger.debug(f"decoded sprites: {normal_img_fn}, {shiny_img_fn}")
+        return SpriteBank(normal_img, shiny_img)
 
 
 class SpriteType(str, Enum):
@@ -57,6 +109,55 @@ def create_pokemon_sprite_fn(game: str,
     return pokemon_fn
 
 
+def get_sprite_atlas_fn(game: str = POKEMON_GAME) -> str:
+    """Generate the filename of the sprite atlas for a game."""
+    return os.path.join(IMAGES_DIR, f"sprite_atlas_{game.lower()}.bin")
+
+
+def build_sprite_atlas(game: str = POKEMON_GAME) -> ImageAtlas:
+    """Decode the normal and shiny sprites of every generation II Pokémon,
+    resize them to `SPRITE_SIZE` and pack them into the sprite atlas for the
+    game, keyed by national number."""
+    imgs = dict()
+    for _, row in gen_2_dex().iterrows():
+        name, number = row.get("NAME"), int(row.get("NUMBER"))
+        sprite_bank = SpriteBank.from_files(create_pokemon_sprite_fn(game, name, number, SpriteType.NORMAL),
+                                            create_pokemon_sprite_fn(game, name, number, SpriteType.SHINY))
+        # variants are packed normal first, then shiny
+        imgs[number] = [cv2.resize(sprite_bank.normal_img, (SPRITE_SIZE, SPRITE_SIZE)),
+                        cv2.resize(sprite_bank.shiny_img, (SPRITE_SIZE, SPRITE_SIZE))]
+
+    sprite_atlas_fn = get_sprite_atlas_fn(game)
+    write_atlas(sprite_atlas_fn, imgs)
+    logger.info(f"packed sprites of {len(imgs)} Pokémon into {sprite_atlas_fn}")
+    return ImageAtlas(sprite_atlas_fn)
+
+
+@lru_cache(maxsize=None)
+def load_sprite_atlas(game: str = POKEMON_GAME) -> Union[ImageAtlas, None]:
+    """Memory-map the sprite atlas for a game.
+    `None` if the atlas has not been built (see `build_sprite_atlas`)."""
+    sprite_atlas_fn = get_sprite_atlas_fn(game)
+    if not os.path.isfile(sprite_atlas_fn):
+        logger.debug(f"no sprite atlas at {sprite_atlas_fn}")
+        return None
+    return ImageAtlas(sprite_atlas_fn)
+
+
+def load_sprite_bank(game: str, name: str, number: int = None) -> SpriteBank:
+    """Load a Pokémon's sprites as views into the game's sprite atlas.
+    Without an atlas, or for Pokémon missing from it, the sprites
+    are decoded from their sprite images."""
+    if number is None:
+        number = get_pokemon_number(name)
+    sprite_atlas = load_sprite_atlas(game)
+    if sprite_atlas is not None and number in sprite_atlas:
+        return SpriteBank(sprite_atlas.get(number, variant=0),
+                          sprite_atlas.get(number, variant=1))
+    return SpriteBank.from_files(create_pokemon_sprite_fn(game, name, number, SpriteType.NORMAL),
+                                 create_pokemon_sprite_fn(game, name, number, SpriteType.SHINY))
+
+
 def get_sprite_name(name: str):
     """Retrieve a Pokémon's sprite name."""
     return name.lower().replace(' ','-').replace('.','').replace('\'','')
@@ -2,9 +2,9 @@
 
 import logging
 import os
-import shutil
 from typing import Tuple
 
+from helpers.assets import ASSETS
 from helpers.file_mgmt import cd
 from helpers.platform import Platform
 from helpers.log import mod_fname
@@ -48,6 +48,14 @@ class RetroArchConfig():
         self.input_player_1 = RetroArchInputPlayerConfig(config["input_player1_"])
         self.input_player_2 = RetroArchInputPlayerConfig(config["input_player2_"])
 
+        # logging
+        self.log_to_file = config["log_to_file"] == "true"
+        self.log_verbosity = config["log_verbosity"] == "true"
+
+        # network commands
+        self.network_cmd_enable = config["network_cmd_enable"] == "true"
+        self.network_cmd_port = int(config["network_cmd_port"])
+
 
 class RetroArchInputPlayerConfig():
     """Store RetroArch input settings in memory."""
@@ -85,6 +93,11 @@ def _parse_retroarch_config(config_fp: str) -> dict:
     load_state_btn = "input_load_state "
     exit_btn = "input_exit_emulator "
 
+    log_to_file = "log_to_file "
+    log_verbosity = "log_verbosity "
+    network_cmd_enable = "network_cmd_enable "
+    network_cmd_port = "network_cmd_port "
+
     input_player = "input_player"
     
     def _clean_line(line: str, sub_str: str) -> str:
@@ -122,6 +135,14 @@ def _parse_retroarch_config(config_fp: str) -> dict:
                 config[load_state_btn.strip()] = _clean_line(line, load_state_btn)
             elif exit_btn in line:
                 config[exit_btn.strip()] = _clean_line(line, exit_btn)
+            elif log_to_file in line:
+                config[log_to_file.strip()] = _clean_line(line, log_to_file)
+            elif log_verbosity in line:
+                config[log_verbosity.strip()] = _clean_line(line, log_verbosity)
+            elif network_cmd_enable in line:
+                config[network_cmd_enable.strip()] = _clean_line(line, network_cmd_enable)
+            elif network_cmd_port in line:
+                config[network_cmd_port.strip()] = _clean_line(line, network_cmd_port)
             elif input_player in line:
                 input,player_num,_ = line.split("_", 2)
                 keybind = f"{input}_{player_num}_"
@@ -162,18 +183,22 @@ def _parse_retroarch_config(config_fp: str) -> dict:
     return config
 
 
-def copy_native_save(pokemon_name: str,
+def get_native_save_name(pokemon_name: str) -> str:
+    """The name of the native save for a Pokémon static encounter."""
+    return pokemon_name.lower().capitalize()
+
+
+def copy_native_save(save_name: str,
                      user_rom_name: str,
                      native_saves_dir: str,
                      retroarch_saves_dir: str) -> Tuple[str, str]:
-    """Copy native save for this Pokémon static encounter
-    into the user's saves dir."""
-    pokemon_name = pokemon_name.lower().capitalize()
-    logger.info(f"copying native save files for {pokemon_name} -> savefiles dir")
+    """Copy a native save, e.g., of a Pokémon static encounter
+    (see `get_native_save_name`), into the user's saves dir."""
+    logger.info(f"copying native save files for {save_name} -> savefiles dir")
 
     calibrate_rom_name = "Pokemon - Crystal Version (UE) (V1.1) [C][!]"
-    calibrate_rtc_path = os.path.join(native_saves_dir, pokemon_name, f"{calibrate_rom_name}.rtc")
-    calibrate_srm_path = os.path.join(native_saves_dir, pokemon_name, f"{calibrate_rom_name}.srm")
+    calibrate_rtc_path = os.path.join(native_saves_dir, save_name, f"{calibrate_rom_name}.rtc")
+    calibrate_srm_path = os.path.join(native_saves_dir, save_name, f"{calibrate_rom_name}.srm")
     og_rtc_path = os.path.join(retroarch_saves_dir, f"{user_rom_name}.rtc")
     og_srm_path = os.path.join(retroarch_saves_dir, f"{user_rom_name}.srm")
 
@@ -201,8 +226,10 @@ def copy_native_save(pokemon_name: str,
         og_rename_srm_path = None
     
     # copy calibration save files over to savefile dir, then rename
-    shutil.copy(calibrate_rtc_path, og_rtc_path)
-    shutil.copy(calibrate_srm_path, og_srm_path)
+    # (native saves are read straight from their zip archive)
+    for calibrate_path, og_path in [(calibrate_rtc_path, og_rtc_path), (calibrate_srm_path, og_srm_path)]:
+        with open(og_path, "wb") as outfile:
+            outfile.write(ASSETS.read(calibrate_path))
     logger.debug(f"copied {calibrate_rtc_path} -> {og_rtc_path}")
     logger.debug(f"copied {calibrate_srm_path} -> {og_srm_path}")
 
@@ -0,0 +1,134 @@
+"""Parse RetroArch savestates of the gambatte (GBC) core."""
+
+import logging
+import struct
+from typing import Callable, Tuple, Union
+import zlib
+
+from config import POKEMON_GAME
+from memory import ENEMY_MON_ADDRESSES, ENEMY_MON_SIZE, is_shiny, parse_enemy_mon
+from pokemon import Pokemon, SpriteType
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+RZIP_MAGIC = b"#RZIPv"
+"""Starts a savestate compressed by RetroArch (`savestate_file_compression`)."""
+
+RZIP_HEADER = struct.Struct("<8sIQ")
+"""The rzip header: magic and version, chunk size, uncompressed size."""
+
+RASTATE_MAGIC = b"RASTATE"
+"""Starts a savestate wrapped in RetroArch's block container."""
+
+RASTATE_MEM_BLOCK = b"MEM "
+"""The id of the container block holding the core's own state."""
+
+WRAM_LABEL = b"wram\0"
+"""The label gambatte writes before the WRAM in its state."""
+
+WRAM_SIZES = (0x2000, 0x8000)
+"""The WRAM size of the Game Boy and the Game Boy Color."""
+
+WRAM_START = 0xC000
+"""The address WRAM is mapped at."""
+
+
+class SavestateSpriteReader():
+    """Determine the sprite type of a wild Pokémon from its DVs in a
+    savestate. For setups without network commands, the savestate holds
+    the full WRAM and parsing it is cheaper than classifying a screenshot."""
+    def __init__(self, capture_state: Callable[[], str], game: str = POKEMON_GAME):
+        self.capture_state = capture_state
+        self.address = ENEMY_MON_ADDRESSES.get(game)
+        self.available = self.address is not None
+        if not self.available:
+            logger.warning(f"reading sprite types from savestates is not supported for Pokémon {game}")
+
+    def determine_sprite_type(self, pokemon: Pokemon) -> Union[SpriteType, None]:
+        """Save the state and determine the sprite type of the enemy Pokémon in
+        battle. `None` if the state cannot be parsed or `pokemon` is not in battle."""
+        if not self.available:
+            return None
+        try:
+            state_fn = self.capture_state()
+            species, dvs = read_enemy_mon(state_fn, self.address)
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"savestate unavailable, falling back to screenshots: {e}")
+            self.available = False
+            return None
+
+        if species != pokemon.number:
+            logger.debug(f"enemy species {species} in savestate is not {pokemon.name}")
+            return None
+        logger.debug(f"{pokemon.name} DVs: {dvs.hex()}")
+        return SpriteType.SHINY if is_shiny(dvs) else SpriteType.NORMAL
+
+
+def read_enemy_mon(state_fn: str, address: int) -> Tuple[int, bytes]:
+    """Read the species and DVs of the enemy Pokémon from a savestate file."""
+    with open(state_fn, "rb") as infile:
+        wram = find_wram(read_core_state(infile.read()))
+    offset = address - WRAM_START
+    return parse_enemy_mon(wram[offset:offset + ENEMY_MON_SIZE])
+
+
+def read_core_state(data: bytes) -> bytes:
+    """Unwrap the core's own state from a RetroArch savestate,
+    which may be compressed and may be wrapped in a block container."""
+    if data.startswith(RZIP_MAGIC):
+        data = _decompress_rzip(data)
+    if data.startswith(RASTATE_MAGIC):
+        data = _find_rastate_block(data, RASTATE_MEM_BLOCK)
+    return data
+
+
+def find_wram(core_state: bytes) -> bytes:
+    """Find the WRAM in a gambatte state. Each entry of the state is a
+    NUL-terminated label, a 24-bit big-endian size, then the data.
+    WRAM banks are laid out one after the other, bank 1 following bank 0,
+    so an address in `0xC000-0xDFFF` is found at `address - 0xC000`."""
+    start = core_state.find(WRAM_LABEL)
+    while start != -1:
+        size_pos = start + len(WRAM_LABEL)
+        size = int.from_bytes(core_state[size_pos:size_pos + 3], "big")
+        if size in WRAM_SIZES and size_pos + 3 + size <= len(core_state):
+            return core_state[size_pos + 3:size_pos + 3 + size]
+        start = core_state.find(WRAM_LABEL, start + 1)
+    raise RuntimeError("No WRAM found in the gambatte state")
+
+
+def _decompress_rzip(data: bytes) -> bytes:
+    """Decompress an rzip stream: a header followed by chunks,
+    each a 32-bit size then the deflated chunk."""
+    if len(data) < RZIP_HEADER.size:
+        raise RuntimeError("Truncated rzip header")
+    _, _, total_size = RZIP_HEADER.unpack_from(data)
+    chunks = []
+    pos = RZIP_HEADER.size
+    try:
+        while pos < len(data):
+            chunk_size, = struct.unpack_from("<I", data, pos)
+            pos += 4
+            chunks.append(zlib.decompress(data[pos:pos + chunk_size]))
+            pos += chunk_size
+    except (struct.error, zlib.error) as e:
+        raise RuntimeError(f"Corrupt rzip stream: {e}")
+    decompressed = b"".join(chunks)
+    if len(decompressed) != total_size:
+        raise RuntimeError(f"Expected {total_size} bytes from the rzip stream, got {len(decompressed)}")
+    return decompressed
+
+
+def _find_rastate_block(data: bytes, block_id: bytes) -> bytes:
+    """Find a block in a RetroArch state container. After the 8 byte
+    header, each block is a 4 byte id, a 32-bit size, then the data
+    padded to a multiple of 8 bytes."""
+    pos = 8
+    while pos + 8 <= len(data):
+        found_id, size = struct.unpack_from("<4sI", data, pos)
+        pos += 8
+        if found_id == block_id:
+            return data[pos:pos + size]
+        pos += (size + 7) & ~7
+    raise RuntimeError(f"No {block_id.decode().strip()} block in the savestate")
@@ -0,0 +1,151 @@
+"""Measure the real speed of the emulator core to scale delays at runtime."""
+
+from enum import Enum
+import logging
+import threading
+import time
+from typing import Callable, Union
+
+from config import EMULATOR_CORE_MAX_FPS, EMULATOR_CORE_MIN_FPS, POKEMON_GAME
+from memory import CoreMemory
+from helpers.common import set_core_fps
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+GAME_TIME_ADDRESSES = {
+    # wGameTimeHours in WRAM, see pokecrystal's wram.asm
+    "Crystal": 0xD4C4,
+}
+"""The address of the in-game play time for each game."""
+
+GAME_TIME_SIZE = 5
+"""Bytes of the play time: hours (2 bytes, big-endian), minutes, seconds, frames."""
+
+GAME_FPS = 60
+"""The frames counted by the play time per second of play, i.e., without fast forward."""
+
+SAMPLE_INTERVAL = 2
+"""The number of seconds between measurements of the speed."""
+
+SMOOTHING = 0.3
+"""The weight of a new measurement in the smoothed speed, between (0,1]."""
+
+
+class DelayScaling(str, Enum):
+    """Enumeration for how relative delays are scaled to the speed of the core."""
+    STATIC = "static"
+    ADAPTIVE = "adaptive"
+
+
+class SpeedEstimator():
+    """Estimate the frame rate of the emulator core by counting the frames
+    of in-game play time that pass between reads of core memory. The frame
+    rate is smoothed, kept between `min_fps` and `max_fps`, and published
+    with `set_core_fps` so that `delay` shrinks when the machine is fast
+    and stretches when it is slow. Reads across a reset, the title screen
+    or a pause, where the play time does not run, are skipped."""
+    def __init__(self,
+                 memory: CoreMemory = None,
+                 game: str = POKEMON_GAME,
+                 min_fps: float = EMULATOR_CORE_MIN_FPS,
+                 max_fps: float = EMULATOR_CORE_MAX_FPS,
+                 smoothing: float = SMOOTHING,
+                 sample_interval: float = SAMPLE_INTERVAL,
+                 publish: Callable[[Union[float, None]], None] = set_core_fps,
+                 clock: Callable[[], float] = time.perf_counter):
+        if not 0 < min_fps <= max_fps:
+            raise ValueError(f"Must provide 0 < min_fps <= max_fps. Got {min_fps} and {max_fps}")
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"Smoothing must be between (0,1]. Got {smoothing}")
+        self.memory = memory if memory is not None else CoreMemory()
+        self.address = GAME_TIME_ADDRESSES.get(game)
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.smoothing = smoothing
+        self.sample_interval = sample_interval
+        self.publish = publish
+        self.clock = clock
+        self.fps: float = None
+        self.available = self.address is not None
+        if not self.available:
+            logger.warning(f"measuring the core speed is not supported for Pokémon {game}")
+        self._last_read: tuple = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def start(self):
+        """Measure the speed in a background thread. Measuring starts
+        over, e.g., after the emulator was relaunched."""
+        self.available = self.address is not None
+        self._last_read = None
+        if not self.available:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._measure, daemon=True, name="SpeedEstimator")
+        self._thread.start()
+
+    def stop(self):
+        """Stop measuring and go back to the configured speed."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.publish(None)
+
+    def sample(self) -> Union[float, None]:
+        """Read the play time and update the smoothed frame rate from the
+        frames that passed since the previous read. Result is the smoothed
+        frame rate, `None` until it is known."""
+        if not self.available:
+            return None
+        try:
+            data = self.memory.read(self.address, GAME_TIME_SIZE)
+        except (ConnectionError, RuntimeError, TimeoutError) as e:
+            logger.warning(f"core memory unavailable, delays are no longer scaled to the measured speed: {e}")
+            self.available = False
+            self.publish(None)
+            return None
+        read_at = self.clock()
+        frames = count_game_frames(data)
+        last_read, self._last_read = self._last_read, (frames, read_at)
+        if last_read is None:
+            return self.fps
+
+        last_frames, last_read_at = last_read
+        if frames <= last_frames or read_at <= last_read_at:
+            logger.debug("play time is not running, skipped measuring the speed")
+            return self.fps
+        # the play time counts one frame per frame of the core
+        measured = (frames - last_frames)/(read_at - last_read_at)
+        measured = min(max(measured, self.min_fps), self.max_fps)
+        if self.fps is None:
+            self.fps = measured
+        else:
+            self.fps += self.smoothing*(measured - self.fps)
+        self.publish(self.fps)
+        logger.debug(f"core speed {measured:.1f} fps, smoothed {self.fps:.1f} fps")
+        return self.fps
+
+    def _measure(self):
+        """Sample the speed until stopped."""
+        while self.available and not self._stop.wait(self.sample_interval):
+            self.sample()
+
+
+def count_game_frames(data: bytes) -> int:
+    """The total number of frames of play time."""
+    hours = int.from_bytes(data[0:2], "big")
+    minutes, seconds, frames = data[2], data[3], data[4]
+    return ((hours*60 + minutes)*60 + seconds)*GAME_FPS + frames
+
+
+def get_speed_estimator(scaling: DelayScaling) -> Union[SpeedEstimator, None]:
+    """Create the estimator that scales delays at runtime.
+    `None` if delays are scaled by the configured speed."""
+    if scaling == DelayScaling.STATIC:
+        return None
+    elif scaling == DelayScaling.ADAPTIVE:
+        return SpeedEstimator()
+    else:
+        raise ValueError(f"Unsupported delay scaling: {scaling}")
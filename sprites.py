@@ -0,0 +1,363 @@
+"""Precompute sprite data used to determine sprite types."""
+
+from functools import lru_cache
+import json
+import logging
+import os
+from typing import Dict, List, Tuple, Union
+
+import cv2
+import numpy as np
+
+from config import IMAGES_DIR, POKEMON_GAME
+from dex import gen_2_dex
+from pokemon import SpriteBank, SpriteType, build_sprite_atlas, load_sprite_bank
+from helpers.numpy_util import get_color_histogram, get_white_mask
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+TILE_SIZE = 8
+"""The width and height of a Game Boy tile, in pixels."""
+
+BATTLE_SPRITE_SIZE = 7*TILE_SIZE
+"""The width and height of the box a sprite is drawn in during battle, in pixels."""
+
+N_SPRITE_PIXELS = 32
+"""The number of discriminative pixels kept per Pokémon."""
+
+FINGERPRINT_SIZE = BATTLE_SPRITE_SIZE//TILE_SIZE
+"""The width and height of a sprite fingerprint, one cell per tile."""
+
+PALETTE_MAX_DIFF = 56
+"""The maximum average color difference between an image and the closest
+palette for the image to be considered drawn with that palette."""
+
+
+def get_sprite_pixels_fn(game: str = POKEMON_GAME) -> str:
+    """Generate the filename of the discriminative pixels table for a game."""
+    return os.path.join(IMAGES_DIR, f"sprite_pixels_{game.lower()}.json")
+
+
+def get_sprite_palettes_fn(game: str = POKEMON_GAME) -> str:
+    """Generate the filename of the sprite palettes index for a game."""
+    return os.path.join(IMAGES_DIR, f"sprite_palettes_{game.lower()}.json")
+
+
+def get_sprite_index_fn(game: str = POKEMON_GAME) -> str:
+    """Generate the filename of the sprite fingerprint index for a game."""
+    return os.path.join(IMAGES_DIR, f"sprite_index_{game.lower()}.npz")
+
+
+class SpritePixels():
+    """The few pixels of a Pokémon's sprite where its normal and shiny
+    variants differ the most, along with the color of each variant there.
+    Coordinates are relative to the sprite as it is placed in battle."""
+    def __init__(self, ys: np.ndarray, xs: np.ndarray, normal: np.ndarray, shiny: np.ndarray):
+        self.ys = ys
+        self.xs = xs
+        self.normal = normal.astype(np.int32)
+        self.shiny = shiny.astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.ys)
+
+    def compare(self, img: cv2.Mat) -> Tuple[float, float]:
+        """Compares the sampled pixels of a sprite sized image with
+        the normal and shiny variants (see `compare_img_pixels`)."""
+        pixels = img[self.ys, self.xs].astype(np.int32)
+        diff_normal = np.sum(np.sqrt(np.sum((pixels - self.normal)**2, axis=-1)))
+        diff_shiny = np.sum(np.sqrt(np.sum((pixels - self.shiny)**2, axis=-1)))
+        return float(diff_normal), float(diff_shiny)
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON compatible dict."""
+        return {
+            "coords": np.stack([self.ys, self.xs], axis=-1).tolist(),
+            "normal": self.normal.tolist(),
+            "shiny": self.shiny.tolist(),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "SpritePixels":
+        """Deserialize from a dict created by `to_dict`."""
+        coords = np.array(data["coords"], dtype=np.intp).reshape(-1, 2)
+        return SpritePixels(ys=coords[:, 0],
+                            xs=coords[:, 1],
+                            normal=np.array(data["normal"]).reshape(-1, 3),
+                            shiny=np.array(data["shiny"]).reshape(-1, 3))
+
+
+class SpritePalette():
+    """The colors of a Pokémon's normal and shiny sprites. Both variants are
+    drawn from the same tiles so every palette slot pairs the normal color of
+    a pixel with its shiny color."""
+    def __init__(self, normal: np.ndarray, shiny: np.ndarray):
+        self.normal = np.asarray(normal, dtype=np.int32).reshape(-1, 3)
+        self.shiny = np.asarray(shiny, dtype=np.int32).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return len(self.normal)
+
+    def compare(self, img: cv2.Mat) -> Union[Tuple[float, float], None]:
+        """Compares the colors of an image with the normal and shiny palettes.
+        Each color of the image is assigned the palette slot it is closest to in
+        either variant; the result is the average difference with the normal
+        and shiny colors of those slots. `None` if the image is all white or
+        its colors are not drawn with either palette."""
+        colors, counts = get_color_histogram(img)
+        if len(colors) == 0:
+            return None
+        weights = counts/np.sum(counts)
+
+        # (n_colors, n_slots) differences with each variant
+        diffs_normal = np.sqrt(np.sum((colors[:, np.newaxis] - self.normal)**2, axis=-1))
+        diffs_shiny = np.sqrt(np.sum((colors[:, np.newaxis] - self.shiny)**2, axis=-1))
+        closest = np.minimum(diffs_normal, diffs_shiny)
+        slots = np.argmin(closest, axis=1)
+        rows = np.arange(len(colors))
+        if np.sum(weights*closest[rows, slots]) > PALETTE_MAX_DIFF:
+            return None
+        diff_normal = np.sum(weights*diffs_normal[rows, slots])
+        diff_shiny = np.sum(weights*diffs_shiny[rows, slots])
+        return float(diff_normal), float(diff_shiny)
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON compatible dict."""
+        return {
+            "normal": self.normal.tolist(),
+            "shiny": self.shiny.tolist(),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "SpritePalette":
+        """Deserialize from a dict created by `to_dict`."""
+        return SpritePalette(normal=data["normal"], shiny=data["shiny"])
+
+
+class SpriteIndex():
+    """The fingerprints of the normal and shiny sprites of many Pokémon,
+    stacked in a single contiguous array so that the sprite nearest to an
+    image is found with one matrix-vector product."""
+    def __init__(self, fingerprints: np.ndarray, names: List[str], sprite_types: List[SpriteType]):
+        if not len(fingerprints) == len(names) == len(sprite_types):
+            raise RuntimeError(f"Expected one name and sprite type per fingerprint. Got {len(names)} names and {len(sprite_types)} sprite types for {len(fingerprints)} fingerprints.")
+        self.fingerprints = np.ascontiguousarray(fingerprints, dtype=np.float32)
+        self.names = [str(name) for name in names]
+        self.sprite_types = [SpriteType(sprite_type) for sprite_type in sprite_types]
+        self.sq_norms = np.einsum("ij,ij->i", self.fingerprints, self.fingerprints)
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def lookup(self, img: cv2.Mat) -> Tuple[str, SpriteType]:
+        """Find the sprite nearest to a sprite sized image.
+        Result is the name and sprite type of the Pokémon."""
+        fingerprint = get_fingerprint(img)
+        # |a - b|^2 = |a|^2 - 2a.b + |b|^2 where |b|^2 is the same for every sprite
+        dists = self.sq_norms - 2*(self.fingerprints @ fingerprint)
+        nearest = int(np.argmin(dists))
+        return self.names[nearest], self.sprite_types[nearest]
+
+    def save(self, index_fn: str):
+        """Save the index to a NumPy archive."""
+        np.savez(index_fn,
+                 fingerprints=self.fingerprints,
+                 names=np.array(self.names),
+                 sprite_types=np.array([sprite_type.value for sprite_type in self.sprite_types]))
+
+    @staticmethod
+    def load(index_fn: str) -> "SpriteIndex":
+        """Load an index saved by `save`."""
+        with np.load(index_fn) as data:
+            return SpriteIndex(data["fingerprints"], data["names"].tolist(), data["sprite_types"].tolist())
+
+
+def get_fingerprint(img: cv2.Mat) -> np.ndarray:
+    """Compute the compact feature vector of a sprite sized image,
+    the mean color of each tile of the battle sprite box."""
+    # nearest neighbor resizing keeps the sprite's colors intact
+    img = cv2.resize(img, (BATTLE_SPRITE_SIZE, BATTLE_SPRITE_SIZE), interpolation=cv2.INTER_NEAREST)
+    tiles = cv2.resize(img, (FINGERPRINT_SIZE, FINGERPRINT_SIZE), interpolation=cv2.INTER_AREA)
+    return tiles.astype(np.float32).ravel()
+
+
+def align_to_battle(img: cv2.Mat) -> cv2.Mat:
+    """Shift a sprite image to where the sprite is drawn in battle.
+    Sprite images center the sprite in a 7x7 tile box whereas in battle,
+    smaller 5x5 and 6x6 tile sprites are bottom-aligned and inset by one
+    tile from the left."""
+    box_size = img.shape[0]
+    ys, xs = np.nonzero(~get_white_mask(img))
+    if len(ys) == 0:
+        return img
+
+    # the margin around the centered sprite is a multiple of half a tile
+    margin = min(ys.min(), xs.min(), box_size - 1 - ys.max(), box_size - 1 - xs.max())
+    margin = min(margin // (TILE_SIZE//2) * (TILE_SIZE//2), TILE_SIZE)
+    if margin == 0:
+        return img
+    dy = margin
+    dx = TILE_SIZE - margin
+    aligned = np.full_like(img, 255)
+    aligned[dy:, dx:] = img[:box_size - dy, :img.shape[1] - dx]
+    return aligned
+
+
+def find_sprite_pixels(normal_img: cv2.Mat,
+                       shiny_img: cv2.Mat,
+                       n_pixels: int = N_SPRITE_PIXELS) -> SpritePixels:
+    """Find the pixels where the normal and shiny sprites differ the most.
+    Pixels in a uniformly colored neighborhood of both sprites are preferred
+    since they tolerate small misalignments of a battle crop."""
+    normal_img = align_to_battle(normal_img)
+    shiny_img = align_to_battle(shiny_img)
+    normal = normal_img.astype(np.int32)
+    shiny = shiny_img.astype(np.int32)
+    diffs = np.sqrt(np.sum((normal - shiny)**2, axis=-1))
+    uniform = _get_uniform_mask(normal) & _get_uniform_mask(shiny)
+
+    # sort by uniformity, then by difference, most discriminative first
+    order = np.lexsort((diffs.ravel(), uniform.ravel()))[::-1]
+    order = order[diffs.ravel()[order] > 0][:n_pixels]
+    ys, xs = np.unravel_index(order, diffs.shape)
+    return SpritePixels(ys, xs, normal_img[ys, xs], shiny_img[ys, xs])
+
+
+def build_sprite_pixels(game: str = POKEMON_GAME,
+                        n_pixels: int = N_SPRITE_PIXELS,
+                        save: bool = True) -> Dict[int, SpritePixels]:
+    """Precompute the discriminative pixels of every generation II Pokémon
+    from the sprite images. Optionally, save them to the table for the game."""
+    sprite_pixels = dict()
+    for _, row in gen_2_dex().iterrows():
+        name, number = row.get("NAME"), int(row.get("NUMBER"))
+        sprite_bank = load_sprite_bank(game, name, number)
+        sprite_pixels[number] = find_sprite_pixels(sprite_bank.normal_img, sprite_bank.shiny_img, n_pixels)
+
+    if not save:
+        return sprite_pixels
+    sprite_pixels_fn = get_sprite_pixels_fn(game)
+    with open(sprite_pixels_fn, "w") as outfile:
+        json.dump({number: pixels.to_dict() for number, pixels in sprite_pixels.items()}, outfile)
+    logger.info(f"saved discriminative pixels of {len(sprite_pixels)} Pokémon to {sprite_pixels_fn}")
+    return sprite_pixels
+
+
+@lru_cache(maxsize=None)
+def load_sprite_pixels(game: str = POKEMON_GAME) -> Dict[int, SpritePixels]:
+    """Load the discriminative pixels table for a game. If the table
+    has not been saved, it is built in memory instead."""
+    sprite_pixels_fn = get_sprite_pixels_fn(game)
+    if not os.path.isfile(sprite_pixels_fn):
+        return build_sprite_pixels(game, save=False)
+
+    with open(sprite_pixels_fn, "r") as infile:
+        data = json.load(infile)
+    logger.debug(f"loaded discriminative pixels table {sprite_pixels_fn}")
+    return {int(number): SpritePixels.from_dict(pixels) for number, pixels in data.items()}
+
+
+def get_sprite_pixels(number: int, game: str = POKEMON_GAME) -> SpritePixels:
+    """Retrieve the discriminative pixels of a Pokémon by its national number."""
+    return load_sprite_pixels(game)[int(number)]
+
+
+def find_sprite_palette(sprite_bank: SpriteBank) -> SpritePalette:
+    """Pair the colors of the normal and shiny sprites by the pixels they are drawn at."""
+    pairs = np.concatenate([sprite_bank.normal_img.reshape(-1, 3),
+                            sprite_bank.shiny_img.reshape(-1, 3)], axis=-1)
+    slots = np.unique(pairs, axis=0)
+    return SpritePalette(normal=slots[:, :3], shiny=slots[:, 3:])
+
+
+def build_sprite_palettes(game: str = POKEMON_GAME, save: bool = True) -> Dict[int, SpritePalette]:
+    """Precompute the palettes of every generation II Pokémon
+    from the sprite images. Optionally, save them to the index for the game."""
+    sprite_palettes = dict()
+    for _, row in gen_2_dex().iterrows():
+        name, number = row.get("NAME"), int(row.get("NUMBER"))
+        sprite_bank = load_sprite_bank(game, name, number)
+        sprite_palettes[number] = find_sprite_palette(sprite_bank)
+
+    if not save:
+        return sprite_palettes
+    sprite_palettes_fn = get_sprite_palettes_fn(game)
+    with open(sprite_palettes_fn, "w") as outfile:
+        json.dump({number: palette.to_dict() for number, palette in sprite_palettes.items()}, outfile)
+    logger.info(f"saved palettes of {len(sprite_palettes)} Pokémon to {sprite_palettes_fn}")
+    return sprite_palettes
+
+
+@lru_cache(maxsize=None)
+def load_sprite_palettes(game: str = POKEMON_GAME) -> Dict[int, SpritePalette]:
+    """Load the sprite palettes index for a game. If the index
+    has not been saved, it is built in memory instead."""
+    sprite_palettes_fn = get_sprite_palettes_fn(game)
+    if not os.path.isfile(sprite_palettes_fn):
+        return build_sprite_palettes(game, save=False)
+
+    with open(sprite_palettes_fn, "r") as infile:
+        data = json.load(infile)
+    logger.debug(f"loaded sprite palettes index {sprite_palettes_fn}")
+    return {int(number): SpritePalette.from_dict(palette) for number, palette in data.items()}
+
+
+def get_sprite_palette(number: int, game: str = POKEMON_GAME) -> SpritePalette:
+    """Retrieve the palettes of a Pokémon by its national number."""
+    return load_sprite_palettes(game)[int(number)]
+
+
+def build_sprite_index(game: str = POKEMON_GAME, save: bool = True) -> SpriteIndex:
+    """Fingerprint the normal and shiny sprites of every generation II
+    Pokémon, as they are placed in battle. Optionally, save the index for the game."""
+    fingerprints, names, sprite_types = [], [], []
+    for _, row in gen_2_dex().iterrows():
+        name, number = row.get("NAME"), int(row.get("NUMBER"))
+        sprite_bank = load_sprite_bank(game, name, number)
+        for sprite_type, img in [(SpriteType.NORMAL, sprite_bank.normal_img),
+                                 (SpriteType.SHINY, sprite_bank.shiny_img)]:
+            fingerprints.append(get_fingerprint(align_to_battle(img)))
+            names.append(name)
+            sprite_types.append(sprite_type)
+    sprite_index = SpriteIndex(np.stack(fingerprints), names, sprite_types)
+
+    if not save:
+        return sprite_index
+    sprite_index_fn = get_sprite_index_fn(game)
+    sprite_index.save(sprite_index_fn)
+    logger.info(f"saved {len(sprite_index)} sprite fingerprints to {sprite_index_fn}")
+    return sprite_index
+
+
+@lru_cache(maxsize=None)
+def load_sprite_index(game: str = POKEMON_GAME) -> SpriteIndex:
+    """Load the sprite fingerprint index for a game. If the index
+    has not been saved, it is built in memory instead."""
+    sprite_index_fn = get_sprite_index_fn(game)
+    if not os.path.isfile(sprite_index_fn):
+        return build_sprite_index(game, save=False)
+
+    sprite_index = SpriteIndex.load(sprite_index_fn)
+    logger.debug(f"loaded sprite fingerprint index {sprite_index_fn}")
+    return sprite_index
+
+
+def _get_uniform_mask(img: np.ndarray) -> np.ndarray:
+    """Build a boolean mask that is `True` where a pixel has
+    the same color as all 8 of its neighbors."""
+    padded = np.pad(img, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    height, width = img.shape[:2]
+    uniform = np.ones((height, width), dtype=bool)
+    for dy in range(3):
+        for dx in range(3):
+            uniform &= np.all(padded[dy:dy + height, dx:dx + width] == img, axis=-1)
+    return uniform
+
+
+if __name__ == "__main__":
+    import __init__  # noqa: F401
+    build_sprite_atlas()
+    build_sprite_pixels()
+    build_sprite_palettes()
+    build_sprite_index()
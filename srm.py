@@ -0,0 +1,151 @@
+"""Read the pack inventory straight from a Pokémon Crystal save file (.srm)."""
+
+import logging
+from typing import List, Tuple
+
+from helpers.assets import ASSETS
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+SAVE_DATA_START = 0x2009
+"""The start of the checksummed save data in the file."""
+
+SAVE_DATA_END = 0x2B83
+"""The end (exclusive) of the checksummed save data in the file."""
+
+SAVE_CHECKSUM = 0x2D0D
+"""The little-endian sum of the save data bytes."""
+
+BACKUP_DATA_START = 0x1209
+"""The start of the backup copy of the save data, used if the main copy is corrupt."""
+
+BACKUP_CHECKSUM = 0x1F0D
+"""The little-endian sum of the backup save data bytes."""
+
+TM_POCKET = 0x23E7
+"""The TM/HM pocket: a quantity byte for each of the TMs then each of the HMs."""
+
+ITEM_POCKET = 0x2420
+"""The Items pocket: count, (item, quantity) pairs, terminator."""
+
+KEY_ITEM_POCKET = 0x244A
+"""The Key Items pocket: count, items, terminator."""
+
+BALL_POCKET = 0x2465
+"""The Balls pocket: count, (item, quantity) pairs, terminator."""
+
+ITEM_POCKET_SIZE = 20
+KEY_ITEM_POCKET_SIZE = 25
+BALL_POCKET_SIZE = 12
+
+ITEM_NAMES = (
+    None, "MASTER BALL", "ULTRA BALL", "BRIGHTPOWDER", "GREAT BALL", "POKé BALL", "TOWN MAP", "BICYCLE",
+    "MOON STONE", "ANTIDOTE", "BURN HEAL", "ICE HEAL", "AWAKENING", "PARLYZ HEAL", "FULL RESTORE", "MAX POTION",
+    "HYPER POTION", "SUPER POTION", "POTION", "ESCAPE ROPE", "REPEL", "MAX ELIXER", "FIRE STONE", "THUNDERSTONE",
+    "WATER STONE", "TERU-SAMA", "HP UP", "PROTEIN", "IRON", "CARBOS", "LUCKY PUNCH", "CALCIUM",
+    "RARE CANDY", "X ACCURACY", "LEAF STONE", "METAL POWDER", "NUGGET", "POKé DOLL", "FULL HEAL", "REVIVE",
+    "MAX REVIVE", "GUARD SPEC.", "SUPER REPEL", "MAX REPEL", "DIRE HIT", "TERU-SAMA", "FRESH WATER", "SODA POP",
+    "LEMONADE", "X ATTACK", "TERU-SAMA", "X DEFEND", "X SPEED", "X SPECIAL", "COIN CASE", "ITEMFINDER",
+    "POKé FLUTE", "EXP.SHARE", "OLD ROD", "GOOD ROD", "SILVER LEAF", "SUPER ROD", "PP UP", "ETHER",
+    "MAX ETHER", "ELIXER", "RED SCALE", "SECRETPOTION", "S.S.TICKET", "MYSTERY EGG", "CLEAR BELL", "SILVER WING",
+    "MOOMOO MILK", "QUICK CLAW", "PSNCUREBERRY", "GOLD LEAF", "SOFT SAND", "SHARP BEAK", "PRZCUREBERRY", "BURNT BERRY",
+    "ICE BERRY", "POISON BARB", "KING'S ROCK", "BITTER BERRY", "MINT BERRY", "RED APRICORN", "TINYMUSHROOM", "BIG MUSHROOM",
+    "SILVERPOWDER", "BLU APRICORN", "TERU-SAMA", "AMULET COIN", "YLW APRICORN", "GRN APRICORN", "CLEANSE TAG", "MYSTIC WATER",
+    "TWISTEDSPOON", "WHT APRICORN", "BLACKBELT", "BLK APRICORN", "TERU-SAMA", "PNK APRICORN", "BLACKGLASSES", "SLOWPOKETAIL",
+    "PINK BOW", "STICK", "SMOKE BALL", "NEVERMELTICE", "MAGNET", "MIRACLEBERRY", "PEARL", "BIG PEARL",
+    "EVERSTONE", "SPELL TAG", "RAGECANDYBAR", "GS BALL", "BLUE CARD", "MIRACLE SEED", "THICK CLUB", "FOCUS BAND",
+    "TERU-SAMA", "ENERGYPOWDER", "ENERGY ROOT", "HEAL POWDER", "REVIVAL HERB", "HARD STONE", "LUCKY EGG", "CARD KEY",
+    "MACHINE PART", "EGG TICKET", "LOST ITEM", "STARDUST", "STAR PIECE", "BASEMENT KEY", "PASS", "TERU-SAMA",
+    "TERU-SAMA", "TERU-SAMA", "CHARCOAL", "BERRY JUICE", "SCOPE LENS", "TERU-SAMA", "TERU-SAMA", "METAL COAT",
+    "DRAGON FANG", "TERU-SAMA", "LEFTOVERS", "TERU-SAMA", "TERU-SAMA", "TERU-SAMA", "MYSTERYBERRY", "DRAGON SCALE",
+    "BERSERK GENE", "TERU-SAMA", "TERU-SAMA", "TERU-SAMA", "SACRED ASH", "HEAVY BALL", "FLOWER MAIL", "LEVEL BALL",
+    "LURE BALL", "FAST BALL", "TERU-SAMA", "LIGHT BALL", "FRIEND BALL", "MOON BALL", "LOVE BALL", "NORMAL BOX",
+    "GORGEOUS BOX", "SUN STONE", "POLKADOT BOW", "TERU-SAMA", "UP-GRADE", "BERRY", "GOLD BERRY", "SQUIRTBOTTLE",
+    "TERU-SAMA", "PARK BALL", "RAINBOW WING", "TERU-SAMA", "BRICK PIECE", "SURF MAIL", "LITEBLUEMAIL", "PORTRAITMAIL",
+    "LOVELY MAIL", "EON MAIL", "MORPH MAIL", "BLUESKY MAIL", "MUSIC MAIL", "MIRAGE MAIL", "TERU-SAMA",
+)
+"""Item names as shown in the pack, indexed by item id. `TERU-SAMA` are unused ids."""
+
+TM_NAMES = (
+    "DYNAMICPUNCH", "HEADBUTT", "CURSE", "ROLLOUT", "ROAR", "TOXIC", "ZAP CANNON", "ROCK SMASH", "PSYCH UP", "HIDDEN POWER",
+    "SUNNY DAY", "SWEET SCENT", "SNORE", "BLIZZARD", "HYPER BEAM", "ICY WIND", "PROTECT", "RAIN DANCE", "GIGA DRAIN", "ENDURE",
+    "FRUSTRATION", "SOLARBEAM", "IRON TAIL", "DRAGONBREATH", "THUNDER", "EARTHQUAKE", "RETURN", "DIG", "PSYCHIC", "SHADOW BALL",
+    "MUD-SLAP", "DOUBLE TEAM", "ICE PUNCH", "SWAGGER", "SLEEP TALK", "SLUDGE BOMB", "SANDSTORM", "FIRE BLAST", "SWIFT", "DEFENSE CURL",
+    "THUNDERPUNCH", "DREAM EATER", "DETECT", "REST", "ATTRACT", "THIEF", "STEEL WING", "FIRE PUNCH", "FURY CUTTER", "NIGHTMARE",
+)
+"""The moves taught by TM01 to TM50, as shown in the pack."""
+
+HM_NAMES = ("CUT", "FLY", "SURF", "STRENGTH", "FLASH", "WHIRLPOOL", "WATERFALL")
+"""The moves taught by HM01 to HM07, as shown in the pack."""
+
+
+def read_pack_pockets(srm_fn: str) -> Tuple[List[Tuple[str, int]], ...]:
+    """Read the Items, TM/HM, Key Items and Balls pockets from a save file.
+    Each pocket is a list of `(name, qty)`, named the way the pack screen
+    is read: lowercase without spaces. Key items and HMs have no quantity."""
+    data = read_save_data(ASSETS.read(srm_fn))
+    items = _read_pocket(data, ITEM_POCKET, ITEM_POCKET_SIZE, has_qty=True)
+    machines = _read_tm_pocket(data)
+    keyitems = _read_pocket(data, KEY_ITEM_POCKET, KEY_ITEM_POCKET_SIZE, has_qty=False)
+    balls = _read_pocket(data, BALL_POCKET, BALL_POCKET_SIZE, has_qty=True)
+    logger.debug(f"read pack from {srm_fn}: {len(items)} items, {len(machines)} TM/HM, "
+                 f"{len(keyitems)} key items, {len(balls)} balls")
+    return items, machines, keyitems, balls
+
+
+def read_save_data(save: bytes) -> bytes:
+    """Validate the save data against its checksum and return it, so that
+    offsets into it are file offsets minus `SAVE_DATA_START`. Falls back to
+    the backup copy when the main copy is corrupt, as the game does.
+    Raises `RuntimeError` if neither copy is valid."""
+    size = SAVE_DATA_END - SAVE_DATA_START
+    for start, checksum_pos in [(SAVE_DATA_START, SAVE_CHECKSUM), (BACKUP_DATA_START, BACKUP_CHECKSUM)]:
+        data = save[start:start + size]
+        checksum = int.from_bytes(save[checksum_pos:checksum_pos + 2], "little")
+        if len(data) == size and get_checksum(data) == checksum:
+            return data
+        logger.warning(f"save data at {start:#x} does not match its checksum {checksum:#x}")
+    raise RuntimeError("Save file is corrupt, neither copy of the save data matches its checksum.")
+
+
+def get_checksum(data: bytes) -> int:
+    """The 16-bit sum of the save data bytes."""
+    return sum(data) & 0xFFFF
+
+
+def get_item_name(item_id: int) -> str:
+    """The name of an item the way the pack screen is read."""
+    if not 0 < item_id < len(ITEM_NAMES):
+        raise RuntimeError(f"Unknown item id: {item_id:#x}")
+    return _as_pack_name(ITEM_NAMES[item_id])
+
+
+def _read_pocket(data: bytes, pocket: int, max_items: int, has_qty: bool) -> List[Tuple[str, int]]:
+    """Read a pocket listing its items, with quantities or not."""
+    pos = pocket - SAVE_DATA_START
+    count = data[pos]
+    if count > max_items:
+        raise RuntimeError(f"Pocket at {pocket:#x} holds {count} items, at most {max_items} fit.")
+    entry_size = 2 if has_qty else 1
+    inventory = []
+    for i in range(count):
+        entry = pos + 1 + i*entry_size
+        qty = data[entry + 1] if has_qty else None
+        inventory.append((get_item_name(data[entry]), qty))
+    return inventory
+
+
+def _read_tm_pocket(data: bytes) -> List[Tuple[str, int]]:
+    """Read the TM/HM pocket. TMs have quantities, HMs do not."""
+    pos = TM_POCKET - SAVE_DATA_START
+    tm_qtys = data[pos:pos + len(TM_NAMES)]
+    hm_qtys = data[pos + len(TM_NAMES):pos + len(TM_NAMES) + len(HM_NAMES)]
+    machines = [(_as_pack_name(name), qty) for name, qty in zip(TM_NAMES, tm_qtys) if qty > 0]
+    machines += [(_as_pack_name(name), None) for name, qty in zip(HM_NAMES, hm_qtys) if qty > 0]
+    return machines
+
+
+def _as_pack_name(name: str) -> str:
+    """Name an item the way the pack screen is read, e.g., `POKé BALL` -> `pokeball`."""
+    return name.lower().replace("é", "e").replace(" ", "")
@@ -2,7 +2,9 @@ import glob
 import json
 import os
 import shutil
-from typing import Generator
+import socket
+import threading
+from typing import Callable, Dict, Generator, List, Union
 
 import pytest
 import yaml
@@ -46,6 +48,59 @@ def get_event_as_str(
     yield event
 
 
+@pytest.fixture
+def network_cmd_stand_in() -> Generator["NetworkCommandStandIn", None, None]:
+    """Run a local stand-in for RetroArch's network command interface."""
+    stand_in = NetworkCommandStandIn()
+    yield stand_in
+    stand_in.close()
+
+
+class NetworkCommandStandIn():
+    """Listen for RetroArch network commands on a free local UDP port.
+    Records every command received and answers the ones in `replies`,
+    either with a canned string or the result of calling it with the args."""
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.1)
+        self.port = self.sock.getsockname()[1]
+        self.replies: Dict[str, Union[str, Callable[..., str]]] = dict()
+        self.received: List[str] = []
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def wait_for_commands(self, n: int, timeout: float = 1) -> List[str]:
+        """Wait until at least `n` commands have been received."""
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.received) >= n, timeout=timeout)
+            return list(self.received)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.sock.close()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                data, addr = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            msg = data.decode().strip()
+            with self._cond:
+                self.received.append(msg)
+                self._cond.notify_all()
+            command, *args = msg.split(" ")
+            reply = self.replies.get(command)
+            if callable(reply):
+                reply = reply(*args)
+            if reply is not None:
+                self.sock.sendto(f"{reply}\n".encode(), addr)
+
+
 def get_json_files(dirname: str, matching: list[str] = None) -> list[str]:
     """Obtain all json files or a subset of the json files
     matching the provided string."""
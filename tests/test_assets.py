@@ -0,0 +1,95 @@
+import os
+from zipfile import ZipFile
+
+import numpy as np
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "assets"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from config import PROJ_ROOT_PATH  # noqa: E402
+from helpers.assets import ASSETS  # noqa: E402
+from helpers.opencv_util import cv2  # noqa: E402
+
+ASSETS_PATH = os.path.join(PROJ_ROOT_PATH, "assets")
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["glob", "success"])
+)
+def test_01_glob(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    asset_dir = os.path.join(ASSETS_PATH, *get_event_as_dict["input"]["dir"].split("/"))
+    pattern: str = get_event_as_dict["input"]["pattern"]
+    expected_output: int = get_event_as_dict["expected_output"]
+
+    paths = ASSETS.glob(os.path.join(asset_dir, pattern))
+    assert (len(paths) == expected_output)
+    for path in paths:
+        assert (os.path.dirname(path) == asset_dir)
+        assert ("__MACOSX" not in path)
+        assert ASSETS.exists(path)
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read", "success"])
+)
+def test_02_read(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    parts = get_event_as_dict["input"]["path"].split("/")
+    path = os.path.join(ASSETS_PATH, *parts)
+
+    # assets live in <dir>.zip as members under <dir>/
+    zip_fn = os.path.join(ASSETS_PATH, parts[0], f"{parts[1]}.zip")
+    with ZipFile(zip_fn, "r") as zip:
+        expected_data = zip.read("/".join(parts[1:]))
+    assert (ASSETS.read(path) == expected_data)
+
+    img = ASSETS.imread(path)
+    expected_img = cv2.imdecode(np.frombuffer(expected_data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert (img == expected_img).all()
+    # decoded once, then served read-only from the cache
+    assert (ASSETS.imread(path) is img)
+    assert (not img.flags.writeable)
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read", "failure"])
+)
+def test_03_read_missing(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    path = os.path.join(ASSETS_PATH, *get_event_as_dict["input"]["path"].split("/"))
+
+    assert (not ASSETS.exists(path))
+    assert (ASSETS.imread(path) is None)
+    with pytest.raises(FileNotFoundError):
+        ASSETS.read(path)
@@ -1,9 +1,13 @@
 import os
+import subprocess
+import sys
+import time
 
 import pytest
 
 from config import RETROARCH_CFG
 from helpers.log import get_logger
+from helpers.platform import Platform
 from image import cv2, compare_img_pixels, get_latest_png_fn
 
 from conftest import get_json_files, print_section_break
@@ -25,11 +29,64 @@ logger = get_logger(f"test_{MODULE}")
 #                           --- Module Imports ---                            #
 # ----------------------------------------------------------------------------#
 from emulator import (  # noqa: E402
+    READY_LOG_MARKER,
     Emulator,
+    ToggleState,
 )
 
 EMULATOR = Emulator()
 
+CHILD_SCRIPT = """
+import signal, sys, time
+log_fn, marker, ignore_term, log_after, exit_after, exit_code = sys.argv[1:]
+if ignore_term == "true":
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+if log_after != "null":
+    time.sleep(float(log_after))
+    with open(log_fn, "w") as outfile:
+        outfile.write(marker)
+time.sleep(float(exit_after))
+sys.exit(int(exit_code))
+"""
+"""A throwaway child process standing in for the emulator: it logs the ready
+marker after `log_after` seconds, then exits `exit_after` seconds later."""
+
+ERRORS = {
+    "RuntimeError": RuntimeError,
+    "TimeoutError": TimeoutError,
+}
+
+
+class ChildEmulator(Emulator):
+    """Emulator whose process is a throwaway Python child process."""
+    def launch_child(self, log_fn: str, child: dict) -> subprocess.Popen:
+        """Launch the child process of the event, logging to `log_fn`."""
+        args = [log_fn,
+                READY_LOG_MARKER,
+                "true" if child["ignore_term"] else "false",
+                "null" if child["log_after"] is None else str(child["log_after"]),
+                str(child["exit_after"]),
+                str(child["exit_code"])]
+        self.process = subprocess.Popen([sys.executable, "-c", CHILD_SCRIPT, *args])
+        return self.process
+
+    def stop_child(self):
+        """Clean up a child process the test left running."""
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+
+class RecordingController():
+    """Stand in for the emulator controller, recording every call with its arguments."""
+    def __init__(self, calls: list):
+        self.calls = calls
+
+    def __getattr__(self, name: str):
+        def record(*args):
+            self.calls.append([name, *args])
+        return record
+
 
 # ----------------------------------------------------------------------------#
 #                                --- TESTS ---                                #
@@ -59,6 +116,139 @@ def test_01_emulator(get_event_as_dict):
     EMULATOR.kill_process()
 
 
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["precise_input", "success"])
+)
+def test_02_precise_input(get_event_as_dict, monkeypatch):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    emulator, calls = create_recording_emulator(get_event_as_dict["input"], monkeypatch)
+    run_precise_steps(emulator, get_event_as_dict["input"]["steps"])
+    assert (calls == expected_output["calls"])
+    assert (emulator.state.fast_fwd == expected_output["fast_fwd"])
+    assert (emulator.state.pause == expected_output["pause"])
+    assert (emulator.precise_session is None)
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["precise_input", "failure"])
+)
+def test_03_precise_input_failure(get_event_as_dict, monkeypatch):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    emulator, calls = create_recording_emulator(get_event_as_dict["input"], monkeypatch)
+    with pytest.raises(RuntimeError):
+        run_precise_steps(emulator, get_event_as_dict["input"]["steps"])
+    # the original emulator state is restored even though the session failed
+    assert (calls == expected_output["calls"])
+    assert (emulator.state.fast_fwd == expected_output["fast_fwd"])
+    assert (emulator.state.pause == expected_output["pause"])
+    assert (emulator.precise_session is None)
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["wait_until_ready", "success"])
+)
+def test_04_wait_until_ready(get_event_as_dict, monkeypatch, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    child: dict = get_event_as_dict["input"]["child"]
+    timeout: float = get_event_as_dict["input"]["timeout"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    emulator, log_fn = create_child_emulator(get_event_as_dict["input"], monkeypatch, str(tmp_path))
+    try:
+        launched_at = time.time()
+        emulator.launch_child(log_fn, child)
+        emulator.wait_until_ready(emulator._get_ready_probes(log_fn), launched_at, timeout)
+        assert (time.time() - launched_at >= expected_output["min_elapsed"])
+        assert (emulator.is_running())
+    finally:
+        emulator.stop_child()
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["wait_until_ready", "failure"])
+)
+def test_05_wait_until_ready_failure(get_event_as_dict, monkeypatch, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    child: dict = get_event_as_dict["input"]["child"]
+    timeout: float = get_event_as_dict["input"]["timeout"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    emulator, log_fn = create_child_emulator(get_event_as_dict["input"], monkeypatch, str(tmp_path))
+    try:
+        launched_at = time.time()
+        emulator.launch_child(log_fn, child)
+        with pytest.raises(ERRORS[expected_output["error"]], match=expected_output["match"]):
+            emulator.wait_until_ready(emulator._get_ready_probes(log_fn), launched_at, timeout)
+    finally:
+        emulator.stop_child()
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["stop_process", "success"])
+)
+def test_06_stop_process(get_event_as_dict, monkeypatch, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    child: dict = get_event_as_dict["input"]["child"]
+    timeout: float = get_event_as_dict["input"]["timeout"]
+    wait_for_exit: bool = get_event_as_dict["input"]["wait_for_exit"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    emulator, log_fn = create_child_emulator(get_event_as_dict["input"], monkeypatch, str(tmp_path))
+    try:
+        launched_at = time.time()
+        process = emulator.launch_child(log_fn, child)
+        # the child ignores signals only once it is ready
+        emulator.wait_until_ready(emulator._get_ready_probes(log_fn), launched_at, timeout)
+        emulator._stop_process(timeout, wait_for_exit)
+        assert (emulator.process is None)
+        assert (process.poll() is not None)
+        if not Platform.is_windows():
+            # processes are stopped by signals, i.e., negative return codes, except on Windows
+            assert (process.returncode == expected_output["returncode"])
+    finally:
+        emulator.stop_child()
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["ready_probes", "success"])
+)
+def test_07_ready_probes(get_event_as_dict, monkeypatch, network_cmd_stand_in):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    other_instance: bool = get_event_as_dict["input"]["other_instance"]
+    log_fn: str = get_event_as_dict["input"]["log_fn"]
+    expected_output: list = get_event_as_dict["expected_output"]
+
+    monkeypatch.setattr(RETROARCH_CFG, "network_cmd_enable", True)
+    monkeypatch.setattr(RETROARCH_CFG, "network_cmd_port", network_cmd_stand_in.port)
+    if other_instance:
+        network_cmd_stand_in.replies["VERSION"] = "1.17.0"
+    probes = Emulator()._get_ready_probes(log_fn)
+    # the window probe is only available on Windows
+    assert ([probe.__name__ for probe in probes if probe.__name__ != "window_present"] == expected_output)
+
+
 # ----------------------------------------------------------------------------#
 #                               --- HELPERS ---                               #
 # ----------------------------------------------------------------------------#
@@ -169,3 +359,45 @@ def _assert_emulator_navigation(
     finally:
         # clean up
         os.remove(screenshot)
+
+
+def create_recording_emulator(event_input: dict, monkeypatch) -> tuple:
+    """Create an emulator in the event's state that records its
+    controller calls and universal delays, in order, without waiting."""
+    calls = []
+    monkeypatch.setattr("emulator.delay", lambda sec, universal=False: calls.append(["delay", sec, universal]))
+    emulator = Emulator()
+    emulator.cont = RecordingController(calls)
+    emulator.state.fast_fwd = ToggleState(event_input["fast_fwd"])
+    emulator.state.pause = ToggleState(event_input["pause"])
+    return emulator, calls
+
+
+def run_precise_steps(emulator: Emulator, steps: list):
+    """Run the steps of an event: open a (nested) session, queue or call a
+    precise action, flush the session or raise an error in the session."""
+    for step, *args in steps:
+        if step == "session":
+            with emulator.precise_input():
+                run_precise_steps(emulator, args[0])
+        elif step == "queue":
+            action, presses = args
+            emulator.precise_session.queue(getattr(emulator, action), presses=presses)
+        elif step == "call":
+            action, presses = args
+            getattr(emulator, action)(presses=presses)
+        elif step == "flush":
+            emulator.precise_session.flush()
+        elif step == "raise":
+            raise RuntimeError("precise action failed")
+
+
+def create_child_emulator(event_input: dict, monkeypatch, tmp_dir: str) -> tuple:
+    """Create an emulator for a throwaway child process, probed for readiness
+    by the log file of its launch only. With `other_log`, the log file of
+    another instance next to it already logged the ready marker."""
+    monkeypatch.setattr(RETROARCH_CFG, "network_cmd_enable", False)
+    if event_input["other_log"]:
+        with open(os.path.join(tmp_dir, "retroarch_other.log"), "w") as outfile:
+            outfile.write(READY_LOG_MARKER)
+    return ChildEmulator(), os.path.join(tmp_dir, "retroarch_launch.log")
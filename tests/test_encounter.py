@@ -0,0 +1,158 @@
+import os
+import shutil
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH, TEST_IMG_DIR
+
+MODULE = "encounter"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from encounter import HuntMode, RandomEncounter, SpriteSource, StaticEncounter  # noqa: E402
+from image import SpriteClassifier  # noqa: E402
+from pokemon import Pokemon, SpriteType  # noqa: E402
+from timing_profile import TimingProfile  # noqa: E402
+
+
+class RecordingEmulator():
+    """Stand in for the emulator, recording the calls that move the game along."""
+    def __init__(self):
+        self.calls = []
+
+    def reset(self):
+        self.calls.append(["reset"])
+
+    def continue_pokemon_game(self, press_gap_scale: float = 1):
+        self.calls.append(["continue_pokemon_game", press_gap_scale])
+
+    def load_state(self):
+        self.calls.append(["load_state"])
+
+    def capture_state(self):
+        self.calls.append(["capture_state"])
+
+
+class ScreenshotEmulator():
+    """Stand in for the emulator, taking the next of a series of test
+    images as every screenshot and recording the buttons held and released."""
+    def __init__(self, images: list, screenshot_dir: str):
+        self.images = list(images)
+        self.screenshot_dir = screenshot_dir
+        self.cont = self
+        self.inputs = []
+
+    def reset(self):
+        pass
+
+    def continue_pokemon_game(self, press_gap_scale: float = 1):
+        pass
+
+    def hold(self, button: str):
+        self.inputs.append(["hold", button])
+
+    def release(self, button: str):
+        self.inputs.append(["release", button])
+
+    def capture_screenshot(self) -> str:
+        image = self.images.pop(0)
+        screenshot_fn = os.path.join(self.screenshot_dir, f"{len(self.images)}_{image}")
+        shutil.copy(os.path.join(TEST_IMG_DIR, image), screenshot_fn)
+        return screenshot_fn
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["checkpoint", "success"])
+)
+def test_01_checkpoint(get_event_as_dict, monkeypatch):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    steps: list = get_event_as_dict["input"]["steps"]
+    frames: int = get_event_as_dict["input"]["frames"]
+    continue_scale: float = get_event_as_dict["input"]["continue_scale"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    delays = []
+    monkeypatch.setattr("encounter.random.randint", lambda a, b: frames)
+    monkeypatch.setattr("encounter.delay", lambda sec, universal=False: delays.append([sec, universal]))
+    emulator = RecordingEmulator()
+    encounter = StaticEncounter(emulator,
+                                Pokemon("SNORLAX"),
+                                classifier=SpriteClassifier.COLOR,
+                                source=SpriteSource.IMAGE,
+                                mode=HuntMode.CHECKPOINT,
+                                profile=TimingProfile("test", continue_scale=continue_scale))
+    for step in steps:
+        if step == "attempt":
+            encounter._start_from_checkpoint()
+        elif step == "restart":
+            encounter.restart()
+    assert (emulator.calls == expected_output["calls"])
+    # the checkpoint is saved once per emulator, not on every attempt
+    assert (emulator.calls.count(["capture_state"]) == expected_output["n_checkpoints"])
+    # the frames let pass follow the speed of the core like any relative delay
+    assert (delays == [[pytest.approx(sec), universal] for sec, universal in expected_output["delays"]])
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["random", "success"])
+)
+def test_02_random(get_event_as_dict, monkeypatch, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    run_random(get_event_as_dict, monkeypatch, str(tmp_path))
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["random", "failure"])
+)
+def test_03_random_failure(get_event_as_dict, monkeypatch, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    run_random(get_event_as_dict, monkeypatch, str(tmp_path))
+
+
+# ----------------------------------------------------------------------------#
+#                               --- HELPERS ---                               #
+# ----------------------------------------------------------------------------#
+def run_random(event: dict, monkeypatch, tmp_dir: str):
+    """Hunt random encounters with the screenshots of the event, asserting
+    the walks, the Pokémon identified by the fingerprint index of all
+    sprites and that only the screenshot of a shiny is kept."""
+    images: list = event["input"]["images"]
+    max_walks: int = event["input"]["max_walks"]
+    expected_output: dict = event["expected_output"]
+
+    monkeypatch.setattr("encounter.delay", lambda sec, universal=False: None)
+    emulator = ScreenshotEmulator(images, tmp_dir)
+    encounter = RandomEncounter(emulator, "Route29", max_walks=max_walks)
+    assert (encounter.find_shiny() == (expected_output["sprite_type"] == SpriteType.SHINY))
+    assert (emulator.inputs == expected_output["inputs"])
+    if expected_output["pokemon_name"] is None:
+        assert (encounter.pokemon is None)
+    else:
+        assert (encounter.pokemon.number == Pokemon(expected_output["pokemon_name"]).number)
+    assert (len(os.listdir(tmp_dir)) == expected_output["n_screenshots_kept"])
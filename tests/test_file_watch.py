@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "file_watch"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from helpers.file_watch import FileWatcher  # noqa: E402
+from helpers.opencv_util import cv2  # noqa: E402
+
+
+def write_png(png_fn: str):
+    """Write a small all white PNG."""
+    cv2.imwrite(png_fn, np.full((16, 16, 3), 255, dtype=np.uint8))
+
+
+def write_bytes(fn: str, size: int = 1024):
+    """Write a file of the same size and contents every time."""
+    with open(fn, "wb") as outfile:
+        outfile.write(bytes(size))
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["wait_for_file", "success"])
+)
+def test_01_wait_for_file(get_event_as_dict, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    use_inotify: bool = get_event_as_dict["input"]["use_inotify"]
+    n_existing: int = get_event_as_dict["input"]["n_existing"]
+
+    existing_fns = [os.path.join(tmp_path, f"existing_{i}.png") for i in range(n_existing)]
+    for existing_fn in existing_fns:
+        write_png(existing_fn)
+    watcher = FileWatcher(str(tmp_path), ext=".png", use_inotify=use_inotify)
+    try:
+        watcher.start()
+        latest_fn, _ = watcher.latest()
+        assert (latest_fn in existing_fns if n_existing > 0 else latest_fn is None)
+
+        # the screenshot is written while waiting
+        screenshot_fn = os.path.join(tmp_path, "screenshot.png")
+        taken_after = time.time()
+        threading.Timer(0.1, write_png, args=(screenshot_fn,)).start()
+        assert (watcher.wait_for_file(after=taken_after, timeout=2) == screenshot_fn)
+        assert (watcher.latest()[0] == screenshot_fn)
+        # already written, so returns right away
+        assert (watcher.wait_for_file(after=taken_after, timeout=0) == screenshot_fn)
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["wait_for_file", "failure"])
+)
+def test_02_wait_for_file_timeout(get_event_as_dict, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    use_inotify: bool = get_event_as_dict["input"]["use_inotify"]
+    timeout: float = get_event_as_dict["input"]["timeout"]
+
+    write_png(os.path.join(tmp_path, "existing.png"))
+    watcher = FileWatcher(str(tmp_path), ext=".png", use_inotify=use_inotify)
+    try:
+        # files written before the wait began do not count
+        with pytest.raises(TimeoutError):
+            watcher.wait_for_file(after=time.time(), timeout=timeout)
+        # neither do other file types
+        taken_after = time.time()
+        threading.Timer(0.05, write_png, args=(os.path.join(tmp_path, "screenshot.jpg"),)).start()
+        with pytest.raises(TimeoutError):
+            watcher.wait_for_file(after=taken_after, timeout=timeout)
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["overwrite", "success"])
+)
+def test_03_wait_for_overwritten_file(get_event_as_dict, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    use_inotify: bool = get_event_as_dict["input"]["use_inotify"]
+    ext: str = get_event_as_dict["input"]["ext"]
+    existing: bool = get_event_as_dict["input"]["existing"]
+    n_writes: int = get_event_as_dict["input"]["n_writes"]
+
+    # e.g., a savestate written to the same slot on every attempt
+    fn = os.path.join(tmp_path, f"game{ext}")
+    if existing:
+        write_bytes(fn)
+    watcher = FileWatcher(str(tmp_path), ext=ext, use_inotify=use_inotify)
+    try:
+        watcher.start()
+        for _ in range(n_writes):
+            written_after = time.time()
+            threading.Timer(0.1, write_bytes, args=(fn,)).start()
+            assert (watcher.wait_for_file(after=written_after, timeout=2) == fn)
+    finally:
+        watcher.stop()
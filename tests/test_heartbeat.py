@@ -0,0 +1,116 @@
+import os
+import time
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "heartbeat"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from heartbeat import Watchdog  # noqa: E402
+from helpers.file_watch import get_file_watcher  # noqa: E402
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["check", "success"])
+)
+def test_01_check(get_event_as_dict, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    run_check(get_event_as_dict, str(tmp_path))
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["check", "failure"])
+)
+def test_02_check_failure(get_event_as_dict, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    run_check(get_event_as_dict, str(tmp_path))
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["watch", "failure"])
+)
+def test_03_watch_failure(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    attempt_deadline: float = get_event_as_dict["input"]["attempt_deadline"]
+    check_interval: float = get_event_as_dict["input"]["check_interval"]
+    expected_output: str = get_event_as_dict["expected_output"]
+
+    failures = []
+    watchdog = Watchdog(is_alive=lambda: True,
+                        on_failure=failures.append,
+                        attempt_deadline=attempt_deadline,
+                        check_interval=check_interval)
+    try:
+        watchdog.start()
+        watchdog.attempt_started()
+        time.sleep(attempt_deadline + 10*check_interval)
+        # reported once even though every later check fails too
+        assert (watchdog.failure == expected_output)
+        assert (failures == [expected_output])
+
+        watchdog.reset()
+        assert (watchdog.failure is None)
+        watchdog.attempt_started()
+        watchdog.attempt_finished()
+        time.sleep(5*check_interval)
+        assert (watchdog.failure is None)
+        assert (failures == [expected_output])
+    finally:
+        watchdog.stop()
+
+
+def run_check(event: dict, screenshot_dir: str):
+    """Check the heartbeats of an attempt that started
+    and took its last screenshot some seconds ago."""
+    alive: bool = event["input"]["alive"]
+    attempt_age: float = event["input"]["attempt_age"]
+    screenshot_age: float = event["input"]["screenshot_age"]
+    expected_output: str = event["expected_output"]
+
+    watchdog = Watchdog(is_alive=lambda: alive,
+                        attempt_deadline=event["input"]["attempt_deadline"],
+                        screenshot_dir=screenshot_dir,
+                        screenshot_timeout=event["input"]["screenshot_timeout"])
+    watcher = get_file_watcher(screenshot_dir, ".png")
+    try:
+        watcher.start()
+        if attempt_age is not None:
+            watchdog.attempt_started()
+            watchdog._attempt_started -= attempt_age
+        if screenshot_age is not None:
+            written_after = time.time() - screenshot_age
+            with open(os.path.join(screenshot_dir, "screenshot.png"), "wb") as outfile:
+                outfile.write(b"\x89PNG")
+            watcher.wait_for_file(after=written_after, timeout=2)
+        assert (watchdog.check() == expected_output)
+    finally:
+        watcher.stop()
@@ -25,6 +25,7 @@ logger = get_logger(f"test_{MODULE}")
 from image import (  # noqa: E402
     cv2,
     MenuType,
+    SpriteClassifier,
     compare_img_pixels,
     crop_name_in_battle,
     crop_pokemon_in_battle,
@@ -32,9 +33,13 @@ from image import (  # noqa: E402
     determine_menu,
     determine_name,
     determine_pack_items,
+    determine_pokemon,
     determine_sprite_type,
     get_latest_png_fn,
+    get_menu_classifier,
+    is_battle,
 )
+from config import ASSETS  # noqa: E402
 from dex import gen_2_dex  # noqa: E402
 from pokemon import Pokemon, SpriteType  # noqa: E402
 
@@ -52,9 +57,9 @@ def test_00_verify_sprite_images_exist():
         pokemon = Pokemon(name)
         normal_fn = pokemon.get_normal_img_fn()
         shiny_fn = pokemon.get_shiny_img_fn()
-        assert os.path.exists(normal_fn)
+        assert ASSETS.exists(normal_fn)
         logger.debug(f"{normal_fn} exists")
-        assert os.path.exists(shiny_fn)
+        assert ASSETS.exists(shiny_fn)
         logger.debug(f"{shiny_fn} exists")
 
 
@@ -203,4 +208,93 @@ def test_09_get_latest_png_fn(get_event_as_dict):
     logger.info(f"Test Description: {get_event_as_dict['description']}")
     
     screenshot_fn = get_latest_png_fn(TEST_IMG_DIR)
-    assert os.path.exists(screenshot_fn)
\ No newline at end of file
+    assert os.path.exists(screenshot_fn)
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["determine_menu"])
+)
+def test_10_menu_classifier(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    menu_img_fn: str = os.path.join(TEST_IMG_DIR, get_event_as_dict["input"]["image"])
+    expected_output = MenuType(get_event_as_dict["expected_output"])
+
+    menu_classifier = get_menu_classifier()
+    assert get_menu_classifier() is menu_classifier
+
+    menu, diffs = menu_classifier.classify(cv2.imread(menu_img_fn))
+    assert menu == expected_output
+    assert set(diffs) == set(MenuType)
+    assert diffs[menu] == min(diffs.values())
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file",
+    get_json_files(MODULE_EVENTS_DIR, ["determine_sprite_type_from_battle"]),
+)
+def test_11_determine_sprite_type_from_battle_pixels(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']} (discriminative pixels)")
+    battle_img_fn: str = os.path.join(TEST_IMG_DIR, get_event_as_dict["input"]["image"])
+    pokemon = Pokemon(get_event_as_dict["input"]["pokemon_name"])
+    expected_output = SpriteType(get_event_as_dict["expected_output"])
+
+    sprite_img = crop_pokemon_in_battle(battle_img_fn)
+    sprite_type = determine_sprite_type(pokemon, img=sprite_img, classifier=SpriteClassifier.PIXELS)
+    assert sprite_type == expected_output
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file",
+    get_json_files(MODULE_EVENTS_DIR, ["determine_sprite_type_from_battle"]),
+)
+def test_12_determine_sprite_type_from_battle_palette(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']} (palette)")
+    battle_img_fn: str = os.path.join(TEST_IMG_DIR, get_event_as_dict["input"]["image"])
+    pokemon = Pokemon(get_event_as_dict["input"]["pokemon_name"])
+    expected_output = SpriteType(get_event_as_dict["expected_output"])
+
+    sprite_img = crop_pokemon_in_battle(battle_img_fn)
+    sprite_type = determine_sprite_type(pokemon, img=sprite_img, classifier=SpriteClassifier.PALETTE)
+    assert sprite_type == expected_output
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file",
+    get_json_files(MODULE_EVENTS_DIR, ["determine_sprite_type_from_battle"]),
+)
+def test_13_determine_pokemon(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']} (species unknown in advance)")
+    battle_img_fn: str = os.path.join(TEST_IMG_DIR, get_event_as_dict["input"]["image"])
+    expected_pokemon = Pokemon(get_event_as_dict["input"]["pokemon_name"])
+    expected_output = SpriteType(get_event_as_dict["expected_output"])
+
+    sprite_img = crop_pokemon_in_battle(battle_img_fn)
+    name, sprite_type = determine_pokemon(sprite_img)
+    assert Pokemon(name).number == expected_pokemon.number
+    assert sprite_type == expected_output
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["is_battle"])
+)
+def test_14_is_battle(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    img_fn: str = os.path.join(TEST_IMG_DIR, get_event_as_dict["input"]["image"])
+    expected_output: bool = get_event_as_dict["expected_output"]
+
+    assert is_battle(img_fn) == expected_output
@@ -0,0 +1,105 @@
+import os
+import time
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "macro"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from macro import PRESS_GAP, MacroExecutor, compile_sequence  # noqa: E402
+
+
+class RecordingController():
+    """Record when buttons are held and released instead of pressing keys."""
+    def __init__(self):
+        self.inputs = []
+
+    def hold(self, button: str):
+        self.inputs.append((time.perf_counter(), True, button))
+
+    def release(self, button: str):
+        self.inputs.append((time.perf_counter(), False, button))
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["compile_sequence", "success"])
+)
+def test_01_compile_sequence(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    sequence: str = get_event_as_dict["input"]["sequence"]
+    settle: float = get_event_as_dict["input"]["settle"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    macro = compile_sequence(sequence, settle=settle)
+    assert ([press.button for press in macro.presses] == expected_output["buttons"])
+    assert (macro.duration == pytest.approx(expected_output["duration"]))
+    for i, press in enumerate(macro.presses):
+        assert (press.press_at == pytest.approx(i*PRESS_GAP))
+        assert (press.press_at < press.release_at < press.press_at + PRESS_GAP)
+    # compiled once
+    assert (compile_sequence(sequence, settle=settle) is macro)
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["compile_sequence", "failure"])
+)
+def test_02_compile_sequence_unknown(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    sequence: str = get_event_as_dict["input"]["sequence"]
+
+    with pytest.raises(RuntimeError):
+        compile_sequence(sequence)
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["run", "success"])
+)
+def test_03_run(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    sequence: str = get_event_as_dict["input"]["sequence"]
+    settle: float = get_event_as_dict["input"]["settle"]
+    factor: float = get_event_as_dict["input"]["factor"]
+    max_jitter: float = get_event_as_dict["expected_output"]["max_jitter"]
+
+    macro = compile_sequence(sequence, settle=settle)
+    controller = RecordingController()
+    report = MacroExecutor(controller, factor=lambda: factor).run(macro)
+
+    # every press is released before the next one, in sequence order
+    assert ([(is_press, button) for _, is_press, button in controller.inputs] ==
+            [(is_press, button) for _, is_press, button in macro.events])
+    assert (all(controller.inputs[i][1] != controller.inputs[i + 1][1] for i in range(len(controller.inputs) - 1)))
+    assert (len(report.lateness) == len(macro.events))
+    assert (0 <= report.max_jitter < max_jitter)
+    assert (report.elapsed >= macro.duration*factor)
+    assert (report.planned == pytest.approx(macro.duration*factor))
+    logger.info(f"{report}")
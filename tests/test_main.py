@@ -0,0 +1,136 @@
+import os
+import queue
+import signal
+
+import pytest
+
+from config import RETROARCH_CFG
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "main"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from main import run  # noqa: E402
+from pokemon import Pokemon  # noqa: E402
+
+ERRORS = {
+    "timeout": TimeoutError("No screenshot within 5s"),
+    "connection": ConnectionError("Network command refused"),
+    "runtime": RuntimeError("Unknown character in sequence"),
+}
+"""The errors an attempt of a stand-in encounter raises, by name."""
+
+
+class StubEmulator():
+    """Stand in for an emulator not launched as a child process."""
+    def __init__(self):
+        self.process = None
+        self.n_launches = 0
+
+    def launch_game(self):
+        self.n_launches += 1
+
+    def is_running(self) -> bool:
+        return False
+
+    def kill_process(self):
+        pass
+
+
+class StubEncounter():
+    """Stand in for an encounter, each attempt finding no shiny or raising an error."""
+    def __init__(self, outcomes: list):
+        self.pokemon = Pokemon("SNORLAX")
+        self.save_name = "Snorlax"
+        self.sprite_reader = None
+        self.outcomes = list(outcomes)
+        self.n_restarts = 0
+
+    def restart(self):
+        self.n_restarts += 1
+
+    def find_shiny(self) -> bool:
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 0 else False
+        if outcome in ERRORS:
+            raise ERRORS[outcome]
+        return outcome
+
+
+@pytest.fixture
+def stub_hunt(monkeypatch, tmp_path):
+    """Run hunts without saves, notifications or a speed estimator."""
+    monkeypatch.setattr("main.copy_native_save", lambda **kwargs: (None, None))
+    monkeypatch.setattr("main.cleanup_save_dir", lambda **kwargs: None)
+    monkeypatch.setattr("main.send_notification", lambda *args, **kwargs: None)
+    monkeypatch.setattr("main.get_speed_estimator", lambda scaling: None)
+    monkeypatch.setattr(RETROARCH_CFG, "screenshot_dir", str(tmp_path))
+    handlers = {signalnum: signal.getsignal(signalnum) for signalnum in (signal.SIGINT, signal.SIGTERM)}
+    yield
+    # run() registers its own signal handlers
+    for signalnum, handler in handlers.items():
+        signal.signal(signalnum, handler)
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["run", "success"])
+)
+def test_01_run_recovers(get_event_as_dict, stub_hunt):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    outcomes: list = get_event_as_dict["input"]["outcomes"]
+    max_attempts: int = get_event_as_dict["input"]["max_attempts"]
+    max_recoveries: int = get_event_as_dict["input"]["max_recoveries"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    emulator = StubEmulator()
+    encounter = StubEncounter(outcomes)
+    progress = queue.Queue()
+    with pytest.raises(SystemExit):
+        run(emulator,
+            encounter,
+            max_attempts=max_attempts,
+            send_email=False,
+            queue=progress,
+            max_recoveries=max_recoveries)
+    assert (progress.get_nowait() == expected_output["progress"])
+    assert (encounter.n_restarts == expected_output["n_restarts"])
+    assert (emulator.n_launches == expected_output["n_launches"])
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["run", "failure"])
+)
+def test_02_run_failure(get_event_as_dict, stub_hunt):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    outcomes: list = get_event_as_dict["input"]["outcomes"]
+    max_recoveries: int = get_event_as_dict["input"]["max_recoveries"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    emulator = StubEmulator()
+    encounter = StubEncounter(outcomes)
+    with pytest.raises(RuntimeError, match=expected_output["match"]):
+        run(emulator, encounter, max_attempts=len(outcomes), send_email=False, max_recoveries=max_recoveries)
+    assert (encounter.n_restarts == expected_output["n_restarts"])
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "memory"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from helpers.network_cmd import NetworkCommandClient  # noqa: E402
+from memory import CoreMemory, MemorySpriteReader, is_shiny  # noqa: E402
+from pokemon import Pokemon, SpriteType  # noqa: E402
+
+
+def get_memory_reader(port: int) -> MemorySpriteReader:
+    """Create a memory reader for a stand-in serving canned memory."""
+    client = NetworkCommandClient(port=port, timeout=0.2)
+    return MemorySpriteReader(CoreMemory(client), game="Crystal")
+
+
+def serve_memory(memory: dict):
+    """Reply to `READ_CORE_MEMORY` with canned memory, keyed by hex address."""
+    def read_core_memory(address: str, size: str) -> str:
+        if address not in memory:
+            return None
+        return f"READ_CORE_MEMORY {address} {memory[address]}"
+    return read_core_memory
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["is_shiny", "success"])
+)
+def test_01_is_shiny(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    dvs = bytes.fromhex(get_event_as_dict["input"]["dvs"])
+    expected_output: bool = get_event_as_dict["expected_output"]
+
+    assert (is_shiny(dvs) == expected_output)
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read_sprite_type", "success"])
+)
+def test_02_read_sprite_type(get_event_as_dict, network_cmd_stand_in):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    pokemon = Pokemon(get_event_as_dict["input"]["pokemon"])
+    memory: dict = get_event_as_dict["input"]["memory"]
+    expected_output = get_event_as_dict["expected_output"]
+
+    network_cmd_stand_in.replies["READ_CORE_MEMORY"] = serve_memory(memory)
+    reader = get_memory_reader(network_cmd_stand_in.port)
+    sprite = reader.determine_sprite_type(pokemon)
+    if expected_output is None:
+        assert (sprite is None)
+        assert reader.available
+    else:
+        assert (sprite == SpriteType(expected_output))
+    reader.memory.client.close()
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read_sprite_type", "failure"])
+)
+def test_03_read_sprite_type_unavailable(get_event_as_dict, network_cmd_stand_in):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    pokemon = Pokemon(get_event_as_dict["input"]["pokemon"])
+    memory: dict = get_event_as_dict["input"]["memory"]
+
+    network_cmd_stand_in.replies["READ_CORE_MEMORY"] = serve_memory(memory)
+    reader = get_memory_reader(network_cmd_stand_in.port)
+    assert (reader.determine_sprite_type(pokemon) is None)
+    assert not reader.available
+    # memory is not read again once it is unavailable
+    assert (reader.determine_sprite_type(pokemon) is None)
+    assert (len(network_cmd_stand_in.wait_for_commands(1)) == 1)
+    reader.memory.client.close()
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "network_cmd"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from helpers.network_cmd import NetworkCommandClient  # noqa: E402
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["send", "success"])
+)
+def test_01_send(get_event_as_dict, network_cmd_stand_in):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    commands: list = get_event_as_dict["input"]["commands"]
+    expected_output: list = get_event_as_dict["expected_output"]
+
+    client = NetworkCommandClient(port=network_cmd_stand_in.port)
+    for command in commands:
+        client.send(*command)
+    assert (network_cmd_stand_in.wait_for_commands(len(expected_output)) == expected_output)
+    client.close()
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["request", "success"])
+)
+def test_02_request(get_event_as_dict, network_cmd_stand_in):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    command: str = get_event_as_dict["input"]["command"]
+    reply: str = get_event_as_dict["input"]["reply"]
+    expected_output: str = get_event_as_dict["expected_output"]
+
+    network_cmd_stand_in.replies[command] = reply
+    client = NetworkCommandClient(port=network_cmd_stand_in.port)
+    assert (client.request(command) == expected_output)
+    client.close()
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["request", "failure"])
+)
+def test_03_request_timeout(get_event_as_dict, network_cmd_stand_in):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    command: str = get_event_as_dict["input"]["command"]
+    timeout: float = get_event_as_dict["input"]["timeout"]
+
+    client = NetworkCommandClient(port=network_cmd_stand_in.port, timeout=timeout)
+    with pytest.raises(TimeoutError):
+        client.request(command)
+    assert (network_cmd_stand_in.wait_for_commands(1) == [command])
+    client.close()
@@ -75,4 +75,23 @@ def test_02_compare_img_color(get_event_as_dict):
         expected_val = 255*math.sqrt(3)
     else:
         expected_val = 0
-    assert (math.isclose(img_diff, expected_val, rel_tol=1e-06))
\ No newline at end of file
+    assert (math.isclose(img_diff, expected_val, rel_tol=1e-06))
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["compare_img_pixels_score"])
+)
+def test_03_compare_img_pixels_score(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    img1_fn: str = get_event_as_dict["input"]["image1"]
+    img2_fn: str = get_event_as_dict["input"]["image2"]
+    resize_width: int = get_event_as_dict["input"]["resize_width"]
+    resize_height: int = get_event_as_dict["input"]["resize_height"]
+    expected_output: float = get_event_as_dict["expected_output"]
+    
+    img1 = cv2.imread(os.path.join(TEST_IMG_DIR, img1_fn))
+    img2 = cv2.imread(os.path.join(TEST_IMG_DIR, img2_fn))
+    img_diff = compare_img_pixels(img1, img2, resize_width, resize_height)
+    assert (math.isclose(img_diff, expected_output, rel_tol=1e-06))
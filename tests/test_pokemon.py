@@ -23,11 +23,18 @@ logger = get_logger(f"test_{MODULE}")
 #                           --- Module Imports ---                            #
 # ----------------------------------------------------------------------------#
 from pokemon import (  # noqa: E402
+    ASSETS,
     SPRITES_DIR,
+    POKEMON_GAME,
+    SPRITE_SIZE,
+    Pokemon,
     SpriteType,
+    build_sprite_atlas,
     create_pokemon_sprite_fn,
     get_sprite_name,
+    load_sprite_atlas,
 )
+from helpers.opencv_util import cv2, get_img_color  # noqa: E402
 
 
 # ----------------------------------------------------------------------------#
@@ -64,3 +71,67 @@ def test_02_create_pokemon_sprite_fn(get_event_as_dict):
     sprite_fn = create_pokemon_sprite_fn(game, name, _type=SpriteType(_type))
     expected_paths = [SPRITES_DIR, *expected_output]
     assert (sprite_fn == os.path.join(*expected_paths))
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["sprite_bank"])
+)
+def test_03_sprite_bank(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    name: str = get_event_as_dict["input"]["name"]
+
+    pokemon = Pokemon(name)
+    sprite_bank = pokemon.sprite_bank
+    assert (pokemon.sprite_bank is sprite_bank)
+
+    normal_color = get_img_color(ASSETS.imread(pokemon.get_normal_img_fn()))
+    shiny_color = get_img_color(ASSETS.imread(pokemon.get_shiny_img_fn()))
+    assert (vars(sprite_bank.normal_color) == vars(normal_color))
+    assert (vars(sprite_bank.shiny_color) == vars(shiny_color))
+    assert (list(sprite_bank.normal_diff_signs) == list(normal_color.diff_signs()))
+    assert (list(sprite_bank.shiny_diff_signs) == list(shiny_color.diff_signs()))
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["sprite_atlas"])
+)
+def test_04_sprite_atlas(get_event_as_dict, monkeypatch, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    name: str = get_event_as_dict["input"]["name"]
+
+    # build the atlas in a temporary directory instead of the assets
+    sprite_atlas_fn = os.path.join(tmp_path, "sprite_atlas.bin")
+    monkeypatch.setattr("pokemon.get_sprite_atlas_fn", lambda game=POKEMON_GAME: sprite_atlas_fn)
+    load_sprite_atlas.cache_clear()
+    try:
+        build_sprite_atlas(POKEMON_GAME)
+        assert_sprite_atlas(name)
+    finally:
+        # other tests must not load the temporary atlas
+        load_sprite_atlas.cache_clear()
+
+
+# ----------------------------------------------------------------------------#
+#                               --- HELPERS ---                               #
+# ----------------------------------------------------------------------------#
+def assert_sprite_atlas(name: str):
+    """Assert the sprites of a Pokémon are loaded from the sprite atlas."""
+    pokemon = Pokemon(name)
+    sprite_atlas = load_sprite_atlas(POKEMON_GAME)
+    assert (load_sprite_atlas(POKEMON_GAME) is sprite_atlas)
+    assert (pokemon.number in sprite_atlas)
+
+    for variant, sprite_fn in enumerate([pokemon.get_normal_img_fn(), pokemon.get_shiny_img_fn()]):
+        sprite_img = sprite_atlas.get(pokemon.number, variant)
+        expected_img = cv2.resize(ASSETS.imread(sprite_fn), (SPRITE_SIZE, SPRITE_SIZE))
+        assert (sprite_img == expected_img).all()
+        # zero-copy, read-only view into the mapped file
+        assert (not sprite_img.flags.owndata)
+        assert (not sprite_img.flags.writeable)
+    assert (pokemon.sprite_bank.normal_img.base is not None)
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH, TEST_FILES_PATH
+
+MODULE = "savestate"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+TEST_STATES_DIR = os.path.join(TEST_FILES_PATH, "savestates")
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from memory import ENEMY_MON_ADDRESSES  # noqa: E402
+from pokemon import Pokemon, SpriteType  # noqa: E402
+from savestate import SavestateSpriteReader, read_enemy_mon  # noqa: E402
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read_enemy_mon", "success"])
+)
+def test_01_read_enemy_mon(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    state_fn = os.path.join(TEST_STATES_DIR, get_event_as_dict["input"]["state_fn"])
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    species, dvs = read_enemy_mon(state_fn, ENEMY_MON_ADDRESSES["Crystal"])
+    assert (species == expected_output["species"])
+    assert (dvs.hex() == expected_output["dvs"])
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read_sprite_type", "success"])
+)
+def test_02_read_sprite_type(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    pokemon = Pokemon(get_event_as_dict["input"]["pokemon"])
+    state_fn = os.path.join(TEST_STATES_DIR, get_event_as_dict["input"]["state_fn"])
+    expected_output = get_event_as_dict["expected_output"]
+
+    reader = SavestateSpriteReader(lambda: state_fn, game="Crystal")
+    sprite = reader.determine_sprite_type(pokemon)
+    if expected_output is None:
+        assert (sprite is None)
+        assert reader.available
+    else:
+        assert (sprite == SpriteType(expected_output))
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read_sprite_type", "failure"])
+)
+def test_03_read_sprite_type_unavailable(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    pokemon = Pokemon(get_event_as_dict["input"]["pokemon"])
+    state_fn = os.path.join(TEST_STATES_DIR, get_event_as_dict["input"]["state_fn"])
+
+    reader = SavestateSpriteReader(lambda: state_fn, game="Crystal")
+    assert (reader.determine_sprite_type(pokemon) is None)
+    assert not reader.available
@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "speed"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from speed import SpeedEstimator, count_game_frames  # noqa: E402
+
+
+class PlayTimeMemory():
+    """Stand in for core memory, reading a play time at each clock time."""
+    def __init__(self, reads: list):
+        self.reads = list(reads)
+        self.now = None
+
+    def clock(self) -> float:
+        return self.now
+
+    def read(self, address: int, size: int) -> bytes:
+        self.now, (hours, minutes, seconds, frames) = self.reads.pop(0)
+        return hours.to_bytes(2, "big") + bytes([minutes, seconds, frames])
+
+
+class UnavailableMemory():
+    """Stand in for core memory RetroArch does not reply to."""
+    def read(self, address: int, size: int) -> bytes:
+        raise TimeoutError("No reply to READ_CORE_MEMORY")
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["sample", "success"])
+)
+def test_01_sample(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    reads: list = get_event_as_dict["input"]["reads"]
+    expected_output: list = get_event_as_dict["expected_output"]
+
+    memory = PlayTimeMemory(reads)
+    published = []
+    estimator = SpeedEstimator(memory,
+                               game="Crystal",
+                               min_fps=get_event_as_dict["input"]["min_fps"],
+                               max_fps=get_event_as_dict["input"]["max_fps"],
+                               smoothing=get_event_as_dict["input"]["smoothing"],
+                               publish=published.append,
+                               clock=memory.clock)
+    fps = [estimator.sample() for _ in reads]
+    assert (fps == [pytest.approx(f) if f is not None else None for f in expected_output])
+    # delays are scaled by the latest smoothed speed
+    assert (published[-1] == pytest.approx(fps[-1]))
+    assert (estimator.available)
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["sample", "failure"])
+)
+def test_02_sample_unavailable(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    published = []
+    estimator = SpeedEstimator(UnavailableMemory(),
+                               game="Crystal",
+                               min_fps=get_event_as_dict["input"]["min_fps"],
+                               max_fps=get_event_as_dict["input"]["max_fps"],
+                               smoothing=get_event_as_dict["input"]["smoothing"],
+                               publish=published.append)
+    assert (estimator.sample() is None)
+    assert (not estimator.available)
+    # back to the configured speed
+    assert (published == [None])
+    assert (estimator.sample() is None)
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["count_game_frames", "success"])
+)
+def test_03_count_game_frames(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    play_time = bytes.fromhex(get_event_as_dict["input"])
+    expected_output: int = get_event_as_dict["expected_output"]
+
+    assert (count_game_frames(play_time) == expected_output)
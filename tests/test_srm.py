@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "srm"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from config import NATIVE_SAVES_DIR  # noqa: E402
+from helpers.assets import ASSETS  # noqa: E402
+from srm import SAVE_DATA_END, SAVE_DATA_START, read_pack_pockets, read_save_data  # noqa: E402
+
+NATIVE_ROM_NAME = "Pokemon - Crystal Version (UE) (V1.1) [C][!]"
+
+
+def get_native_srm_fn(save: str) -> str:
+    """Retrieve the native save file of a static encounter."""
+    return os.path.join(NATIVE_SAVES_DIR, save, f"{NATIVE_ROM_NAME}.srm")
+
+
+def corrupt_save(save: bytes, positions: list) -> bytes:
+    """Flip the bits of the bytes at the positions."""
+    corrupted = bytearray(save)
+    for pos in positions:
+        corrupted[pos] ^= 0xFF
+    return bytes(corrupted)
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read_pack_pockets", "success"])
+)
+def test_01_read_pack_pockets(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    srm_fn = get_native_srm_fn(get_event_as_dict["input"]["save"])
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    pockets = read_pack_pockets(srm_fn)
+    for pocket, pocket_name in zip(pockets, ["items", "machines", "keyitems", "balls"]):
+        expected_pocket = [(item["name"], item["qty"]) for item in expected_output[pocket_name]]
+        assert (pocket == expected_pocket)
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read_save_data", "success"])
+)
+def test_02_read_save_data(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    save = ASSETS.read(get_native_srm_fn(get_event_as_dict["input"]["save"]))
+    corrupt: list = get_event_as_dict["input"]["corrupt"]
+
+    data = read_save_data(corrupt_save(save, corrupt))
+    assert (data == save[SAVE_DATA_START:SAVE_DATA_END])
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["read_save_data", "failure"])
+)
+def test_03_read_save_data_corrupt(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    save = ASSETS.read(get_native_srm_fn(get_event_as_dict["input"]["save"]))
+    corrupt: list = get_event_as_dict["input"]["corrupt"]
+
+    with pytest.raises(RuntimeError):
+        read_save_data(corrupt_save(save, corrupt))
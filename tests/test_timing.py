@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "timing"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from helpers.timing import WAIT_HISTOGRAM, WaitHistogram, wait_until  # noqa: E402
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["wait_until", "success"])
+)
+def test_01_wait_until(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    sec: float = get_event_as_dict["input"]["sec"]
+    spin_budget: float = get_event_as_dict["input"]["spin_budget"]
+    n_waits: int = get_event_as_dict["input"]["n_waits"]
+    mean_overshoot: float = get_event_as_dict["expected_output"]["mean_overshoot"]
+
+    WAIT_HISTOGRAM.reset()
+    for i in range(n_waits):
+        deadline = time.perf_counter() + sec
+        wait_until(deadline, spin_budget)
+        assert (time.perf_counter() >= deadline)
+    logger.info(WAIT_HISTOGRAM.summary())
+    assert (WAIT_HISTOGRAM.n_waits == n_waits)
+    assert (WAIT_HISTOGRAM.actual >= WAIT_HISTOGRAM.requested)
+    # on average, a single preempted wait may overshoot by much more
+    assert (WAIT_HISTOGRAM.actual - WAIT_HISTOGRAM.requested < n_waits*mean_overshoot)
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["record", "success"])
+)
+def test_02_record(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    waits: list = get_event_as_dict["input"]["waits"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    histogram = WaitHistogram()
+    for requested, actual in waits:
+        histogram.record(requested, actual)
+    logger.info(histogram.summary())
+    assert (histogram.counts == expected_output["counts"])
+    assert (histogram.n_waits == len(waits))
+    assert (histogram.max_overshoot == pytest.approx(expected_output["max_overshoot"]))
+    assert (len(histogram.summary().splitlines()) == len(histogram.bins) + 2)
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from helpers.log import get_logger
+
+from conftest import get_json_files, print_section_break
+
+# ----------------------------------------------------------------------------#
+#                               --- Globals ---                               #
+# ----------------------------------------------------------------------------#
+from __setup__ import TEST_EVENTS_PATH
+
+MODULE = "timing_profile"
+MODULE_EVENTS_DIR = os.path.join(TEST_EVENTS_PATH, MODULE)
+
+# ----------------------------------------------------------------------------#
+#                               --- Logging ---                               #
+# ----------------------------------------------------------------------------#
+logger = get_logger(f"test_{MODULE}")
+
+# ----------------------------------------------------------------------------#
+#                           --- Module Imports ---                            #
+# ----------------------------------------------------------------------------#
+from config import EMULATOR_CORE_AVG_FPS  # noqa: E402
+from timing_profile import EncounterTiming, TimingProfile, find_shortest, load_timing_profile  # noqa: E402
+
+
+# ----------------------------------------------------------------------------#
+#                                --- TESTS ---                                #
+# ----------------------------------------------------------------------------#
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["find_shortest", "success"])
+)
+def test_01_find_shortest(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    threshold: float = get_event_as_dict["input"]["threshold"]
+    tolerance: float = get_event_as_dict["input"]["tolerance"]
+
+    tried = []
+    def succeeds(timing: float) -> bool:
+        tried.append(timing)
+        return timing >= threshold
+    shortest = find_shortest(succeeds,
+                             longest=get_event_as_dict["input"]["longest"],
+                             shortest=get_event_as_dict["input"]["shortest"],
+                             tolerance=tolerance,
+                             trials=get_event_as_dict["input"]["trials"])
+    assert (threshold <= shortest <= threshold + tolerance)
+    # the timing found succeeded every trial
+    assert (tried.count(shortest) == get_event_as_dict["input"]["trials"])
+
+
+@pytest.mark.sad
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["find_shortest", "failure"])
+)
+def test_02_find_shortest_unsafe(get_event_as_dict):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    threshold: float = get_event_as_dict["input"]["threshold"]
+
+    with pytest.raises(RuntimeError):
+        find_shortest(lambda timing: timing >= threshold,
+                      longest=get_event_as_dict["input"]["longest"],
+                      shortest=get_event_as_dict["input"]["shortest"],
+                      tolerance=get_event_as_dict["input"]["tolerance"],
+                      trials=get_event_as_dict["input"]["trials"])
+
+
+@pytest.mark.happy
+@pytest.mark.parametrize("event_dir", [MODULE_EVENTS_DIR])
+@pytest.mark.parametrize(
+    "event_file", get_json_files(MODULE_EVENTS_DIR, ["load_timing_profile", "success"])
+)
+def test_03_load_timing_profile(get_event_as_dict, tmp_path):
+    print_section_break()
+    logger.info(f"Test Description: {get_event_as_dict['description']}")
+    encounters: dict = get_event_as_dict["input"]["encounters"]
+    expected_output: dict = get_event_as_dict["expected_output"]
+
+    profile = TimingProfile("test-machine",
+                            core_avg_fps=EMULATOR_CORE_AVG_FPS + get_event_as_dict["input"]["fps_offset"],
+                            continue_scale=get_event_as_dict["input"]["continue_scale"])
+    for name, timing in encounters.items():
+        profile.set_encounter_timing(name.lower(), EncounterTiming.from_dict(timing))
+    profile_fn = os.path.join(tmp_path, "profiles", "timing_test-machine.json")
+    profile.save(profile_fn)
+
+    loaded = load_timing_profile(profile_fn)
+    assert (loaded.continue_scale == expected_output["continue_scale"])
+    assert (sorted(loaded.encounters) == expected_output["encounters"])
+    for name in expected_output["encounters"]:
+        assert (loaded.get_encounter_timing(name).to_dict() == encounters[name])
+    assert (loaded.get_encounter_timing("LUGIA") is None)
@@ -0,0 +1,151 @@
+"""Keep the timings calibrated for static encounters on this machine."""
+
+from functools import lru_cache
+import json
+import logging
+import os
+import platform
+from typing import Callable, Dict, Union
+
+from config import EMULATOR_CORE_AVG_FPS, PROFILES_DIR
+from helpers.log import mod_fname
+logger = logging.getLogger(mod_fname(__file__))
+
+
+SEARCH_TOLERANCE = 0.05
+"""The relative number of seconds the search for the shortest timing stops within."""
+
+SEARCH_TRIALS = 3
+"""The number of attempts that must all succeed for a timing to be considered safe."""
+
+
+class EncounterTiming():
+    """The timing of a static encounter, in relative seconds: the gap between
+    presses of its button sequence and the delay for the battle to start."""
+    def __init__(self, press_gap: float, delay: float):
+        self.press_gap = press_gap
+        self.delay = delay
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON compatible dict."""
+        return {"press_gap": self.press_gap, "delay": self.delay}
+
+    @staticmethod
+    def from_dict(data: dict) -> "EncounterTiming":
+        """Deserialize from a dict created by `to_dict`."""
+        return EncounterTiming(press_gap=data["press_gap"], delay=data["delay"])
+
+
+class TimingProfile():
+    """The timings calibrated on a machine: how much the delays between the
+    presses that continue the game are scaled, and the timing of each static
+    encounter. Timings that have not been calibrated are left to the defaults."""
+    def __init__(self,
+                 machine: str,
+                 core_avg_fps: int = EMULATOR_CORE_AVG_FPS,
+                 continue_scale: float = 1,
+                 encounters: Dict[str, EncounterTiming] = None):
+        self.machine = machine
+        self.core_avg_fps = core_avg_fps
+        self.continue_scale = continue_scale
+        self.encounters = encounters if encounters is not None else dict()
+
+    def get_encounter_timing(self, pokemon_name: str) -> Union[EncounterTiming, None]:
+        """The calibrated timing of a static encounter, `None` if it has not been calibrated."""
+        return self.encounters.get(pokemon_name.upper())
+
+    def set_encounter_timing(self, pokemon_name: str, timing: EncounterTiming):
+        """Record the calibrated timing of a static encounter."""
+        self.encounters[pokemon_name.upper()] = timing
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON compatible dict."""
+        return {
+            "machine": self.machine,
+            "core_avg_fps": self.core_avg_fps,
+            "continue_scale": self.continue_scale,
+            "encounters": {name: timing.to_dict() for name, timing in self.encounters.items()},
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "TimingProfile":
+        """Deserialize from a dict created by `to_dict`."""
+        return TimingProfile(machine=data["machine"],
+                             core_avg_fps=data["core_avg_fps"],
+                             continue_scale=data["continue_scale"],
+                             encounters={name: EncounterTiming.from_dict(timing)
+                                         for name, timing in data["encounters"].items()})
+
+    def save(self, profile_fn: str = None):
+        """Save the profile, by default as the profile of this machine."""
+        if profile_fn is None:
+            profile_fn = get_timing_profile_fn(self.machine)
+        os.makedirs(os.path.dirname(profile_fn), exist_ok=True)
+        with open(profile_fn, "w") as outfile:
+            json.dump(self.to_dict(), outfile, indent=4)
+        logger.info(f"saved timing profile to {profile_fn}")
+
+
+def get_machine_name() -> str:
+    """The name of this machine, safe to use in a filename."""
+    name = platform.node() or "unknown"
+    return "".join(char if char.isalnum() or char in "-_" else "_" for char in name)
+
+
+def get_timing_profile_fn(machine: str = None) -> str:
+    """Generate the timing profile filename of a machine, by default this one."""
+    if machine is None:
+        machine = get_machine_name()
+    return os.path.join(PROFILES_DIR, f"timing_{machine}.json")
+
+
+@lru_cache(maxsize=None)
+def load_timing_profile(profile_fn: str = None) -> TimingProfile:
+    """Load the timing profile of this machine. If it has not been
+    calibrated, an empty profile leaves every timing to the defaults.
+    Profiles calibrated at a different `EMULATOR_CORE_AVG_FPS` are
+    ignored, since relative delays are scaled by it."""
+    if profile_fn is None:
+        profile_fn = get_timing_profile_fn()
+    if not os.path.isfile(profile_fn):
+        logger.debug(f"no timing profile {profile_fn}, using the default timings")
+        return TimingProfile(get_machine_name())
+
+    with open(profile_fn, "r") as infile:
+        profile = TimingProfile.from_dict(json.load(infile))
+    if profile.core_avg_fps != EMULATOR_CORE_AVG_FPS:
+        logger.warning(f"timing profile {profile_fn} was calibrated at {profile.core_avg_fps} fps, "
+                       f"not EMULATOR_CORE_AVG_FPS {EMULATOR_CORE_AVG_FPS}. Using the default timings, recalibrate.")
+        return TimingProfile(get_machine_name())
+    logger.debug(f"loaded timing profile {profile_fn}")
+    return profile
+
+
+def find_shortest(succeeds: Callable[[float], bool],
+                  longest: float,
+                  shortest: float = 0,
+                  tolerance: float = SEARCH_TOLERANCE,
+                  trials: int = SEARCH_TRIALS) -> float:
+    """Binary search the shortest timing between `shortest` and `longest`
+    for which `trials` attempts in a row succeed. Assumes a timing that
+    succeeds is followed by longer timings that succeed too. The result is
+    within `tolerance` of the shortest safe timing, on the safe side.
+    Raises `RuntimeError` if even the longest timing does not succeed."""
+    def is_safe(timing: float) -> bool:
+        for i in range(trials):
+            if not succeeds(timing):
+                logger.debug(f"timing {timing:.3f} failed on trial {i + 1}/{trials}")
+                return False
+        logger.debug(f"timing {timing:.3f} succeeded {trials}x")
+        return True
+
+    if not is_safe(longest):
+        raise RuntimeError(f"Timing does not succeed even at the longest value {longest}")
+    lo, hi = shortest, longest
+    while hi - lo > tolerance:
+        mid = (lo + hi)/2
+        if is_safe(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi